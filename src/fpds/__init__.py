@@ -1,5 +1,39 @@
-from .core.parser import fpdsRequest
+"""
+Python wrapper for the FPDS ATOM feed.
+
+Public classes are imported on first access, so that `import fpds` doesn't
+pull in `aiohttp`, `tqdm` or the parser executors until they're needed.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .core.batch import fpdsBatchRequest
+    from .core.parser import fpdsRequest
+    from .core.sync import fpdsSync
 
 __all__ = [
+    "fpdsBatchRequest",
     "fpdsRequest",
+    "fpdsSync",
 ]
+
+# name: module defining it
+_LAZY_IMPORTS = {
+    "fpdsBatchRequest": "fpds.core.batch",
+    "fpdsRequest": "fpds.core.parser",
+    "fpdsSync": "fpds.core.sync",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
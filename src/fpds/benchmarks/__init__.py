@@ -0,0 +1,13 @@
+"""
+Benchmark suite for fpds, run against a synthetic feed served locally. See
+`fpds.benchmarks.suite`; installed with the `fpds[benchmarks]` extra.
+"""
+
+from .feed import fpdsFeedGenerator
+from .server import mock_feed_application, serve_feed
+
+__all__ = [
+    "fpdsFeedGenerator",
+    "mock_feed_application",
+    "serve_feed",
+]
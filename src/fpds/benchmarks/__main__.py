@@ -0,0 +1,4 @@
+from fpds.benchmarks.suite import main
+
+if __name__ == "__main__":
+    main()
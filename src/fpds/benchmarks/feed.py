@@ -0,0 +1,323 @@
+"""
+Synthetic FPDS ATOM feed generator.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+FPDS_NAMESPACE = "https://www.fpds.gov/FPDS"
+FEED_URL = "https://www.fpds.gov/ezsearch/FEEDS/ATOM?FEEDNAME=PUBLIC&q=SYNTHETIC"
+PAGE_SIZE = 10
+
+# (agency ID, name, department ID, department name)
+AGENCIES = (
+    ("4740", "PUBLIC BUILDINGS SERVICE", "4700", "GENERAL SERVICES ADMINISTRATION"),
+    ("6800", "ENVIRONMENTAL PROTECTION AGENCY", "6800", "ENVIRONMENTAL PROTECTION"),
+    ("7504", "FOOD AND DRUG ADMINISTRATION", "7500", "HEALTH AND HUMAN SERVICES"),
+    ("9700", "DEPT OF DEFENSE", "9700", "DEPT OF DEFENSE"),
+)
+VENDORS = ("MC ALLEN CITY OF", "ACME SUPPLY CO", "NORTHWIND LLC", "CONTOSO INC")
+ACTION_TYPES = (
+    ("A", "BPA CALL"),
+    ("B", "PURCHASE ORDER"),
+    ("C", "DELIVERY ORDER"),
+    ("D", "DEFINITIVE CONTRACT"),
+)
+IDV_TYPES = (("A", "GWAC"), ("B", "IDC"), ("E", "BPA"))
+# vendor socio-economic and business type flags, one "true"/"false" key each
+VENDOR_FLAGS = (
+    "isAlaskanNativeOwnedCorporationOrFirm",
+    "isAmericanIndianOwned",
+    "isIndianTribe",
+    "isNativeHawaiianOwnedOrganizationOrFirm",
+    "isTriballyOwnedFirm",
+    "isSmallBusiness",
+    "isVeteranOwned",
+    "isServiceRelatedDisabledVeteranOwnedBusiness",
+    "isWomenOwned",
+    "isVerySmallBusiness",
+    "isWomenOwnedSmallBusiness",
+    "isEconomicallyDisadvantagedWomenOwnedSmallBusiness",
+    "isJointVentureWomenOwnedSmallBusiness",
+    "isCommunityDevelopedCorporationOwnedFirm",
+    "isLaborSurplusAreaFirm",
+    "isFederalGovernment",
+    "isStateGovernment",
+    "isLocalGovernment",
+    "isTribalGovernment",
+    "isForeignGovernment",
+    "isCorporateEntityNotTaxExempt",
+    "isCorporateEntityTaxExempt",
+    "isPartnershipOrLimitedLiabilityPartnership",
+    "isSolePropreitorship",
+    "isSmallAgriculturalCooperative",
+    "isInternationalOrganization",
+    "isUSGovernmentEntity",
+    "isCommunityDevelopmentCorporation",
+    "isDomesticShelter",
+    "isEducationalInstitution",
+    "isFoundation",
+    "isHospital",
+    "isManufacturerOfGoods",
+    "isVeterinaryHospital",
+    "isHispanicServicingInstitution",
+    "receivesContracts",
+    "receivesGrants",
+    "receivesContractsAndGrants",
+    "isAirportAuthority",
+    "isCouncilOfGovernments",
+)
+
+
+def element(tag: str, text: object = "", **attributes: object) -> str:
+    attrs = "".join(f" {name}={quoteattr(str(v))}" for name, v in attributes.items())
+    return f"<ns1:{tag}{attrs}>{escape(str(text))}</ns1:{tag}>"
+
+
+def block(tag: str, *children: str) -> str:
+    return f"<ns1:{tag}>{''.join(children)}</ns1:{tag}>"
+
+
+class fpdsFeedGenerator:
+    """Generates pages of a synthetic FPDS ATOM feed.
+
+    Entries are built from a fixed template with seeded random values, so the
+    same generator always produces the same feed, and an entry only depends
+    on its position in the feed. Entries flatten to about a hundred keys
+    (real ones have up to a few hundred), with the identifier, date, dollar
+    and vendor flag fields that records are usually keyed and coerced on.
+
+    Example:
+    -------
+    >>> generator = fpdsFeedGenerator(entries=1000, idv_ratio=0.3)
+    >>> fpdsTree(generator.page(start=0)).jsonify()
+
+    Attributes
+    ----------
+    entries: `int`
+        Defaults to 100.
+        Number of entries in the feed.
+    depth: `int`
+        Defaults to 0.
+        Levels of extra nesting added to each entry, each with a leaf value,
+        to stress flattening of deeply nested records.
+    idv_ratio: `float`
+        Defaults to 0.2.
+        Share of entries that are IDVs rather than awards.
+    seed: `int`
+        Defaults to 0.
+        Seed of the random values.
+    """
+
+    def __init__(
+        self,
+        entries: int = 100,
+        depth: int = 0,
+        idv_ratio: float = 0.2,
+        seed: int = 0,
+    ) -> None:
+        if not 0 <= idv_ratio <= 1:
+            raise ValueError("`idv_ratio` must be between 0 and 1")
+        self.entries = entries
+        self.depth = depth
+        self.idv_ratio = idv_ratio
+        self.seed = seed
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsFeedGenerator {self.entries} entries>"
+
+    @property
+    def last(self) -> int:
+        """Offset of the last page, as in the feed's `last` link."""
+        return max(self.entries - 1, 0) // PAGE_SIZE * PAGE_SIZE
+
+    @property
+    def offsets(self) -> List[int]:
+        """`start` offset of every page."""
+        return list(range(0, max(self.entries, 1), PAGE_SIZE))
+
+    def is_idv(self, index: int) -> bool:
+        return random.Random(f"{self.seed}-kind-{index}").random() < self.idv_ratio
+
+    def nested(self, index: int) -> str:
+        """`depth` levels of nesting, innermost first."""
+        xml = ""
+        for level in range(self.depth, 0, -1):
+            leaf = element("value", f"{index}-{level}")
+            xml = f"<ns1:nested{level}>{leaf}{xml}</ns1:nested{level}>"
+        return xml
+
+    def entry(self, index: int) -> str:
+        """The `index`-th entry of the feed."""
+        rng = random.Random(f"{self.seed}-{index}")
+        idv = self.is_idv(index)
+        agency_id, agency, department_id, department = rng.choice(AGENCIES)
+        vendor = rng.choice(VENDORS)
+        piid = f"{'IDV' if idv else 'AW'}{index:08d}"
+        mod_number = str(rng.randint(0, 20))
+        amount = f"{rng.uniform(-5_000, 500_000):.2f}"
+        total = f"{float(amount) + rng.uniform(0, 1_000_000):.2f}"
+        signed = datetime(2012, 10, 1) + timedelta(days=rng.randint(0, 3650))
+        modified = signed + timedelta(seconds=rng.randint(0, 86_400 * 90))
+
+        def date(value: datetime) -> str:
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+
+        contract_id = block(
+            "IDVID" if idv else "awardContractID",
+            element("agencyID", agency_id, name=agency),
+            element("PIID", piid),
+            element("modNumber", mod_number),
+            *([] if idv else [element("transactionNumber", 0)]),
+        )
+        if idv:
+            kind, description = rng.choice(IDV_TYPES)
+            identifier = block("contractID", contract_id)
+        else:
+            kind, description = rng.choice(ACTION_TYPES)
+            referenced = ""
+            # calls and delivery orders are placed under an IDV
+            if kind in ("A", "C"):
+                referenced = block(
+                    "referencedIDVID",
+                    element("agencyID", agency_id, name=agency),
+                    element("PIID", f"IDV{rng.randint(0, 10**8):08d}"),
+                    element("modNumber", 0),
+                )
+            identifier = block("awardID", contract_id, referenced)
+        action = element("contractActionType", kind, description=description)
+
+        flags = rng.getrandbits(len(VENDOR_FLAGS))
+        body = "".join(
+            [
+                identifier,
+                block(
+                    "relevantContractDates",
+                    element("signedDate", date(signed)),
+                    element("effectiveDate", date(signed)),
+                    element("currentCompletionDate", date(signed + timedelta(365))),
+                    element("ultimateCompletionDate", date(signed + timedelta(730))),
+                ),
+                block(
+                    "dollarValues",
+                    element("obligatedAmount", amount),
+                    element("baseAndExercisedOptionsValue", amount),
+                    element("baseAndAllOptionsValue", amount),
+                ),
+                block(
+                    "totalDollarValues",
+                    element("totalObligatedAmount", total),
+                    element("totalBaseAndExercisedOptionsValue", total),
+                    element("totalBaseAndAllOptionsValue", total),
+                ),
+                block(
+                    "purchaserInformation",
+                    element(
+                        "contractingOfficeAgencyID",
+                        agency_id,
+                        name=agency,
+                        departmentID=department_id,
+                        departmentName=department,
+                    ),
+                    element("contractingOfficeID", f"OF{rng.randint(0, 999):03d}"),
+                    element("foreignFunding", "X", description="NOT APPLICABLE"),
+                ),
+                block(
+                    "contractData",
+                    action,
+                    element("typeOfContractPricing", "J", description="FIRM FIXED"),
+                    element(
+                        "descriptionOfContractRequirement",
+                        f"SYNTHETIC REQUIREMENT {index}",
+                    ),
+                    element("numberOfActions", rng.randint(1, 5)),
+                ),
+                block(
+                    "productOrServiceInformation",
+                    element("productOrServiceCode", "S114", description="UTILITIES"),
+                    element("principalNAICSCode", "221310", description="WATER"),
+                    element("countryOfOrigin", "USA", name="UNITED STATES"),
+                ),
+                block(
+                    "vendor",
+                    block("vendorHeader", element("vendorName", vendor)),
+                    block(
+                        "vendorSiteDetails",
+                        block(
+                            "vendorSocioEconomicIndicators",
+                            *(
+                                element(flag, "true" if flags >> i & 1 else "false")
+                                for i, flag in enumerate(VENDOR_FLAGS)
+                            ),
+                        ),
+                        block(
+                            "vendorLocation",
+                            element("city", "MCALLEN"),
+                            element("state", "TX", name="TEXAS"),
+                            element("ZIPCode", f"{rng.randint(10000, 99999)}"),
+                        ),
+                    ),
+                ),
+                block(
+                    "competition",
+                    element("extentCompeted", "A", description="FULL AND OPEN"),
+                    element("numberOfOffersReceived", rng.randint(1, 9)),
+                ),
+                block(
+                    "transactionInformation",
+                    element("createdBy", "SYNTHETIC@FPDS.GOV"),
+                    element("createdDate", date(modified)),
+                    element("lastModifiedDate", date(modified)),
+                    element("status", "F", description="FINAL"),
+                ),
+                self.nested(index),
+            ]
+        )
+        content_tag = "IDV" if idv else "award"
+        return (
+            "<ns0:entry>"
+            f"<ns0:title>{escape(description)} {piid} ({mod_number}) awarded to "
+            f"{escape(vendor)}, was modified for the amount of ${amount}</ns0:title>"
+            f'<ns0:link rel="alternate" type="text/html" '
+            f'href="https://www.fpds.gov/ezsearch/search.do?q={piid}+{agency_id}+" />'
+            f"<ns0:modified>{date(modified)}</ns0:modified>"
+            f'<ns0:content type="application/xml">'
+            f'<ns1:{content_tag} version="1.5">{body}</ns1:{content_tag}>'
+            "</ns0:content>"
+            "</ns0:entry>"
+        )
+
+    def page_range(self, start: int) -> Tuple[int, int]:
+        """Indices of the entries of the page at offset `start`."""
+        start = max(start, 0)
+        return start, min(start + PAGE_SIZE, self.entries)
+
+    def page(self, start: int = 0) -> bytes:
+        """The page of the feed at offset `start`, as served by FPDS."""
+        first, end = self.page_range(start)
+        entries = "".join(self.entry(index) for index in range(first, end))
+        links = (
+            f'<ns0:link rel="alternate" type="text/html" '
+            f'href="{escape(FEED_URL)}&amp;start={start}" />'
+        )
+        if self.entries > PAGE_SIZE:
+            links += (
+                f'<ns0:link rel="last" type="text/html" '
+                f'href="{escape(FEED_URL)}&amp;start={self.last}" />'
+            )
+        return (
+            f'<ns0:feed xmlns:ns0="{ATOM_NAMESPACE}" xmlns:ns1="{FPDS_NAMESPACE}">'
+            "<ns0:title>FPDS-NG search results for: SYNTHETIC</ns0:title>"
+            f"{links}<ns0:modified /><ns0:author><ns0:name /></ns0:author>"
+            f"{entries}</ns0:feed>"
+        ).encode("utf-8")
+
+    def pages(self) -> List[bytes]:
+        """Every page of the feed."""
+        return [self.page(start) for start in self.offsets]
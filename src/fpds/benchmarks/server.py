@@ -0,0 +1,103 @@
+"""
+Local mock of the FPDS ATOM feed, serving a synthetic feed.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import asyncio
+import os
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from aiohttp import web
+
+from fpds.benchmarks.feed import fpdsFeedGenerator
+from fpds.config import FPDS_URL_BASE_VARIABLE
+
+# `start` offsets requested, in arrival order
+REQUESTS = web.AppKey("requests", list)
+# number of injected errors
+ERRORS = web.AppKey("errors", list)
+
+
+def mock_feed_application(
+    generator: fpdsFeedGenerator,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> web.Application:
+    """An aiohttp application serving the pages of `generator` by `start=`
+    offset, whatever the search parameters.
+
+    Parameters
+    ----------
+    generator: `fpdsFeedGenerator`
+        Feed to serve.
+    latency: `float`
+        Defaults to 0.
+        Seconds to wait before responding.
+    error_rate: `float`
+        Defaults to 0.
+        Share of requests answered with a 503, at random.
+    seed: `int`
+        Defaults to 0.
+        Seed of the injected errors.
+    """
+    app = web.Application()
+    app[REQUESTS] = []
+    app[ERRORS] = []
+    rng = random.Random(seed)
+    # pages are rendered once, like a real feed that doesn't change under us
+    cache: Dict[int, bytes] = {}
+
+    async def handler(request: web.Request) -> web.Response:
+        start = int(request.query.get("start", 0))
+        app[REQUESTS].append(start)
+        if latency:
+            await asyncio.sleep(latency)
+        if error_rate and rng.random() < error_rate:
+            app[ERRORS].append(start)
+            return web.Response(status=503)
+        if start not in cache:
+            cache[start] = generator.page(start)
+        return web.Response(body=cache[start], content_type="application/xml")
+
+    app.router.add_get("/", handler)
+    return app
+
+
+@asynccontextmanager
+async def serve_feed(
+    generator: fpdsFeedGenerator,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> AsyncIterator[web.Application]:
+    """Serves `generator` on a free local port, pointing every `fpdsRequest`
+    at it for the duration of the context through the `FPDS_URL_BASE`
+    environment variable. See :func:`mock_feed_application` for a description
+    of the parameters.
+
+    Example:
+    -------
+    >>> async with serve_feed(fpdsFeedGenerator(entries=1000)) as app:
+    ...     records = await fpdsRequest(AGENCY_CODE="7504").data()
+    """
+    app = mock_feed_application(generator, latency, error_rate, seed)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    previous = os.environ.get(FPDS_URL_BASE_VARIABLE)
+    os.environ[FPDS_URL_BASE_VARIABLE] = f"http://{host}:{port}/?FEEDNAME=PUBLIC"
+    try:
+        yield app
+    finally:
+        if previous is None:
+            os.environ.pop(FPDS_URL_BASE_VARIABLE, None)
+        else:
+            os.environ[FPDS_URL_BASE_VARIABLE] = previous
+        await runner.cleanup()
@@ -0,0 +1,439 @@
+"""
+Benchmark suite for parsing and retrieving FPDS records from a local feed.
+
+Records come from a synthetic feed (`fpdsFeedGenerator`), served locally by
+`serve_feed` for the benchmarks that make requests. Each benchmark runs in a
+fresh process, so that its peak RSS is its own, and reports the records it
+produced per second, plus details of its own (e.g. HTTP calls, file sizes).
+
+Usage:
+    $ python -m fpds.benchmarks
+        [jsonify project flatten compact fetch data write store cli]
+        [--entries 2000] [--depth 0] [--idv-ratio 0.2]
+        [--latency 0.0] [--error-rate 0.0] [--thread-count 10]
+        [--format jsonl] [--compression <compression>]
+        [--xml-backend stdlib] [--fields 30] [--coerce] [--lookups 1000]
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aiohttp import web
+
+from fpds.benchmarks.feed import fpdsFeedGenerator
+from fpds.benchmarks.server import serve_feed
+from fpds.core.backends import DEFAULT_XML_BACKEND, XML_BACKENDS
+
+# a benchmark returns the records it produced, optionally with details
+RUN_TYPE = Callable[[], Union[int, Tuple[int, str]]]
+BENCHMARK_TYPE = Callable[[argparse.Namespace], RUN_TYPE]
+SAVED_PATTERN = re.compile(r"(\d+) record\(s\) have been saved")
+
+
+class fpdsBenchmarkResult(NamedTuple):
+    name: str
+    records: int
+    seconds: float
+    peak_rss: Optional[int]
+    details: str = ""
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, if available."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kibibytes, except on macOS
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def generator_of(options: argparse.Namespace) -> fpdsFeedGenerator:
+    return fpdsFeedGenerator(
+        entries=options.entries,
+        depth=options.depth,
+        idv_ratio=options.idv_ratio,
+        seed=options.seed,
+    )
+
+
+@contextmanager
+def serve_feed_in_thread(options: argparse.Namespace) -> Iterator[web.Application]:
+    """Serves the synthetic feed from an event loop of its own, so that code
+    running its own loop (e.g. the CLI) can request it.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = serve_feed(
+        generator_of(options),
+        latency=options.latency,
+        error_rate=options.error_rate,
+        seed=options.seed,
+    )
+    app = asyncio.run_coroutine_threadsafe(server.__aenter__(), loop).result()
+    try:
+        yield app
+    finally:
+        exit_server = server.__aexit__(None, None, None)
+        asyncio.run_coroutine_threadsafe(exit_server, loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def varied_pages(options: argparse.Namespace) -> List[bytes]:
+    """Pages of the feed whose entries come in many shapes: each page is
+    nested 0 to 4 levels deeper than `--depth`.
+    """
+    generator = generator_of(options)
+    pages = []
+    for index, start in enumerate(generator.offsets):
+        generator.depth = options.depth + index % 5
+        pages.append(generator.page(start))
+    return pages
+
+
+def mebibytes(build: Callable[[], Any]) -> float:
+    """MiB still allocated by the result of `build`."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 2**20
+
+
+def bench_jsonify(options: argparse.Namespace) -> RUN_TYPE:
+    """Parses and flattens every page with `fpdsTree.jsonify`."""
+    from fpds.core.xml import fpdsTree
+
+    pages = generator_of(options).pages()
+    return lambda: sum(len(fpdsTree(page).jsonify()) for page in pages)
+
+
+def bench_project(options: argparse.Namespace) -> RUN_TYPE:
+    """Parses every page with `fpdsTree.jsonify`, keeping `--fields` keys
+    spread evenly over the records.
+    """
+    from fpds.core.xml import fpdsTree
+
+    pages = generator_of(options).pages()
+    keys = list(dict.fromkeys(key for r in fpdsTree(pages[0]).jsonify() for key in r))
+    fields = keys[:: max(1, len(keys) // options.fields)][: options.fields]
+
+    def run() -> Tuple[int, str]:
+        records = [fpdsTree(page).jsonify(fields=fields) for page in pages]
+        size = len(json.dumps(records[0])) / 2**10
+        return sum(map(len, records)), f"{len(fields)} fields, {size:.1f} KiB/page"
+
+    return run
+
+
+def bench_compact(options: argparse.Namespace) -> RUN_TYPE:
+    """Converts the records of every page into compact records (coerced,
+    with `--coerce`), reporting the memory they hold against dictionaries.
+    Pages vary in shape; see :func:`varied_pages`.
+    """
+    from fpds.core.compact import fpdsKeyTable
+    from fpds.core.xml import fpdsTree
+
+    pages = varied_pages(options)
+
+    def parse() -> List[Any]:
+        return [record for page in pages for record in fpdsTree(page).jsonify()]
+
+    def compact() -> List[Any]:
+        table = fpdsKeyTable()
+        return [table.compact(r, coerce=options.coerce) for r in parse()]
+
+    details = (
+        f"{mebibytes(parse):.1f} MiB as dict, {mebibytes(compact):.1f} MiB compact"
+    )
+    records = parse()
+
+    def run() -> Tuple[int, str]:
+        table = fpdsKeyTable()
+        for record in records:
+            table.compact(record, coerce=options.coerce)
+        return len(records), f"{details}, {len(table)} shapes"
+
+    return run
+
+
+def bench_flatten(options: argparse.Namespace) -> RUN_TYPE:
+    """Flattens the entries of already parsed pages with `EntryFlattener`."""
+    from fpds.core.xml import fpdsTree
+
+    trees = [fpdsTree(page) for page in generator_of(options).pages()]
+    entries = [(tree.flattener, tree.get_atom_feed_entries()) for tree in trees]
+
+    def run() -> int:
+        return sum(
+            len([flattener.flatten(entry) for entry in page])
+            for flattener, page in entries
+        )
+
+    return run
+
+
+def request_kwargs(options: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "thread_count": options.thread_count,
+        "retries": 10,
+        "backoff": 0.01,
+        "AGENCY_CODE": "7504",
+    }
+
+
+def http_calls(app: web.Application) -> str:
+    from fpds.benchmarks.server import ERRORS, REQUESTS
+
+    return f"{len(app[REQUESTS])} HTTP calls, {len(app[ERRORS])} failed"
+
+
+def bench_fetch(options: argparse.Namespace) -> RUN_TYPE:
+    """Downloads every page with `fpdsRequest.fetch`, without parsing them."""
+    from fpds.core.parser import fpdsRequest
+
+    def run() -> Tuple[int, str]:
+        with serve_feed_in_thread(options) as app:
+            request = fpdsRequest(**request_kwargs(options))
+            pages = asyncio.run(request.fetch())
+        count = sum(len(page.get_atom_feed_entries()) for page in pages)
+        return count, http_calls(app)
+
+    return run
+
+
+def bench_data(options: argparse.Namespace) -> RUN_TYPE:
+    """Downloads and parses every page with `fpdsRequest.data`."""
+    from fpds.core.parser import fpdsRequest
+
+    def run() -> Tuple[int, str]:
+        with serve_feed_in_thread(options) as app:
+            request = fpdsRequest(**request_kwargs(options))
+            count = len(asyncio.run(request.data()))
+        return count, http_calls(app)
+
+    return run
+
+
+def bench_write(options: argparse.Namespace) -> RUN_TYPE:
+    """Writes the records of every page as `--format` (compressed with
+    `--compression`, if given), reporting the size of the output.
+    """
+    from fpds.core.writers import (
+        fpdsJsonLinesWriter,
+        fpdsParquetWriter,
+        jsonl_filename,
+    )
+    from fpds.core.xml import fpdsTree
+
+    pages = [fpdsTree(page).jsonify() for page in generator_of(options).pages()]
+
+    def run() -> Tuple[int, str]:
+        with tempfile.TemporaryDirectory() as directory:
+            writer: Union[fpdsJsonLinesWriter, fpdsParquetWriter]
+            if options.format == "json":
+                path = Path(directory) / "records.json"
+                with open(path, "w") as outfile:
+                    json.dump([r for page in pages for r in page], outfile)
+            elif options.format == "jsonl":
+                compression = options.compression or "none"
+                path = Path(directory) / jsonl_filename("records", compression)
+                with fpdsJsonLinesWriter(path, compression=compression) as writer:
+                    for page in pages:
+                        writer.write(page)
+            else:
+                path = Path(directory) / "records.parquet"
+                compression = options.compression or "snappy"
+                with fpdsParquetWriter(path, compression=compression) as writer:
+                    for page in pages:
+                        writer.write(page)
+            # Parquet output is a directory of part files
+            files = list(path.iterdir()) if path.is_dir() else [path]
+            size = sum(file.stat().st_size for file in files) / 2**20
+        return sum(map(len, pages)), f"{size:.2f} MiB"
+
+    return run
+
+
+def bench_store(options: argparse.Namespace) -> RUN_TYPE:
+    """Upserts the records of every page into an `fpdsStore`, then looks up
+    `--lookups` awards by PIID through its index.
+    """
+    from fpds.core.store import fpdsStore
+    from fpds.core.xml import fpdsTree
+
+    generator = generator_of(options)
+    pages = [fpdsTree(page).jsonify() for page in generator.pages()]
+    piids = [
+        f"{'IDV' if generator.is_idv(index) else 'AW'}{index:08d}"
+        for index in range(generator.entries)
+    ]
+    lookups = random.Random(options.seed).choices(piids, k=options.lookups)
+
+    def run() -> Tuple[int, str]:
+        with tempfile.TemporaryDirectory() as directory:
+            with fpdsStore(Path(directory) / "records.db") as store:
+                for page in pages:
+                    store.write(page)
+                started = time.perf_counter()
+                for piid in lookups:
+                    list(store.query(piid=piid))
+                elapsed = time.perf_counter() - started
+                count = len(store)
+        per_lookup = elapsed / max(len(lookups), 1) * 1000
+        return count, f"{per_lookup:.3f} ms per PIID lookup"
+
+    return run
+
+
+def bench_cli(options: argparse.Namespace) -> RUN_TYPE:
+    """Runs `fpds parse` end to end, writing `--format` output (compressed
+    with `--compression`, if given) to a temporary directory.
+    """
+    from click.testing import CliRunner
+
+    from fpds.cli import cli
+
+    def run() -> int:
+        with serve_feed_in_thread(options), tempfile.TemporaryDirectory() as out:
+            args = ["parse", "AGENCY_CODE=7504", "-o", out, "-f", options.format]
+            if options.compression:
+                args += ["--compression", options.compression]
+            result = CliRunner().invoke(cli, args, catch_exceptions=False)
+            # "<count> record(s) have been saved as JSONL at: ..."
+            match = SAVED_PATTERN.search(result.output)
+            if match is None:
+                raise RuntimeError(f"Unexpected `fpds parse` output:\n{result.output}")
+            return int(match.group(1))
+
+    return run
+
+
+BENCHMARKS: Dict[str, BENCHMARK_TYPE] = {
+    "jsonify": bench_jsonify,
+    "project": bench_project,
+    "flatten": bench_flatten,
+    "compact": bench_compact,
+    "fetch": bench_fetch,
+    "data": bench_data,
+    "write": bench_write,
+    "store": bench_store,
+    "cli": bench_cli,
+}
+
+
+def run_benchmark(name: str, options: argparse.Namespace) -> fpdsBenchmarkResult:
+    """Runs a benchmark in this process. Its setup (e.g. generating the
+    feed) isn't timed.
+    """
+    from fpds.core.backends import set_xml_backend
+    from fpds.core.executor import default_executor
+
+    set_xml_backend(options.xml_backend)
+    benchmark = BENCHMARKS[name](options)
+    try:
+        started = time.perf_counter()
+        result = benchmark()
+        seconds = time.perf_counter() - started
+    finally:
+        # a process exiting from `multiprocessing` joins its children before
+        # `atexit` handlers run, so the shared pool has to be stopped here
+        default_executor().shutdown()
+    records, details = result if isinstance(result, tuple) else (result, "")
+    return fpdsBenchmarkResult(name, records, seconds, peak_rss(), details)
+
+
+def run_isolated(name: str, options: argparse.Namespace) -> fpdsBenchmarkResult:
+    """Runs a benchmark in a fresh process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_benchmark, name, options).result()
+
+
+def format_result(result: fpdsBenchmarkResult) -> str:
+    rss = "n/a" if result.peak_rss is None else f"{result.peak_rss / 2**20:.0f} MiB"
+    return (
+        f"{result.name:<10}{result.records:>10}{result.seconds:>10.2f}s"
+        f"{result.records_per_second:>14.0f}/s{rss:>14}  {result.details}"
+    ).rstrip()
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m fpds.benchmarks", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument(
+        "benchmarks", nargs="*", help=f"any of {', '.join(BENCHMARKS)} (default: all)"
+    )
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=0)
+    parser.add_argument("--idv-ratio", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--thread-count", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--format", choices=("json", "jsonl", "parquet"), default="jsonl"
+    )
+    parser.add_argument("--compression", default=None)
+    parser.add_argument(
+        "--xml-backend", choices=XML_BACKENDS, default=DEFAULT_XML_BACKEND
+    )
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--coerce", action="store_true")
+    parser.add_argument("--lookups", type=int, default=1000)
+    options = parser.parse_args(args)
+    unknown = [name for name in options.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    return options
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    options = parse_args(args)
+    from fpds.core.backends import get_xml_backend
+
+    print(f"XML backend: {get_xml_backend(options.xml_backend).name}")
+    print(
+        f"{'benchmark':<10}{'records':>10}{'time':>11}{'records/s':>16}"
+        f"{'peak RSS':>14}  details"
+    )
+    for name in options.benchmarks or BENCHMARKS:
+        print(format_result(run_isolated(name, options)), flush=True)
@@ -3,20 +3,70 @@ Parsing command for retrieving FPDS federal
 contracts.
 
 author: derek663@gmail.com
-last_updated: 2025-07-14
+last_updated: 2026-10-18
 """
 
-import asyncio
 import json
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, List, Optional, Union
 from uuid import uuid4
 
 import click
 from click import UsageError
 
-from fpds import fpdsRequest
-from fpds.config import FPDS_DATA_DATE_DIR
-from fpds.utilities import validate_kwarg
+from fpds.config import FPDS_DATA_DATE_DIR, FPDS_STORE_PATH
+from fpds.core.cache import DEFAULT_CACHE_TTL, fpdsCache
+from fpds.core.writers import (
+    COMPRESSION_SUFFIXES,
+    DEFAULT_ROW_GROUP_SIZE,
+    fpdsJsonLinesWriter,
+    fpdsParquetWriter,
+    jsonl_filename,
+)
+
+# `fpds --help` only needs the options above; the request machinery (and
+# with it `aiohttp`, `tqdm` and the executors) is imported when parsing
+if TYPE_CHECKING:
+    from fpds.core.checkpoint import fpdsCheckpoint
+    from fpds.core.parser import fpdsRequest
+    from fpds.core.stats import fpdsStats
+
+PARQUET_COMPRESSIONS = ("none", "snappy", "gzip", "zstd")
+
+
+def _serializing(stats: Optional["fpdsStats"]) -> ContextManager[None]:
+    """Times the block as the "serialize" stage of `stats`, if given."""
+    return nullcontext() if stats is None else stats.stage("serialize")
+
+
+async def _checkpoint_pages(
+    request: "fpdsRequest",
+    checkpoint: "fpdsCheckpoint",
+    fields: Optional[List[str]] = None,
+) -> None:
+    """Retrieves pages that aren't checkpointed yet, checkpointing each one as
+    it completes.
+    """
+    await request.prepare()
+    links = checkpoint.pending(request.links)
+    skipped = request.page_count - len(links)
+    if skipped:
+        click.echo(f"Resuming: skipping {skipped} already completed page(s)")
+
+    async for link, records in request.iter_pages(links=links, fields=fields):
+        checkpoint.save(link, records)
+
+
+async def _write_pages(
+    request: "fpdsRequest",
+    writer: Union[fpdsJsonLinesWriter, fpdsParquetWriter],
+    fields: Optional[List[str]] = None,
+) -> None:
+    """Writes the records of each page as soon as it is parsed."""
+    async for _, records in request.iter_pages(fields=fields):
+        with _serializing(request.stats):
+            writer.write(records)
 
 
 @click.command()
@@ -37,8 +87,111 @@ from fpds.utilities import validate_kwarg
     type=click.Path(exists=False, path_type=Path),
     help="Output directory",
 )
+@click.option(
+    "-c",
+    "--checkpoint",
+    is_flag=True,
+    default=False,
+    help="Checkpoints each completed page so an interrupted run can be resumed",
+)
+@click.option(
+    "-r",
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Resumes a checkpointed run, skipping pages that already completed",
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    default=False,
+    help="Serves repeat page requests from an on-disk cache in ~/.fpds/cache",
+)
+@click.option(
+    "--cache-ttl",
+    metavar="<seconds>",
+    required=False,
+    default=DEFAULT_CACHE_TTL,
+    show_default=True,
+    type=float,
+    help="Seconds a cached page stays fresh",
+)
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "jsonl", "parquet"]),
+    default="json",
+    show_default=True,
+    help=(
+        "Output format. jsonl and parquet write records as they arrive; "
+        "parquet requires fpds[parquet]"
+    ),
+)
+@click.option(
+    "--compression",
+    type=click.Choice(sorted({*COMPRESSION_SUFFIXES, *PARQUET_COMPRESSIONS})),
+    default=None,
+    help=(
+        "Compression of jsonl (default none; zstd requires fpds[zstd]) or "
+        "parquet (default snappy) output"
+    ),
+)
+@click.option(
+    "--row-group-size",
+    metavar="<int>",
+    default=DEFAULT_ROW_GROUP_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Records per Parquet row group",
+)
+@click.option(
+    "--store",
+    "store_path",
+    metavar="[<path>]",
+    is_flag=False,
+    flag_value=str(FPDS_STORE_PATH),
+    default=None,
+    type=click.Path(path_type=Path),
+    help=(
+        "Also upserts records into a local SQLite store, by default ~/.fpds/records.db"
+    ),
+)
+@click.option(
+    "--fields",
+    metavar="<keys>",
+    multiple=True,
+    help=(
+        "Comma-separated record keys to keep, e.g. contract_type,modified. "
+        "Can be repeated"
+    ),
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help=(
+        "Reports download, parse, flatten and write times, bytes, retries and "
+        "records at the end of the run"
+    ),
+)
 @click.argument("params", nargs=-1)
-def parse(params, output_dir, skip_regex_validation) -> None:  # type: ignore
+def parse(  # type: ignore
+    params,
+    output_dir,
+    skip_regex_validation,
+    checkpoint,
+    resume,
+    cache,
+    cache_ttl,
+    output_format,
+    compression,
+    row_group_size,
+    store_path,
+    fields,
+    show_stats,
+) -> None:
     """
     Parsing command for the FPDS Atom feed
 
@@ -60,13 +213,64 @@ def parse(params, output_dir, skip_regex_validation) -> None:  # type: ignore
 
         \b
           fpds parse "LAST_MOD_DATE=[2022/01/01, 2022/05/01]" "AGENCY_CODE=7504"
+
+        \b
+        Long downloads can be checkpointed with -c. If the run is interrupted,
+        re-running the same command with -r only downloads the missing pages.
+
+        \b
+        With -f jsonl, records are streamed to disk as they are parsed, so
+        memory use doesn't grow with the size of the result:
+
+        \b
+          fpds parse "AGENCY_CODE=7504" -f jsonl --compression gzip
+
+        \b
+        With -f parquet, records are written to a directory of Parquet files
+        with one string column per record key:
+
+        \b
+          fpds parse "AGENCY_CODE=7504" -f parquet --row-group-size 50000
+
+        \b
+        With --store, records are also upserted into a local SQLite store
+        indexed on PIID, agency ID, modification number, contract type and
+        signed date (see `fpdsStore.query`). Records are stored whole, even
+        with --fields.
+
+        \b
+        With --fields, records only hold the given keys, and the parts of
+        each entry that can't contribute to them are skipped:
+
+        \b
+          fpds parse "AGENCY_CODE=7504" --fields contract_type,modified
+
+        \b
+        With --stats, per-stage timings (download latency, XML parsing,
+        flattening, writing) are reported at the end of the run.
     """
+    import asyncio
+
+    from fpds.core.checkpoint import fpdsCheckpoint
+    from fpds.core.parser import fpdsRequest
+    from fpds.core.stats import fpdsStats
+    from fpds.core.store import fpdsStore
+    from fpds.utilities import validate_kwarg
+
+    if output_format == "json" and compression is not None:
+        raise UsageError("--compression requires --format jsonl or parquet")
+    if output_format == "jsonl" and compression not in (None, *COMPRESSION_SUFFIXES):
+        raise UsageError(f"--compression {compression} isn't supported for jsonl")
 
     if output_dir:
         if not output_dir.exists():
             click.echo(f"Creating output directory {str(output_dir.resolve())}")
             output_dir.mkdir(parents=True, exist_ok=True)
 
+    projection: Optional[List[str]] = None
+    if fields:
+        projection = [key for value in fields for key in value.split(",") if key]
+
     params = [param.split("=") for param in params]
 
     if not params:
@@ -79,13 +283,90 @@ def parse(params, output_dir, skip_regex_validation) -> None:  # type: ignore
     params_kwargs = dict(params)
     click.echo(f"Params to be used for FPDS search: {params_kwargs}")
 
-    request = fpdsRequest(**params_kwargs, cli_run=True, skip_regex_validation=skip_regex_validation)
+    _cache = fpdsCache(ttl=cache_ttl) if cache else None
+    _store = fpdsStore(store_path) if store_path else None
+    _stats = fpdsStats() if show_stats else None
+    # checkpointed runs store every checkpointed page once they complete,
+    # unless pages are checkpointed with --fields: those are stored whole as
+    # they are retrieved
+    checkpointed = checkpoint or resume
+    request_store = None if checkpointed and projection is None else _store
+    request = fpdsRequest(
+        **params_kwargs,
+        cli_run=True,
+        skip_regex_validation=skip_regex_validation,
+        cache=_cache,
+        store=request_store,
+        stats=_stats,
+    )
     click.echo("Retrieving FPDS records from ATOM feed...")
 
-    records = asyncio.run(request.data())
+    _checkpoint: Optional[fpdsCheckpoint] = None
+    if checkpoint or resume:
+        checkpoint_params = request.search_params
+        if projection is not None:
+            # pages checkpointed with other fields can't be reused
+            checkpoint_params += f" fields:{','.join(sorted(projection))}"
+        _checkpoint = fpdsCheckpoint(params=checkpoint_params)
+        if not resume:
+            _checkpoint.clear()
+        asyncio.run(_checkpoint_pages(request, _checkpoint, projection))
+        if _store is not None and projection is None:
+            _store.write(_checkpoint.records())
+
     DATA_DIR = output_dir if output_dir else FPDS_DATA_DATE_DIR
-    DATA_FILE = DATA_DIR / f"{uuid4()}.json"
-    with open(DATA_FILE, "w") as outfile:
-        json.dump(records, outfile)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    if output_format in ("jsonl", "parquet"):
+        writer: Union[fpdsJsonLinesWriter, fpdsParquetWriter]
+        try:
+            if output_format == "jsonl":
+                compression = compression or "none"
+                DATA_FILE = DATA_DIR / jsonl_filename(str(uuid4()), compression)
+                writer = fpdsJsonLinesWriter(DATA_FILE, compression=compression)
+            else:
+                DATA_FILE = DATA_DIR / f"{uuid4()}.parquet"
+                writer = fpdsParquetWriter(
+                    DATA_FILE,
+                    row_group_size=row_group_size,
+                    compression=compression or "snappy",
+                )
+        except ImportError as exc:
+            raise UsageError(str(exc))
+        with writer:
+            if _checkpoint:
+                with _serializing(_stats):
+                    writer.write(_checkpoint.records())
+            else:
+                asyncio.run(_write_pages(request, writer, projection))
+        record_count = writer.count
+    else:
+        if _checkpoint:
+            records = list(_checkpoint.records())
+        else:
+            records = asyncio.run(request.data(fields=projection))
+        DATA_FILE = DATA_DIR / f"{uuid4()}.json"
+        with _serializing(_stats), open(DATA_FILE, "w") as outfile:
+            json.dump(records, outfile)
+        record_count = len(records)
+
+    click.echo(
+        f"{record_count} record(s) have been saved as {output_format.upper()} "
+        f"at: {DATA_FILE}"
+    )
+    if _cache:
+        click.echo(f"Cache: {_cache.hits} hit(s), {_cache.misses} miss(es)")
+    if _stats is not None:
+        _stats.finish()
+        click.echo(f"Stats:\n{_stats.report()}")
+    if _store is not None:
+        click.echo(f"{len(_store)} record(s) in the store at: {_store.path}")
+        _store.close()
 
-    click.echo(f"{len(records)} record(s) have been saved as JSON at: {DATA_FILE}")
+    if request.failed_links:
+        click.echo(f"{len(request.failed_links)} page(s) could not be retrieved:")
+        for link in request.failed_links:
+            click.echo(f"  {link}")
+        if _checkpoint:
+            click.echo("Re-run the same command with -r to retry them")
+    elif _checkpoint:
+        _checkpoint.clear()
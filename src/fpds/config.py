@@ -1,38 +1,57 @@
 """
 Configurations and constants.
 
+Importing this module has no side effects: the parameter config is only read
+on first use and directories are created when something is written to them.
+
 author: derek663@gmail.com
-last_updated: 2022-12-17
+last_updated: 2026-10-18
 """
 
 import json
-import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
 
 HOME = Path.home()
 CURRENT_DATE = datetime.now().strftime("%Y-%m-%d")
 
 # FPDS-specific configurations
 FPDS_DATA_DIR = HOME / ".fpds"
+FPDS_URL_BASE = "https://www.fpds.gov/ezsearch/FEEDS/ATOM?FEEDNAME=PUBLIC"
+# environment variable overriding `FPDS_URL_BASE`, e.g. to point at a mirror or
+# a local mock of the feed; inherited by worker processes
+FPDS_URL_BASE_VARIABLE = "FPDS_URL_BASE"
 FPDS_FIELDS_FILE = "fields.json"
 
-# assumes a python3.x version
-if sys.version_info[1] <= 8:
-    from importlib.resources import path
+# location where downloaded data will be dumped
+FPDS_DATA_DATE_DIR = FPDS_DATA_DIR / CURRENT_DATE
+# local record store; see `fpdsStore`
+FPDS_STORE_PATH = FPDS_DATA_DIR / "records.db"
+
 
-    with path("fpds.constants", FPDS_FIELDS_FILE) as file:  # type: ignore
-        FPDS_FIELDS_FILE_PATH = file
-else:
+def fields_file_path() -> "Traversable":
     from importlib.resources import files
 
-    FPDS_FIELDS_FILE_PATH = files("fpds.constants").joinpath(FPDS_FIELDS_FILE)
+    return files("fpds.constants").joinpath(FPDS_FIELDS_FILE)
 
-# location where downloaded data will be dumped
-FPDS_DATA_DATE_DIR = FPDS_DATA_DIR / CURRENT_DATE
 
-# actions
-FPDS_DATA_DATE_DIR.mkdir(parents=True, exist_ok=True)
+@lru_cache(maxsize=None)
+def load_fields_config() -> List[Dict[str, Any]]:
+    """Search parameter entries of `fields.json`, read on first use."""
+    with fields_file_path().open(encoding="utf-8") as file:
+        config: List[Dict[str, Any]] = json.load(file)
+    return config
+
 
-with Path(FPDS_FIELDS_FILE_PATH).open(encoding="utf-8") as file:  # type: ignore
-    FPDS_FIELDS_CONFIG = json.load(file)
+def __getattr__(name: str) -> Any:
+    # both used to be evaluated at import time
+    if name == "FPDS_FIELDS_FILE_PATH":
+        return fields_file_path()
+    if name == "FPDS_FIELDS_CONFIG":
+        return load_fields_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
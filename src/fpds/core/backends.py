@@ -0,0 +1,149 @@
+"""
+XML parser backends for `fpds.core.xml`.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import os
+import threading
+import warnings
+from functools import lru_cache
+from typing import Any, Literal, Optional, Tuple
+from xml.etree.ElementTree import Element, XMLPullParser, fromstring
+
+XML_BACKENDS = ("auto", "lxml", "stdlib")
+# environment variable naming the default backend; inherited by worker processes
+XML_BACKEND_VARIABLE = "FPDS_XML_BACKEND"
+# lxml parses faster, but its elements are slower to walk, so records take
+# longer to flatten; the standard library is faster end to end
+DEFAULT_XML_BACKEND = "stdlib"
+PULL_EVENT = Literal["start", "end"]
+
+
+def _import_lxml() -> Any:
+    try:
+        from lxml import etree
+    except ImportError as exc:
+        raise ImportError(
+            "The lxml XML backend requires `lxml`: pip install fpds[lxml]"
+        ) from exc
+    return etree
+
+
+class fpdsXMLBackend:
+    """Parses ATOM feed pages with the standard library's `xml.etree`.
+
+    Backends build trees and incremental parsers whose elements share the
+    `ElementTree` API (`tag`, `text`, `attrib`, `find`, `iter`, ...), so every
+    class in `fpds.core.xml` works the same on top of any of them and produces
+    identical records.
+
+    Attributes
+    ----------
+    name: `str`
+        Name of the backend, as accepted by :func:`get_xml_backend`.
+    """
+
+    name = "stdlib"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsXMLBackend {self.name}>"
+
+    def fromstring(self, content: bytes) -> Element:
+        """Root element of the document in `content`."""
+        return fromstring(content)
+
+    def pull_parser(self, events: Tuple[PULL_EVENT, ...]) -> "XMLPullParser[Element]":
+        """Incremental parser reporting `events` (e.g. "start", "end")."""
+        return XMLPullParser(events=events)
+
+
+class fpdsLxmlBackend(fpdsXMLBackend):
+    """Parses ATOM feed pages with lxml, about three times faster than the
+    standard library. Walking its elements is slower, though, so flattening
+    them into records takes longer; it pays off for work that mostly parses,
+    e.g. `fpdsRequest.fetch`.
+
+    Comments and processing instructions are dropped, like the standard
+    library's tree builder does. Elements know their parent, which
+    `EntryFlattener` uses to walk entries in a single pass.
+
+    Raises
+    ------
+    ImportError:
+        Raised if `lxml` isn't installed.
+    """
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        self.etree = _import_lxml()
+        # lxml parsers can't be shared by threads parsing at the same time
+        self._local = threading.local()
+
+    @property
+    def parser(self) -> Any:
+        """This thread's parser."""
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = self.etree.XMLParser(
+                remove_comments=True, remove_pis=True
+            )
+        return parser
+
+    def fromstring(self, content: bytes) -> Element:
+        return self.etree.fromstring(content, self.parser)
+
+    def pull_parser(self, events: Tuple[PULL_EVENT, ...]) -> "XMLPullParser[Element]":
+        return self.etree.XMLPullParser(
+            events=events, remove_comments=True, remove_pis=True
+        )
+
+
+@lru_cache(maxsize=None)
+def _backend(name: str) -> fpdsXMLBackend:
+    if name not in XML_BACKENDS:
+        raise ValueError(f"XML backend must be one of {XML_BACKENDS}, not {name!r}")
+    if name == "stdlib":
+        return fpdsXMLBackend()
+    try:
+        return fpdsLxmlBackend()
+    except ImportError as exc:
+        if name == "lxml":
+            warnings.warn(f"{exc}; falling back to the standard library")
+        return fpdsXMLBackend()
+
+
+def get_xml_backend(name: Optional[str] = None) -> fpdsXMLBackend:
+    """The XML backend called `name`.
+
+    "auto" is lxml when it is installed and the standard library otherwise.
+    Asking for lxml without it installed falls back to the standard library
+    with a warning. The standard library is the default, since it flattens
+    records faster; see :class:`fpdsLxmlBackend`.
+
+    Parameters
+    ----------
+    name: `Optional[str]`
+        Defaults to the `FPDS_XML_BACKEND` environment variable, or "stdlib".
+        One of "auto", "lxml" or "stdlib".
+
+    Raises
+    ------
+    ValueError:
+        Raised if `name` isn't a known backend.
+    """
+    if name is None:
+        name = os.environ.get(XML_BACKEND_VARIABLE) or DEFAULT_XML_BACKEND
+    return _backend(name)
+
+
+def set_xml_backend(name: str) -> fpdsXMLBackend:
+    """Makes `name` the default XML backend of this process and of the worker
+    processes it starts from now on, through the `FPDS_XML_BACKEND`
+    environment variable. Returns the backend in use.
+    """
+    backend = _backend(name)
+    os.environ[XML_BACKEND_VARIABLE] = name
+    return backend
@@ -0,0 +1,269 @@
+"""
+Batch client for running many FPDS searches at once.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import asyncio
+from asyncio import Semaphore
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from aiohttp import ClientSession
+from tqdm import tqdm
+
+from fpds.core import FPDS_ENTRY
+from fpds.core.executor import default_executor, fpdsExecutor
+from fpds.core.parser import create_session, fpdsRequest, session_scope
+from fpds.utilities import RateLimiter
+
+QUERIES_TYPE = Union[Mapping[Hashable, Mapping[str, str]], Iterable[Mapping[str, str]]]
+
+
+class fpdsBatchRequest:
+    """Runs many searches on one event loop, sharing a single session (and
+    its connection pool), a single request limit and a single parser
+    executor between them.
+
+    Each search is an `fpdsRequest` and is tagged, either with its key when
+    `queries` is a mapping or with its position otherwise. Records are
+    streamed back, with their tag, as soon as each page is parsed.
+
+    Example:
+    -------
+    >>> batch = fpdsBatchRequest(
+    >>>     {code: {"AGENCY_CODE": code} for code in agency_codes},
+    >>>     LAST_MOD_DATE="[2022/01/01, 2022/05/01]",
+    >>> )
+    >>> async for agency_code, record in batch.iter_data():
+    >>>     ...
+
+    Attributes
+    ----------
+    queries: `Union[Mapping[Hashable, Mapping[str, str]], Iterable[Mapping[str, str]]]`
+        Search parameters of each request.
+    thread_count: `int`
+        Defaults to 10.
+        The maximum number of concurrent page requests (and open connections)
+        across every search.
+    requests_per_second: `Optional[float]`
+        Defaults to `None`.
+        Caps how many page requests, across every search, may start per second.
+    max_queries: `Optional[int]`
+        Defaults to `thread_count`.
+        Maximum number of searches in progress at once.
+    executor: `Optional[fpdsExecutor]`
+        Defaults to the shared module-level executor.
+        Executor every page is parsed with.
+    **options: `Any`
+        Arguments shared by every `fpdsRequest` (e.g. `retries`, `cache`,
+        `shards`) and search parameters common to every query.
+    """
+
+    def __init__(
+        self,
+        queries: QUERIES_TYPE,
+        thread_count: int = 10,
+        requests_per_second: Optional[float] = None,
+        max_queries: Optional[int] = None,
+        executor: Optional[fpdsExecutor] = None,
+        **options: Any,
+    ) -> None:
+        self.thread_count = thread_count
+        self.requests_per_second = requests_per_second
+        self.max_queries = max_queries or thread_count
+        self.executor = executor
+        self.errors = {}  # type: Dict[Hashable, Exception]
+        self._semaphore: Optional[Semaphore] = None
+        self._rate_limiter: Optional[RateLimiter] = None
+
+        if isinstance(queries, Mapping):
+            items = list(queries.items())
+        else:
+            items = list(enumerate(queries))
+        self.requests = {
+            tag: fpdsRequest(
+                thread_count=thread_count,
+                requests_per_second=requests_per_second,
+                executor=executor,
+                **{**options, **params},
+            )
+            for tag, params in items
+        }  # type: Dict[Hashable, fpdsRequest]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsBatchRequest {len(self.requests)} searches>"
+
+    @property
+    def semaphore(self) -> Semaphore:
+        """Limits page requests in flight, across searches, to `thread_count`."""
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.thread_count)
+        return self._semaphore
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Spaces page requests, across searches, to `requests_per_second`."""
+        if self._rate_limiter is None:
+            self._rate_limiter = RateLimiter(self.requests_per_second)
+        return self._rate_limiter
+
+    @property
+    def failed_links(self) -> Dict[Hashable, List[str]]:
+        """Links of the pages that failed during the last run, by search."""
+        return {
+            tag: request.failed_links
+            for tag, request in self.requests.items()
+            if request.failed_links
+        }
+
+    def create_session(self) -> ClientSession:
+        """Returns the `ClientSession` shared by every search. See
+        :func:`fpds.core.parser.create_session`.
+        """
+        self._semaphore = None
+        self._rate_limiter = None
+        return create_session(self.thread_count)
+
+    def session_scope(
+        self, session: Optional[ClientSession] = None
+    ) -> AsyncContextManager[ClientSession]:
+        """Yields `session`, or a new session from :meth:`create_session` that
+        is closed afterwards.
+        """
+        return session_scope(session, self.create_session)
+
+    async def iter_pages(
+        self,
+        max_pending: Optional[int] = None,
+        session: Optional[ClientSession] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> AsyncGenerator[Tuple[Hashable, str, List[FPDS_ENTRY]], None]:
+        """Lazily yields the records of each page, along with the tag of its
+        search and its link, as soon as the page is parsed.
+
+        A search whose first page can't be retrieved doesn't stop the others;
+        its error is recorded in :attr:`errors`. Pages that fail are recorded
+        in :attr:`failed_links`.
+
+        Parameters
+        ----------
+        max_pending: `Optional[int]`
+            Defaults to twice `thread_count`.
+            Maximum number of parsed pages waiting to be yielded.
+        session: `Optional[ClientSession]`
+            Defaults to a session from :meth:`create_session`.
+            Session used for every page request of every search.
+        fields: `Optional[Iterable[str]]`
+            Defaults to `None`.
+            Flattened keys to keep in each record; see `fpdsRequest.iter_pages`.
+
+        Yields
+        ------
+        `Tuple[Hashable, str, List[FPDS_ENTRY]]`
+            A search tag, a page link and its records.
+        """
+        self.errors = {}
+        max_pending = max_pending or 2 * self.thread_count
+        executor = self.executor or default_executor()
+        async with self.session_scope(session) as _session:
+            for request in self.requests.values():
+                request.share_limits(self.semaphore, self.rate_limiter)
+                request.executor = executor
+
+            searches = iter(self.requests.items())
+            queue: asyncio.Queue[Optional[Tuple[Hashable, str, List[FPDS_ENTRY]]]] = (
+                asyncio.Queue(maxsize=max_pending)
+            )
+            progress_bar = tqdm(total=len(self.requests), unit="search")
+
+            async def run() -> None:
+                # searches are taken one at a time, so at most `max_queries`
+                # are in progress at once
+                for tag, request in searches:
+                    seen: Set[Hashable] = set()
+                    # pages of many searches arrive at once, so even small
+                    # searches are parsed in the executor rather than inline
+                    pages = request.iter_pages(
+                        max_pending=max_pending,
+                        session=_session,
+                        progress=False,
+                        inline=executor.kind == "inline",
+                        fields=fields,
+                    )
+                    try:
+                        async with aclosing(pages):
+                            async for link, records in pages:
+                                unique = request.unique(
+                                    records, seen, projected=fields is not None
+                                )
+                                records = list(unique)
+                                await queue.put((tag, link, records))
+                    except Exception as exc:
+                        self.errors[tag] = exc
+                    progress_bar.update()
+
+            async def run_all() -> None:
+                runners = min(self.max_queries, len(self.requests))
+                try:
+                    await asyncio.gather(*(run() for _ in range(runners)))
+                except asyncio.CancelledError:
+                    # the consumer stopped reading, so the queue may be full
+                    # and nobody waits for the end of the pages
+                    raise
+                except Exception:
+                    await queue.put(None)
+                    raise
+                await queue.put(None)
+
+            task = asyncio.create_task(run_all())
+            try:
+                with progress_bar:
+                    while (item := await queue.get()) is not None:
+                        yield item
+                await task
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def iter_data(
+        self,
+        max_pending: Optional[int] = None,
+        session: Optional[ClientSession] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> AsyncGenerator[Tuple[Hashable, FPDS_ENTRY], None]:
+        """Lazily yields every record along with the tag of its search. See
+        :meth:`iter_pages` for a description of the parameters.
+        """
+        pages = self.iter_pages(max_pending=max_pending, session=session, fields=fields)
+        async with aclosing(pages):
+            async for tag, _, records in pages:
+                for entry in records:
+                    yield tag, entry
+
+    async def data(
+        self,
+        session: Optional[ClientSession] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[Hashable, List[FPDS_ENTRY]]:
+        """Collects the records of every search, by tag, keeping only `fields`
+        if given.
+        """
+        records: Dict[Hashable, List[FPDS_ENTRY]] = {tag: [] for tag in self.requests}
+        async for tag, entry in self.iter_data(session=session, fields=fields):
+            records[tag].append(entry)
+        return records
@@ -0,0 +1,166 @@
+"""
+On-disk cache for ATOM feed responses.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fpds.config import FPDS_DATA_DIR
+
+FPDS_CACHE_DIR = FPDS_DATA_DIR / "cache"
+# one hour; FPDS data for a given query rarely changes faster than that
+DEFAULT_CACHE_TTL = 60 * 60
+DEFAULT_CACHE_MAX_SIZE = 2**30
+
+
+class fpdsCache:
+    """Content-addressed cache of ATOM feed pages, keyed by their full URL.
+
+    Every response is stored as a file named after the SHA-256 of its URL.
+    A file's modification time records when it was written and is used for
+    the TTL; its access time is bumped on every hit and drives least recently
+    used eviction once the cache grows past `max_size`.
+
+    Example:
+    -------
+    >>> cache = fpdsCache(ttl=6 * 60 * 60)
+    >>> request = fpdsRequest(cache=cache, **params)
+    >>> records = await request.data()
+    >>> cache.stats
+    {'hits': 0, 'misses': 120, 'size': 21495013}
+
+    Attributes
+    ----------
+    directory: `Optional[Path]`
+        Defaults to `~/.fpds/cache`.
+        Directory where responses are stored.
+    ttl: `Optional[float]`
+        Defaults to one hour.
+        Seconds a response stays fresh. `None` never expires responses.
+    max_size: `Optional[int]`
+        Defaults to 1 GiB.
+        Maximum total size of cached responses in bytes. `None` disables
+        eviction.
+    hits: `int`
+        Number of lookups served from the cache.
+    misses: `int`
+        Number of lookups that were missing or expired.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        max_size: Optional[int] = DEFAULT_CACHE_MAX_SIZE,
+    ) -> None:
+        self.directory = directory or FPDS_CACHE_DIR
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsCache {self.directory} hits={self.hits} misses={self.misses}>"
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Cache key of `url`."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def path(self, url: str) -> Path:
+        """File that holds the response for `url`."""
+        key = self.key(url)
+        return self.directory / key[:2] / key
+
+    @property
+    def size(self) -> int:
+        """Total size of cached responses in bytes."""
+        if self._size is None:
+            self._size = sum(file.stat().st_size for file in self._files())
+        return self._size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and the current size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": self.size}
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Returns the cached response for `url`, if it exists and is fresh."""
+        path = self.path(url)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        if self.ttl is not None and now - stat.st_mtime > self.ttl:
+            self._remove(path, stat.st_size)
+            self.misses += 1
+            return None
+
+        content = path.read_bytes()
+        # keep the write time (TTL), bump the access time (LRU)
+        os.utime(path, (now, stat.st_mtime))
+        self.hits += 1
+        return content
+
+    def set(self, url: str, content: bytes) -> None:
+        """Caches `content` as the response for `url`."""
+        path = self.path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            previous_size = path.stat().st_size
+        except FileNotFoundError:
+            previous_size = 0
+
+        temp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_file.write_bytes(content)
+        os.replace(temp_file, path)
+
+        if self._size is not None:
+            self._size += len(content) - previous_size
+        if self.max_size is not None and self.size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used responses until the cache fits in
+        `max_size`.
+        """
+        if self.max_size is None:
+            return
+        files = sorted(
+            ((file, file.stat()) for file in self._files()),
+            key=lambda item: item[1].st_atime,
+        )
+        self._size = sum(stat.st_size for _, stat in files)
+        for file, stat in files:
+            if self._size <= self.max_size:
+                break
+            self._remove(file, stat.st_size)
+
+    def clear(self) -> None:
+        """Deletes every cached response."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._size = 0
+
+    def _files(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return [file for file in self.directory.glob("*/*") if file.suffix != ".tmp"]
+
+    def _remove(self, path: Path, size: int) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        if self._size is not None:
+            self._size -= size
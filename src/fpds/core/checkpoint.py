@@ -0,0 +1,111 @@
+"""
+Checkpoints for resuming interrupted FPDS downloads.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Iterator, List, Optional, Set
+
+from fpds.config import FPDS_DATA_DIR
+from fpds.core import FPDS_ENTRY
+
+PAGE_OFFSET_PATTERN = re.compile(r"start=(\d+)$")
+FPDS_CHECKPOINT_DIR = FPDS_DATA_DIR / "checkpoints"
+
+
+def page_offset(link: str) -> int:
+    """The `start=` offset of a link from :meth:`fpdsTree.pagination_links`."""
+    match = PAGE_OFFSET_PATTERN.search(link)
+    if not match:
+        raise ValueError(f"`{link}` is not an FPDS pagination link")
+    return int(match.group(1))
+
+
+def page_key(link: str) -> str:
+    """Name of the checkpoint file of the page at `link`: its offset and a hash
+    of the whole link, as every shard of a sharded request has its own offsets.
+    """
+    digest = hashlib.sha256(link.encode("utf-8")).hexdigest()[:16]
+    return f"{page_offset(link)}-{digest}"
+
+
+class fpdsCheckpoint:
+    """Persists the records of completed pages so an interrupted request can
+    be resumed without downloading those pages again.
+
+    Each request gets its own directory, named after a hash of its search
+    parameters, holding one JSON file of records per completed page, named
+    after :func:`page_key` so that shards of a sharded request don't overwrite
+    each other's pages. Files are written atomically, so a page is either fully
+    checkpointed or not at all.
+
+    Example:
+    -------
+    >>> checkpoint = fpdsCheckpoint(params=request.search_params)
+    >>> links = checkpoint.pending(request.links)
+    >>> async for link, records in request.iter_pages(links=links):
+    >>>     checkpoint.save(link, records)
+    >>> records = list(checkpoint.records())
+
+    Attributes
+    ----------
+    params: `str`
+        Search parameters of the request, as in `fpdsRequest.search_params`.
+    directory: `Optional[Path]`
+        Defaults to `~/.fpds/checkpoints`.
+        Parent directory for checkpoints.
+    """
+
+    def __init__(self, params: str, directory: Optional[Path] = None) -> None:
+        self.params = params
+        self.directory = directory or FPDS_CHECKPOINT_DIR
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsCheckpoint {self.params}>"
+
+    @property
+    def path(self) -> Path:
+        """Directory holding this request's completed pages."""
+        digest = hashlib.sha256(self.params.encode("utf-8")).hexdigest()[:16]
+        return self.directory / digest
+
+    def completed(self) -> Set[str]:
+        """Keys of the pages that have been checkpointed; see :func:`page_key`."""
+        if not self.path.exists():
+            return set()
+        return {file.stem for file in self.path.glob("*.json")}
+
+    def pending(self, links: List[str]) -> List[str]:
+        """The subset of `links` that hasn't been checkpointed yet."""
+        completed = self.completed()
+        return [link for link in links if page_key(link) not in completed]
+
+    def save(self, link: str, records: List[FPDS_ENTRY]) -> None:
+        """Checkpoints the records of the page at `link`."""
+        if not self.path.exists():
+            self.path.mkdir(parents=True, exist_ok=True)
+            (self.path / "params.txt").write_text(self.params, encoding="utf-8")
+
+        file = self.path / f"{page_key(link)}.json"
+        temp_file = file.with_suffix(".tmp")
+        with open(temp_file, "w") as outfile:
+            json.dump(records, outfile)
+        os.replace(temp_file, file)
+
+    def records(self) -> Iterator[FPDS_ENTRY]:
+        """Yields every checkpointed record, in page offset order."""
+        keys = sorted(self.completed(), key=lambda key: (int(key.split("-")[0]), key))
+        for key in keys:
+            with open(self.path / f"{key}.json") as infile:
+                yield from json.load(infile)
+
+    def clear(self) -> None:
+        """Deletes this request's checkpoint."""
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,221 @@
+"""
+Compact, optionally typed, representation of FPDS records.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import re
+import sys
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from fpds.core import FPDS_ENTRY
+
+# e.g. `content__award__dollarValues__obligatedAmount`
+DOLLAR_KEY_PATTERN = re.compile(r"__(?:total)?[dD]ollarValues__[^_]+$")
+# e.g. `content__award__relevantContractDates__signedDate`, `modified`
+DATE_KEY_PATTERN = re.compile(r"(?:Date|^modified)$")
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+BOOLEANS: Dict[str, Any] = {"true": True, "false": False}
+
+CONVERTER = Callable[[str], Any]
+
+
+def to_decimal(value: str) -> Any:
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return value
+
+
+def to_datetime(value: str) -> Any:
+    # `fromisoformat` is several times faster than `strptime`, but also takes
+    # other ISO formats, which wouldn't render back to the same string
+    if len(value) != 19:
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def to_string(value: Any) -> str:
+    """Renders a (coerced) value the way FPDS returned it."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    return str(value)
+
+
+def key_converter(key: str) -> Optional[CONVERTER]:
+    """Converter to the native type of `key`'s values, if it has one."""
+    if DOLLAR_KEY_PATTERN.search(key):
+        return to_decimal
+    if DATE_KEY_PATTERN.search(key):
+        return to_datetime
+    return None
+
+
+class fpdsSchema:
+    """Ordered keys shared by every compact record that has them.
+
+    Attributes
+    ----------
+    keys: `Tuple[str, ...]`
+        Interned keys, in record order.
+    index: `Dict[str, int]`
+        Position of each key.
+    converters: `Tuple[Optional[Callable[[str], Any]], ...]`
+        Converter of each key's values when records are coerced.
+    """
+
+    __slots__ = ("keys", "index", "converters")
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self.keys = tuple(sys.intern(key) for key in keys)
+        self.index = {key: position for position, key in enumerate(self.keys)}
+        self.converters = tuple(key_converter(key) for key in self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<fpdsSchema {len(self.keys)} keys>"
+
+
+class fpdsRecord(Mapping[str, Any]):
+    """A record stored as a shared schema and a tuple of values.
+
+    Reads like a read-only mapping. Plain FPDS records repeat hundreds of
+    long keys each, whereas compact records only hold their values: keys are
+    kept once per schema (see :class:`fpdsKeyTable`), and values are interned
+    so that codes, flags and blanks repeated across records are stored once.
+
+    Attributes
+    ----------
+    schema: `fpdsSchema`
+        Keys of the record.
+    row: `Tuple[Any, ...]`
+        Values of the record, in the order of `schema.keys`.
+    """
+
+    __slots__ = ("schema", "row")
+
+    def __init__(self, schema: fpdsSchema, row: Tuple[Any, ...]) -> None:
+        self.schema = schema
+        self.row = row
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<fpdsRecord {len(self.row)} keys>"
+
+    def __getitem__(self, key: str) -> Any:
+        return self.row[self.schema.index[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.schema.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.keys)
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    def __eq__(self, other: object) -> bool:
+        # coerced values compare equal to the strings they were parsed from
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if isinstance(other, fpdsRecord):
+            other = other.to_dict()
+        return self.to_dict() == dict(other)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self.schema.index.get(key)
+        return default if position is None else self.row[position]
+
+    def to_dict(self) -> Dict[str, str]:
+        """The record as a plain dictionary of strings, exactly as it would
+        have been returned without compaction.
+        """
+        return dict(zip(self.schema.keys, map(to_string, self.row)))
+
+
+class fpdsKeyTable:
+    """Table of schemas shared by compact records.
+
+    Records with the same keys, in the same order, share a single
+    :class:`fpdsSchema`. Since every schema's keys are interned, key strings
+    are also shared between schemas.
+
+    Attributes
+    ----------
+    schemas: `Dict[Tuple[str, ...], fpdsSchema]`
+        Schemas seen so far, by keys.
+    """
+
+    def __init__(self) -> None:
+        self.schemas: Dict[Tuple[str, ...], fpdsSchema] = {}
+
+    def __len__(self) -> int:
+        return len(self.schemas)
+
+    def schema(self, keys: Tuple[str, ...]) -> fpdsSchema:
+        """The schema of `keys`, added to the table if new."""
+        schema = self.schemas.get(keys)
+        if schema is None:
+            schema = self.schemas[keys] = fpdsSchema(keys)
+        return schema
+
+    def compact(self, record: FPDS_ENTRY, coerce: bool = False) -> fpdsRecord:
+        """Converts `record` into a compact record.
+
+        Parameters
+        ----------
+        record: `FPDS_ENTRY`
+            A flattened FPDS record.
+        coerce: `bool`
+            Defaults to `False`.
+            If `True`, dollar amounts become `Decimal`, dates (`YYYY-MM-DD
+            HH:MM:SS`) become `datetime` and "true"/"false" become `bool`.
+            Values that don't parse are kept as strings.
+        """
+        schema = self.schema(tuple(record))
+        values: Tuple[Any, ...] = tuple(map(sys.intern, record.values()))
+        if coerce:
+            get = BOOLEANS.get
+            values = tuple(
+                get(value, value) if converter is None else converter(value)
+                for value, converter in zip(values, schema.converters)
+            )
+        return fpdsRecord(schema, values)
+
+    def clear(self) -> None:
+        self.schemas.clear()
+
+
+def compact_records(
+    records: Iterable[FPDS_ENTRY],
+    coerce: bool = False,
+    table: Optional[fpdsKeyTable] = None,
+) -> List[fpdsRecord]:
+    """Converts `records` into compact records sharing the schemas of `table`
+    (a new table by default, so that schemas live only as long as the records
+    using them). See :meth:`fpdsKeyTable.compact`.
+    """
+    if table is None:
+        table = fpdsKeyTable()
+    return [table.compact(record, coerce=coerce) for record in records]
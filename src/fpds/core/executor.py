@@ -0,0 +1,221 @@
+"""
+Reusable executors for parsing ATOM feed pages.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import asyncio
+import atexit
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import FrozenSet, List, Optional, Tuple, Type
+
+from fpds.core import FPDS_ENTRY
+from fpds.core.xml import fpdsRecordBatch, fpdsTree, parse_page
+
+EXECUTOR_KINDS = ("process", "thread", "inline")
+# queries this small are parsed inline; starting a pool costs more than it saves
+DEFAULT_INLINE_THRESHOLD = 2
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+_default_executor: Optional["fpdsExecutor"] = None
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on.
+
+    Uses the scheduler affinity mask where available, further capped by a
+    cgroup (v2) CPU quota, so containers aren't oversubscribed.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def jsonify_page(
+    content: bytes, fields: Optional[FrozenSet[str]] = None
+) -> List[FPDS_ENTRY]:
+    """Parses and flattens the raw bytes of a page into records, keeping only
+    `fields` if given.
+    """
+    return fpdsTree(content=content).jsonify(fields=fields)
+
+
+def timed_jsonify_page(
+    content: bytes, fields: Optional[FrozenSet[str]] = None
+) -> Tuple[List[FPDS_ENTRY], float, float]:
+    """:func:`jsonify_page`, also returning the seconds spent parsing the page
+    and flattening its entries.
+    """
+    started = time.perf_counter()
+    tree = fpdsTree(content=content)
+    tree.tree
+    parsed = time.perf_counter()
+    records = tree.jsonify(fields=fields)
+    return records, parsed - started, time.perf_counter() - parsed
+
+
+def timed_parse_page(
+    content: bytes, fields: Optional[FrozenSet[str]] = None
+) -> Tuple[fpdsRecordBatch, float, float]:
+    """:func:`timed_jsonify_page` for worker processes; see `parse_page`."""
+    records, parse_seconds, flatten_seconds = timed_jsonify_page(content, fields)
+    return fpdsRecordBatch.from_records(records), parse_seconds, flatten_seconds
+
+
+class fpdsExecutor:
+    """Parses pages in a process pool, a thread pool or inline.
+
+    The pool is started on first use and reused until :meth:`shutdown`, so one
+    executor can serve any number of `fpdsRequest` instances. Requests that
+    aren't given one share the module-level :func:`default_executor`.
+
+    Example:
+    -------
+    >>> with fpdsExecutor(kind="thread", max_workers=4) as executor:
+    ...     for params in queries:
+    ...         request = fpdsRequest(executor=executor, **params)
+    ...         records = await request.data()
+
+    Attributes
+    ----------
+    kind: `str`
+        Defaults to "process".
+        One of "process", "thread" or "inline". Inline parses pages in the
+        event loop's thread, without any pool.
+    max_workers: `Optional[int]`
+        Defaults to :func:`available_cpus`.
+        Size of the pool.
+    inline_threshold: `int`
+        Defaults to 2.
+        Queries with at most this many pages are parsed inline, without
+        starting the pool.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        max_workers: Optional[int] = None,
+        inline_threshold: int = DEFAULT_INLINE_THRESHOLD,
+    ) -> None:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"`kind` must be one of {EXECUTOR_KINDS}, not {kind!r}")
+        self.kind = kind
+        self.max_workers = max_workers or available_cpus()
+        self.inline_threshold = inline_threshold
+        self._pool: Optional[Executor] = None
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsExecutor {self.kind} max_workers={self.max_workers}>"
+
+    def __enter__(self) -> "fpdsExecutor":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+
+    @property
+    def pool(self) -> Optional[Executor]:
+        """The underlying pool, started on first access; `None` when inline."""
+        if self._pool is None and self.kind != "inline":
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    @property
+    def started(self) -> bool:
+        """`True` once the pool is running."""
+        return self._pool is not None
+
+    def is_inline(self, page_count: int) -> bool:
+        """Whether a query of `page_count` pages is parsed inline."""
+        return self.kind == "inline" or page_count <= self.inline_threshold
+
+    async def parse(
+        self,
+        content: bytes,
+        inline: bool = False,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> List[FPDS_ENTRY]:
+        """Parses and flattens the raw bytes of a page.
+
+        Parameters
+        ----------
+        content: `bytes`
+            Raw page response.
+        inline: `bool`
+            Defaults to False.
+            Parses the page right away, without the pool. See :meth:`is_inline`.
+        fields: `Optional[FrozenSet[str]]`
+            Defaults to `None`.
+            Flattened keys to keep in each record. `None` keeps every key.
+        """
+        pool = None if inline else self.pool
+        if pool is None:
+            return jsonify_page(content, fields)
+
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            return await loop.run_in_executor(pool, jsonify_page, content, fields)
+        # worker processes get raw bytes and return a compact batch, so neither
+        # parsed trees nor record dicts get pickled
+        batch = await loop.run_in_executor(pool, parse_page, content, fields)
+        return batch.records()
+
+    async def parse_timed(
+        self,
+        content: bytes,
+        inline: bool = False,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> Tuple[List[FPDS_ENTRY], float, float]:
+        """:meth:`parse`, also returning the seconds spent parsing the page and
+        flattening its entries, as measured where the work ran.
+        """
+        pool = None if inline else self.pool
+        if pool is None:
+            return timed_jsonify_page(content, fields)
+
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            return await loop.run_in_executor(pool, timed_jsonify_page, content, fields)
+        batch, parse_seconds, flatten_seconds = await loop.run_in_executor(
+            pool, timed_parse_page, content, fields
+        )
+        return batch.records(), parse_seconds, flatten_seconds
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the pool. It is started again if the executor is reused."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+def default_executor() -> fpdsExecutor:
+    """The process-wide executor used by requests that aren't given one.
+
+    Created on first use and shut down when the interpreter exits.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = fpdsExecutor()
+        atexit.register(_default_executor.shutdown)
+    return _default_executor
@@ -2,12 +2,18 @@
 Mixin classes.
 
 author: derek663@gmail.com
-last_updated: 2024-07-14
+last_updated: 2026-10-18
 """
 
+import os
+
+from fpds.config import FPDS_URL_BASE, FPDS_URL_BASE_VARIABLE
+
 
 class fpdsMixin:
     @property
     def url_base(self) -> str:
-        """Base URL for all ATOM feed requests."""
-        return "https://www.fpds.gov/ezsearch/FEEDS/ATOM?FEEDNAME=PUBLIC"
+        """Base URL for all ATOM feed requests. Defaults to the FPDS ATOM feed;
+        set the `FPDS_URL_BASE` environment variable to use another one.
+        """
+        return os.environ.get(FPDS_URL_BASE_VARIABLE) or FPDS_URL_BASE
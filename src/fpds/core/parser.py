@@ -3,26 +3,133 @@ Core class for converting FPDS XML
 tree into JSON.
 
 author: derek663@gmail.com
-last_updated: 2025-07-14
+last_updated: 2026-10-18
 """
 
 import asyncio
-import multiprocessing
+import time
 import warnings
 from asyncio import Semaphore
-from concurrent.futures import ProcessPoolExecutor
-from typing import AsyncGenerator, List, Optional
+from contextlib import aclosing, asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib import parse
 from urllib.request import urlopen
 
-from aiohttp import ClientSession
+from aiohttp import (
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
 from tqdm import tqdm
 
 from fpds.core import FPDS_ENTRY
+from fpds.core.cache import fpdsCache
+from fpds.core.compact import fpdsKeyTable
+from fpds.core.executor import default_executor, fpdsExecutor
 from fpds.core.mixins import fpdsMixin
-from fpds.core.xml import fpdsSubTree, fpdsTree
+from fpds.core.stats import fpdsStats
+from fpds.core.store import fpdsStore
+from fpds.core.xml import fpdsSubTree
 from fpds.errors import fpdsMaxPageLengthExceededError, fpdsMissingKeywordParameterError
-from fpds.utilities import validate_kwarg
+from fpds.utilities import (
+    RateLimiter,
+    backoff_delay,
+    build_search_params,
+    project,
+    record_ids,
+    record_key,
+    split_date_range,
+    validate_kwarg,
+)
+
+# seconds that resolved FPDS hostnames and idle keep-alive connections are kept
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+# status codes worth retrying besides 5xx
+RETRY_STATUS_CODES = {408, 429}
+# date range parameters a request can be sharded on, in order of preference
+SHARDABLE_PARAMS = ("LAST_MOD_DATE", "SIGNED_DATE")
+
+
+def create_session(limit: int) -> ClientSession:
+    """Returns a `ClientSession` tuned for paginating the ATOM feed.
+
+    Connections are pooled and kept alive between pages, capped at `limit`
+    (which is also the per-host cap, since every page is served by the same
+    host), and DNS lookups are cached.
+    """
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return ClientSession(connector=connector)
+
+
+@asynccontextmanager
+async def session_scope(
+    session: Optional[ClientSession], create: Callable[[], ClientSession]
+) -> AsyncIterator[ClientSession]:
+    """Yields `session`, or a new session from `create` that is closed
+    afterwards.
+    """
+    if session is not None:
+        yield session
+        return
+    async with create() as _session:
+        yield _session
+
+
+class fpdsFetchResult(List[fpdsSubTree]):
+    """Pages retrieved by :meth:`fpdsRequest.fetch`.
+
+    Behaves like the list of downloaded `fpdsSubTree` pages it always was,
+    and additionally reports the pages that could not be retrieved so that
+    only those need to be requested again.
+
+    Example:
+    -------
+    >>> result = await request.fetch()
+    >>> if result.failed_links:
+    >>>     result.extend(await request.fetch(links=result.failed_links))
+
+    Attributes
+    ----------
+    failures: `Dict[str, Exception]`
+        The final error for each page link that failed.
+    """
+
+    def __init__(self, pages: Iterable[fpdsSubTree] = ()) -> None:
+        super().__init__(pages)
+        self.failures: Dict[str, Exception] = {}
+
+    @property
+    def failed_links(self) -> List[str]:
+        """Links of the pages that could not be retrieved."""
+        return list(self.failures)
+
+    @property
+    def ok(self) -> bool:
+        """`True` if every page was retrieved."""
+        return not self.failures
 
 
 class fpdsRequest(fpdsMixin):
@@ -54,7 +161,51 @@ class fpdsRequest(fpdsMixin):
         If `True`, opts out of regex validation.
     thread_count: `int`
         Defaults to 10.
-        The number of threads to send per search.
+        The maximum number of concurrent page requests (and open connections)
+        per search.
+    requests_per_second: `Optional[float]`
+        Defaults to `None`.
+        Caps how many page requests may start per second. `None` disables
+        the cap.
+    retries: `int`
+        Defaults to 3.
+        How many times a page is retried after a connection error, timeout,
+        408/429 or 5xx response.
+    backoff: `float`
+        Defaults to 0.5.
+        Base delay, in seconds, of the jittered exponential backoff between
+        retries.
+    page_timeout: `Optional[float]`
+        Defaults to 60.
+        Seconds allowed for a single page request attempt.
+    total_timeout: `Optional[float]`
+        Defaults to `None`.
+        Seconds allowed for retrieving every page of the request. Pages not
+        retrieved by then are reported as failed.
+    cache: `Optional[fpdsCache]`
+        Defaults to `None`.
+        On-disk response cache. Pages found in it (and still fresh) are not
+        downloaded again.
+    executor: `Optional[fpdsExecutor]`
+        Defaults to the shared module-level executor (see `default_executor`).
+        Executor pages are parsed with. Pass one to choose between process,
+        thread and inline parsing or to size the pool.
+    shards: `Optional[int]`
+        Defaults to `None`.
+        Splits the request's date range into this many contiguous sub-ranges
+        that are paginated separately and retrieved concurrently. Deep `start`
+        offsets are slow on FPDS, so long ranges come back faster.
+    shard_by: `Optional[str]`
+        Defaults to the first of `LAST_MOD_DATE` or `SIGNED_DATE` provided.
+        Date range parameter to shard on.
+    store: `Optional[fpdsStore]`
+        Defaults to `None`.
+        Local store every retrieved page's records are upserted into. They are
+        stored whole, even when `fields` are requested.
+    stats: `Optional[fpdsStats]`
+        Defaults to `None`.
+        Collects the download latency, size, retries, parse and flatten time
+        and record count of every page. Nothing is measured without it.
     page: `Optional[int]`
         Defaults to `None`.
         The page of results to retrieve.
@@ -63,8 +214,8 @@ class fpdsRequest(fpdsMixin):
 
     Raises
     ------
-    fpdsDuplicateParameterConfiguration:
-        Raised if duplicate configurations for a single parameter exist.
+    fpdsInvalidParameterConfiguration:
+        Raised if `fields.json` has duplicate or invalid parameter entries.
 
     fpdsInvalidParameter:
         Raised if an invalid parameter is provided.
@@ -85,30 +236,45 @@ class fpdsRequest(fpdsMixin):
         skip_regex_validation: bool = False,
         thread_count: int = 10,
         page: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        page_timeout: Optional[float] = 60,
+        total_timeout: Optional[float] = None,
+        cache: Optional[fpdsCache] = None,
+        executor: Optional[fpdsExecutor] = None,
+        shards: Optional[int] = None,
+        shard_by: Optional[str] = None,
+        store: Optional[fpdsStore] = None,
+        stats: Optional[fpdsStats] = None,
         **kwargs: str,
     ) -> None:
         self.cli_run = cli_run
         self.skip_regex_validation = skip_regex_validation
         self.thread_count = thread_count
         self.page = page
-        self.links = []  # type: List[str]
+        self.requests_per_second = requests_per_second
+        self.retries = retries
+        self.backoff = backoff
+        self.page_timeout = page_timeout
+        self.total_timeout = total_timeout
+        self.cache = cache
+        self.executor = executor
+        self.shards = shards
+        self.shard_by = shard_by
+        self.store = store
+        self.stats = stats
+        self.failures = {}  # type: Dict[str, Exception]
+        self._links: Optional[List[str]] = None
+        self._first_pages: Dict[str, fpdsSubTree] = {}
+        self._semaphore: Optional[Semaphore] = None
+        self._rate_limiter: Optional[RateLimiter] = None
 
         if kwargs:
             self.kwargs = kwargs
         else:
             raise fpdsMissingKeywordParameterError
 
-        tree = fpdsTree(content=self.initial_request())
-        links = tree.pagination_links(params=self.search_params)
-        self.links = links
-
-        if self.page:
-            idx = self.page_index()
-            if idx is not None and self.links:
-                if self.page > self.page_count:
-                    raise fpdsMaxPageLengthExceededError(page_count=self.page_count)
-                self.links = [links[idx]]
-
         # do not run class validations since CLI command has its own
         if not self.cli_run:
             if not self.skip_regex_validation:
@@ -117,6 +283,44 @@ class fpdsRequest(fpdsMixin):
             else:
                 warnings.warn("Opting out of regex validation!")
 
+        if self.sharded:
+            if self.page:
+                raise ValueError("`page` can't be combined with `shards`")
+            if self.shard_by is None:
+                self.shard_by = next(
+                    (name for name in SHARDABLE_PARAMS if name in self.kwargs), None
+                )
+            if self.shard_by not in self.kwargs:
+                raise ValueError(
+                    f"`shards` requires one of the {SHARDABLE_PARAMS} parameters"
+                )
+            # fail now rather than when the links are built, e.g. for
+            # open-ended ranges like `[2022/01/01,)`
+            split_date_range(self.kwargs[self.shard_by], self.shards or 1)
+
+    @classmethod
+    async def create(
+        cls, session: Optional[ClientSession] = None, **kwargs: Any
+    ) -> "fpdsRequest":
+        """Builds a request and retrieves its first page without blocking the
+        event loop.
+
+        Example:
+        -------
+        >>> request = await fpdsRequest.create(AGENCY_CODE="7504")
+
+        Parameters
+        ----------
+        session: `Optional[ClientSession]`
+            Defaults to a session from :meth:`create_session`.
+            Session used to retrieve the first page.
+        **kwargs: `Any`
+            Arguments for `fpdsRequest`.
+        """
+        request = cls(**kwargs)
+        await request.prepare(session=session)
+        return request
+
     def __str__(self) -> str:  # pragma: no cover
         """String representation of `fpdsRequest`."""
         kwargs_str = " ".join([f"{key}={value}" for key, value in self.kwargs.items()])
@@ -129,39 +333,333 @@ class fpdsRequest(fpdsMixin):
     @property
     def search_params(self) -> str:
         """Search parameters inputted by user."""
-        _params = [f"{key}:{value}" for key, value in self.kwargs.items()]
-        return " ".join(_params)
+        return build_search_params(tuple(self.kwargs.items()))
+
+    @property
+    def initial_url(self) -> str:
+        """URL of the first page of results."""
+        encoded_params = parse.urlencode({"q": self.search_params})
+        return f"{self.url_base}&{encoded_params}"
+
+    @property
+    def links(self) -> List[str]:
+        """Pagination links of the request.
+
+        They require the first page of results. Outside of an event loop that
+        page is retrieved (blocking) on first access; async code must call
+        :meth:`prepare` or build the request with :meth:`create` instead.
+
+        Raises
+        ------
+        RuntimeError:
+            Raised if the links aren't known yet and an event loop is running.
+        """
+        if self._links is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                raise RuntimeError(
+                    "Retrieving the first page would block the event loop; "
+                    "call `await request.prepare()` or build the request with "
+                    "`await fpdsRequest.create(...)` first"
+                )
+            if self.sharded:
+                requests = self.shard_requests()
+                for request in requests:
+                    request.paginate(request.initial_request())
+                self._merge_shards(requests)
+            else:
+                self.paginate(self.initial_request())
+        assert self._links is not None
+        return self._links
+
+    @links.setter
+    def links(self, links: List[str]) -> None:
+        self._links = links
+
+    @property
+    def sharded(self) -> bool:
+        """`True` if the request is split into date range shards."""
+        return self.shards is not None and self.shards > 1
+
+    def shard_requests(self) -> List["fpdsRequest"]:
+        """Splits the request into sub-requests over contiguous, non-overlapping
+        parts of its `shard_by` date range. Each has its own pagination.
+        """
+        assert self.shard_by is not None
+        date_ranges = split_date_range(self.kwargs[self.shard_by], self.shards or 1)
+        requests = []
+        for date_range in date_ranges:
+            kwargs = {**self.kwargs, self.shard_by: date_range}
+            # params were validated by this request already
+            request = fpdsRequest(
+                cli_run=True,
+                cache=self.cache,
+                stats=self.stats,
+                **kwargs,  # type: ignore[arg-type]
+            )
+            requests.append(request)
+        return requests
+
+    def _merge_shards(self, requests: List["fpdsRequest"]) -> None:
+        self._links = [link for request in requests for link in request.links]
+        for request in requests:
+            self._first_pages.update(request._first_pages)
+
+    @property
+    def prepared(self) -> bool:
+        """`True` once the pagination links are known."""
+        return self._links is not None
 
     @property
     def page_count(self) -> int:
         """Total number of FPDS pages contained in request."""
         return len(self.links)
 
+    @property
+    def failed_links(self) -> List[str]:
+        """Links of the pages that failed during the last `fetch` or
+        `iter_data` run. Pass them back as `links` to retry just those pages.
+        """
+        return list(self.failures)
+
     def initial_request(self) -> bytes:
         """Returns the root XML tree from the initial request."""
-        encoded_params = parse.urlencode({"q": self.search_params})
-        with urlopen(f"{self.url_base}&{encoded_params}") as response:
+        url = self.initial_url
+        started = time.perf_counter()
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                if self.stats is not None:
+                    elapsed = time.perf_counter() - started
+                    self.stats.downloaded(url, elapsed, len(cached), cached=True)
+                return cached
+
+        with urlopen(url) as response:
             content_tree = response.read()
+
+        if self.stats is not None:
+            elapsed = time.perf_counter() - started
+            self.stats.downloaded(url, elapsed, len(content_tree))
+        if self.cache is not None:
+            self.cache.set(url, content_tree)
         return content_tree
 
-    async def convert(self, session: ClientSession, link: str) -> fpdsSubTree:
-        """Retrieves content from FPDS ATOM feed as a SubTree instance."""
-        async with session.get(link) as response:
-            content = await response.read()
-            subtree = fpdsSubTree(content=content)
-            return subtree
+    def paginate(self, content: bytes) -> None:
+        """Builds the pagination links from the first page of results.
+
+        The first page is kept so that it is not downloaded a second time as
+        the `start=0` page.
+        """
+        tree = fpdsSubTree(content=content)
+        links = tree.pagination_links(params=self.search_params)
+        if links:
+            self._first_pages[links[0]] = tree
+            if self.stats is not None:
+                self.stats.rename(self.initial_url, links[0])
+
+        if self.page:
+            idx = self.page_index()
+            if idx is not None and links:
+                if self.page > len(links):
+                    raise fpdsMaxPageLengthExceededError(page_count=len(links))
+                links = [links[idx]]
+        self._links = links
+
+    async def prepare(self, session: Optional[ClientSession] = None) -> None:
+        """Retrieves the first page of results and builds the pagination links
+        without blocking the event loop. Does nothing if the links are known.
+
+        Parameters
+        ----------
+        session: `Optional[ClientSession]`
+            Defaults to a session from :meth:`create_session`.
+            Session used to retrieve the first page.
+        """
+        if self.prepared:
+            return
+        async with self.session_scope(session) as _session:
+            if self.sharded:
+                requests = self.shard_requests()
+                subtrees = await asyncio.gather(
+                    *(
+                        self.convert(_session, request.initial_url)
+                        for request in requests
+                    )
+                )
+                for request, subtree in zip(requests, subtrees):
+                    request.paginate(subtree.content)
+                self._merge_shards(requests)
+                return
+            subtree = await self.convert(_session, self.initial_url)
+        self.paginate(subtree.content)
+
+    def session_scope(
+        self, session: Optional[ClientSession] = None
+    ) -> AsyncContextManager[ClientSession]:
+        """Yields `session`, or a new session from :meth:`create_session` that
+        is closed afterwards.
+        """
+        return session_scope(session, self.create_session)
+
+    @property
+    def semaphore(self) -> Semaphore:
+        """Limits page requests in flight to `thread_count`."""
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.thread_count)
+        return self._semaphore
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Spaces page requests out to `requests_per_second`."""
+        if self._rate_limiter is None:
+            self._rate_limiter = RateLimiter(self.requests_per_second)
+        return self._rate_limiter
+
+    def share_limits(self, semaphore: Semaphore, rate_limiter: RateLimiter) -> None:
+        """Makes page requests count against limits shared with other requests,
+        e.g. those of an `fpdsBatchRequest`. They hold until a new session is
+        created with :meth:`create_session`.
+        """
+        self._semaphore = semaphore
+        self._rate_limiter = rate_limiter
+
+    def create_session(self) -> ClientSession:
+        """Returns a session from :func:`create_session` with room for
+        `thread_count` connections.
+        """
+        # semaphores bind to the event loop they are first used in, so each
+        # session gets fresh request limits
+        self._semaphore = None
+        self._rate_limiter = None
+        return create_session(self.thread_count)
+
+    @staticmethod
+    def is_retriable(error: Exception) -> bool:
+        """Whether a failed page request is worth retrying."""
+        if isinstance(error, ClientResponseError):
+            return error.status >= 500 or error.status in RETRY_STATUS_CODES
+        return isinstance(error, (ClientError, asyncio.TimeoutError))
 
-    async def fetch(self) -> List[fpdsSubTree]:
-        """Asynchronously parses all ATOM feed pages for current request."""
-        semaphore = Semaphore(self.thread_count)
+    async def convert(self, session: ClientSession, link: str) -> fpdsSubTree:
+        """Retrieves content from FPDS ATOM feed as a SubTree instance.
 
-        if not self.links:
-            return []
+        Transient failures are retried up to `retries` times with jittered
+        exponential backoff; the last error is raised once retries run out.
+        If a `cache` is set, fresh cached pages are returned without a request.
+        """
+        stats = self.stats
+        if self.cache is not None:
+            cached = self.cache.get(link)
+            if cached is not None:
+                if stats is not None:
+                    stats.downloaded(link, 0.0, len(cached), cached=True)
+                return fpdsSubTree(content=cached)
+
+        timeout = ClientTimeout(total=self.page_timeout)
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    await self.rate_limiter.wait()
+                    started = time.perf_counter()
+                    async with session.get(link, timeout=timeout) as response:
+                        response.raise_for_status()
+                        content = await response.read()
+                if stats is not None:
+                    elapsed = time.perf_counter() - started
+                    stats.downloaded(link, elapsed, len(content), retries=attempt)
+                break
+            except Exception as exc:
+                if stats is not None:
+                    # kept for pages that fail for good, too
+                    stats.page(link).retries = attempt
+                if attempt >= self.retries or not self.is_retriable(exc):
+                    raise
+                # back off outside of the semaphore so other pages can proceed
+                await asyncio.sleep(backoff_delay(attempt, base=self.backoff))
+                attempt += 1
+
+        if self.cache is not None:
+            self.cache.set(link, content)
+        subtree = fpdsSubTree(content=content)
+        return subtree
+
+    def deadline(self) -> Optional[float]:
+        """Event loop time by which all pages must be retrieved."""
+        if self.total_timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + self.total_timeout
+
+    async def _convert_before(
+        self, session: ClientSession, link: str, deadline: Optional[float]
+    ) -> fpdsSubTree:
+        """:meth:`convert`, cancelled if it runs past `deadline`."""
+        async with asyncio.timeout_at(deadline):
+            return await self.convert(session, link)
+
+    async def retrieve(
+        self, session: ClientSession, link: str, deadline: Optional[float] = None
+    ) -> fpdsSubTree:
+        """Returns the page at `link`. First pages, already retrieved to build
+        the pagination links, are returned without another request.
+        """
+        first_page = self._first_pages.get(link)
+        if first_page is not None:
+            return first_page
+        return await self._convert_before(session, link, deadline)
 
-        async with semaphore:
-            async with ClientSession() as session:
-                tasks = [self.convert(session, link) for link in self.links]
-                return await asyncio.gather(*tasks)
+    async def fetch(
+        self,
+        links: Optional[List[str]] = None,
+        session: Optional[ClientSession] = None,
+    ) -> fpdsFetchResult:
+        """Asynchronously parses all ATOM feed pages for current request.
+
+        A page that still fails after its retries does not abort the others;
+        it is reported in the result's `failures` instead.
+
+        Parameters
+        ----------
+        links: `Optional[List[str]]`
+            Defaults to all of the request's pagination links.
+            Page links to retrieve, e.g. the `failed_links` of a previous run.
+        session: `Optional[ClientSession]`
+            Defaults to a session from :meth:`create_session`.
+            Session used for every page request.
+        """
+        result = fpdsFetchResult()
+        self.failures = result.failures
+
+        async with self.session_scope(session) as _session:
+            await self.prepare(_session)
+            links = self.links if links is None else links
+            deadline = self.deadline()
+            tasks = [self.retrieve(_session, link, deadline) for link in links]
+            pages = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for link, page in zip(links, pages):
+            if isinstance(page, fpdsSubTree):
+                result.append(page)
+                if self.stats is not None:
+                    self.stats.complete(self.stats.page(link))
+            elif isinstance(page, Exception):
+                result.failures[link] = page
+                if self.stats is not None:
+                    self.stats.failed(link, page)
+            else:  # pragma: no cover
+                raise page
+        self._warn_failures()
+        return result
+
+    def _warn_failures(self) -> None:
+        if self.failures:
+            warnings.warn(
+                f"{len(self.failures)} page(s) could not be retrieved; "
+                "retry them with `links=request.failed_links`"
+            )
 
     def page_index(self) -> Optional[int]:
         """Converts `page` to index integer."""
@@ -170,46 +668,283 @@ class fpdsRequest(fpdsMixin):
             idx = 0 if self.page == 1 else self.page - 1
         return idx
 
-    @staticmethod
-    def _jsonify(entry: fpdsSubTree) -> List[FPDS_ENTRY]:
-        """Wrapper around `jsonify` method for avoiding pickle issue."""
-        return entry.jsonify()
+    async def iter_pages(
+        self,
+        ordered: bool = False,
+        max_pending: Optional[int] = None,
+        links: Optional[List[str]] = None,
+        session: Optional[ClientSession] = None,
+        progress: bool = True,
+        inline: Optional[bool] = None,
+        fields: Optional[Iterable[str]] = None,
+        compact: bool = False,
+        coerce: bool = False,
+    ) -> AsyncGenerator[Tuple[str, List[FPDS_ENTRY]], None]:
+        """Lazily yields the records of each page along with its link.
+
+        Downloading and parsing are pipelined: each page is handed to the
+        executor as soon as it arrives, and its records are yielded as
+        soon as they are parsed. At most `max_pending` pages are held at once
+        (downloading, parsing or waiting to be yielded); once that limit is
+        reached, new downloads wait for the consumer to catch up.
+
+        A page that fails after its retries doesn't stop the others. Its link
+        is recorded in :attr:`failed_links` and a warning is issued at the end.
+        With a `store`, each page's records are upserted into it once parsed.
+
+        The first page, already retrieved by :meth:`prepare` to build the
+        pagination links, is parsed from memory rather than downloaded again
+        (see :meth:`retrieve`).
+
+        Parameters
+        ----------
+        ordered: `bool`
+            Defaults to `False`.
+            If `True`, pages are yielded in page order. Otherwise, pages are
+            yielded in the order they finish parsing.
+        max_pending: `Optional[int]`
+            Defaults to twice `thread_count`.
+            Maximum number of pages held in memory at once.
+        links: `Optional[List[str]]`
+            Defaults to all of the request's pagination links.
+            Page links to retrieve, e.g. the `failed_links` of a previous run.
+        session: `Optional[ClientSession]`
+            Defaults to a session from :meth:`create_session`.
+            Session used for every page request.
+        progress: `bool`
+            Defaults to `True`.
+            Shows a progress bar of the pages retrieved.
+        inline: `Optional[bool]`
+            Defaults to whether the executor parses a search of this many
+            pages inline (see `fpdsExecutor.is_inline`).
+            If `True`, pages are parsed inline rather than in the executor.
+        fields: `Optional[Iterable[str]]`
+            Defaults to `None`.
+            Flattened keys to keep in each record, e.g.
+            `content__award__awardID__awardContractID__PIID`. Parts of an
+            entry that can't contribute to them aren't flattened at all,
+            unless a `store` is set. `None` keeps every key.
+        compact: `bool`
+            Defaults to `False`.
+            If `True`, records are `fpdsRecord`s: read-only mappings whose
+            keys are shared with every record of the same shape returned by
+            this call, taking a fraction of the memory of dictionaries.
+            `to_dict` converts them back.
+        coerce: `bool`
+            Defaults to `False`.
+            If `True`, records are compact and dollar amounts, dates and
+            booleans are converted to `Decimal`, `datetime` and `bool`; see
+            `fpdsKeyTable.compact`.
 
-    async def iter_data(self) -> AsyncGenerator[FPDS_ENTRY, None]:
+        Yields
+        ------
+        `Tuple[str, List[FPDS_ENTRY]]`
+            A page link and its records, as soon as they are available.
+        """
+        self.failures = {}
+        async with self.session_scope(session) as _session:
+            await self.prepare(_session)
+            links = self.links if links is None else links
+            if not links:
+                return
+
+            page_count = len(links)
+            max_pending = max_pending or 2 * self.thread_count
+            executor = self.executor or default_executor()
+            if inline is None:
+                inline = executor.is_inline(page_count)
+            deadline = self.deadline()
+            projection = None if fields is None else frozenset(fields)
+            # the store needs whole records, so they are projected once stored
+            parse_fields = projection if self.store is None else None
+            stats = self.stats
+            # schemas are shared by the records of this call only, so they are
+            # freed along with them
+            key_table = fpdsKeyTable() if compact or coerce else None
+
+            pages = iter(enumerate(links))
+            pending = Semaphore(max_pending)
+            queue: asyncio.Queue[Tuple[int, Union[List[FPDS_ENTRY], Exception]]] = (
+                asyncio.Queue(maxsize=max_pending)
+            )
+
+            async def produce() -> None:
+                while True:
+                    # a slot is taken before a link so that the pages being held
+                    # are always the lowest outstanding ones; `ordered` relies on it
+                    await pending.acquire()
+                    try:
+                        index, link = next(pages)
+                    except StopIteration:
+                        pending.release()
+                        return
+                    result: Union[List[FPDS_ENTRY], Exception]
+                    try:
+                        subtree = await self.retrieve(_session, link, deadline)
+                        if stats is None:
+                            result = await executor.parse(
+                                subtree.content, inline=inline, fields=parse_fields
+                            )
+                        else:
+                            (
+                                result,
+                                parse_seconds,
+                                flatten_seconds,
+                            ) = await executor.parse_timed(
+                                subtree.content, inline=inline, fields=parse_fields
+                            )
+                            stats.parsed(
+                                link, parse_seconds, flatten_seconds, len(result)
+                            )
+                        if self.store is not None:
+                            self.store.write(result)
+                            if projection is not None:
+                                result = [
+                                    project(record, projection) for record in result
+                                ]
+                        if key_table is not None:
+                            result = [
+                                key_table.compact(record, coerce=coerce)
+                                for record in result
+                            ]
+                    except Exception as exc:
+                        if stats is not None:
+                            stats.failed(link, exc)
+                        result = exc
+                    await queue.put((index, result))
+
+            workers = [
+                asyncio.create_task(produce())
+                for _ in range(min(self.thread_count, page_count))
+            ]
+            buffered: Dict[int, Optional[List[FPDS_ENTRY]]] = {}
+            next_index = 0
+            try:
+                with tqdm(total=page_count, disable=not progress) as progress_bar:
+                    for _ in range(page_count):
+                        index, result = await queue.get()
+                        progress_bar.update()
+                        page: Optional[List[FPDS_ENTRY]] = None
+                        if isinstance(result, Exception):
+                            self.failures[links[index]] = result
+                        else:
+                            page = result
+
+                        if not ordered:
+                            if page is not None:
+                                yield links[index], page
+                            pending.release()
+                            continue
+
+                        buffered[index] = page
+                        while next_index in buffered:
+                            page = buffered.pop(next_index)
+                            if page is not None:
+                                yield links[next_index], page
+                            next_index += 1
+                            pending.release()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+        self._warn_failures()
+
+    async def iter_data(
+        self,
+        ordered: bool = False,
+        max_pending: Optional[int] = None,
+        links: Optional[List[str]] = None,
+        session: Optional[ClientSession] = None,
+        fields: Optional[Iterable[str]] = None,
+        compact: bool = False,
+        coerce: bool = False,
+    ) -> AsyncGenerator[FPDS_ENTRY, None]:
         """Lazily yields FPDS records as an asynchronous generator.
 
+        See :meth:`iter_pages` for how pages are retrieved and for a
+        description of the parameters. When the request is sharded, a record
+        returned by more than one shard (e.g. when it is modified while the
+        shards are downloading) is only yielded once; see `record_key`.
+        Projected records can only be told apart by their identifier fields,
+        so those left without any are never dropped as duplicates.
+
         Yields
         ------
         `FPDS_ENTRY`
             A single FPDS record as it becomes available.
         """
-        num_processes = multiprocessing.cpu_count()
-        data = await self.fetch()  # List[fpdsSubTree]
-
-        with ProcessPoolExecutor(max_workers=num_processes) as pool:
-            with tqdm(total=len(data)) as progress:
-                futures = []
-
-                # allows tqdm progress bar to display correctly
-                for record in data:
-                    future = pool.submit(self._jsonify, record)
-                    future.add_done_callback(lambda p: progress.update())
-                    futures.append(future)
-
-                for future in futures:
-                    result = future.result()
-                    for entry in result:
-                        yield entry
-
-    async def data(self) -> List[FPDS_ENTRY]:
+        pages = self.iter_pages(
+            ordered=ordered,
+            max_pending=max_pending,
+            links=links,
+            session=session,
+            fields=fields,
+            compact=compact,
+            coerce=coerce,
+        )
+        seen: Set[Hashable] = set()
+        projected = fields is not None
+        async with aclosing(pages):
+            async for _, records in pages:
+                for entry in self.unique(records, seen, projected=projected):
+                    yield entry
+
+    def unique(
+        self,
+        records: Iterable[FPDS_ENTRY],
+        seen: Set[Hashable],
+        projected: bool = False,
+    ) -> Iterator[FPDS_ENTRY]:
+        """Yields `records` unless already in `seen`, which is updated along
+        the way. Only sharded requests can return a record twice, so other
+        requests yield every record. `projected` records without identifier
+        fields are always yielded, since distinct records may look the same.
+        """
+        if not self.sharded:
+            yield from records
+            return
+        for entry in records:
+            if projected and not record_ids(entry):
+                yield entry
+                continue
+            key = record_key(entry)
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+    async def data(
+        self,
+        session: Optional[ClientSession] = None,
+        fields: Optional[Iterable[str]] = None,
+        compact: bool = False,
+        coerce: bool = False,
+    ) -> List[FPDS_ENTRY]:
         """Collects all FPDS records into a list.
 
+        Parameters
+        ----------
+        session: `Optional[ClientSession]`
+            Defaults to a session from :meth:`create_session`.
+            Session used for every page request.
+        fields: `Optional[Iterable[str]]`
+            Defaults to `None`.
+            Flattened keys to keep in each record. See :meth:`iter_pages`.
+        compact: `bool`
+            Defaults to `False`.
+            Returns compact records. See :meth:`iter_pages`.
+        coerce: `bool`
+            Defaults to `False`.
+            Returns compact records with native values. See :meth:`iter_pages`.
+
         Returns
         -------
         records: `List[FPDS_ENTRY]`
             FPDS records as a list of dictionaries with de-nested XML attributes.
         """
         records = []
-        async for entry in self.iter_data():
+        entries = self.iter_data(
+            session=session, fields=fields, compact=compact, coerce=coerce
+        )
+        async for entry in entries:
             records.append(entry)
         return records
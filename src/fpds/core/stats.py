@@ -0,0 +1,260 @@
+"""
+Per-page and per-stage metrics of FPDS requests.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+PAGE_HOOK_TYPE = Callable[["fpdsPageStats"], None]
+# stages timed by `fpdsStats`, in pipeline order
+STAGES = ("download", "parse", "flatten", "serialize")
+
+logger = logging.getLogger("fpds.stats")
+
+
+class fpdsPageStats:
+    """Metrics of a single page.
+
+    Attributes
+    ----------
+    link: `str`
+        Page link.
+    size: `int`
+        Bytes downloaded (or read from the cache).
+    download_seconds: `float`
+        Latency of the request that retrieved the page, from sending it to
+        reading the whole response. Failed attempts, backoff and waiting for
+        a connection slot aren't included.
+    retries: `int`
+        Attempts made after the first one.
+    cached: `bool`
+        `True` if the page was served from the response cache.
+    parse_seconds: `float`
+        Time spent parsing the page into an XML tree.
+    flatten_seconds: `float`
+        Time spent flattening its entries into records.
+    records: `int`
+        Records emitted.
+    error: `Optional[str]`
+        Final error of a page that could not be retrieved.
+    """
+
+    __slots__ = (
+        "link",
+        "size",
+        "download_seconds",
+        "retries",
+        "cached",
+        "parse_seconds",
+        "flatten_seconds",
+        "records",
+        "error",
+    )
+
+    def __init__(self, link: str) -> None:
+        self.link = link
+        self.size = 0
+        self.download_seconds = 0.0
+        self.retries = 0
+        self.cached = False
+        self.parse_seconds = 0.0
+        self.flatten_seconds = 0.0
+        self.records = 0
+        self.error: Optional[str] = None
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<fpdsPageStats {self.to_dict()}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile of `values`; 0 if there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+class fpdsStats:
+    """Collects download, parse and flatten metrics of every page of a
+    request, plus the time spent serializing its records.
+
+    Pass it as `stats=` to `fpdsRequest` (or `fpdsBatchRequest`, whose
+    requests then share it). Requests without one skip every measurement.
+    Each page is reported to the hooks, and logged if `log` is set, once its
+    records are emitted or it fails.
+
+    Example:
+    -------
+    >>> stats = fpdsStats(hooks=[lambda page: print(page.link, page.records)])
+    >>> records = await fpdsRequest(stats=stats, AGENCY_CODE="7504").data()
+    >>> stats.summary()["download"]["p95"]
+
+    Attributes
+    ----------
+    hooks: `Iterable[Callable[[fpdsPageStats], None]]`
+        Defaults to no hooks.
+        Called with the metrics of each page once it completes.
+    log: `bool`
+        Defaults to `False`.
+        If `True`, each page and the summary are logged as JSON to the
+        `fpds.stats` logger, at INFO level. The values are also attached to
+        the log record as its `fpds` attribute.
+    pages: `Dict[str, fpdsPageStats]`
+        Metrics of each page, by link.
+    stage_seconds: `Dict[str, float]`
+        Time spent in stages that aren't tracked per page, e.g. "serialize".
+    """
+
+    def __init__(self, hooks: Iterable[PAGE_HOOK_TYPE] = (), log: bool = False) -> None:
+        self.hooks = list(hooks)
+        self.log = log
+        self.pages: Dict[str, fpdsPageStats] = {}
+        self.stage_seconds: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    def __str__(self) -> str:
+        return self.report()
+
+    def page(self, link: str) -> fpdsPageStats:
+        """Metrics of the page at `link`, created on first access."""
+        page = self.pages.get(link)
+        if page is None:
+            page = self.pages[link] = fpdsPageStats(link)
+        return page
+
+    def rename(self, link: str, new_link: str) -> None:
+        """Files the metrics of `link` under `new_link`, e.g. the first page,
+        retrieved by its search URL, under its pagination link.
+        """
+        page = self.pages.pop(link, None)
+        if page is not None:
+            page.link = new_link
+            self.pages[new_link] = page
+
+    def downloaded(
+        self,
+        link: str,
+        seconds: float,
+        size: int,
+        retries: int = 0,
+        cached: bool = False,
+    ) -> None:
+        page = self.page(link)
+        page.download_seconds = seconds
+        page.size = size
+        page.retries = retries
+        page.cached = cached
+
+    def parsed(
+        self,
+        link: str,
+        parse_seconds: float,
+        flatten_seconds: float,
+        records: int,
+    ) -> None:
+        page = self.page(link)
+        page.parse_seconds = parse_seconds
+        page.flatten_seconds = flatten_seconds
+        page.records = records
+        self.complete(page)
+
+    def failed(self, link: str, error: Exception) -> None:
+        page = self.page(link)
+        page.error = repr(error)
+        self.complete(page)
+
+    def complete(self, page: fpdsPageStats) -> None:
+        """Reports `page` to the hooks and, if enabled, the log."""
+        for hook in self.hooks:
+            hook(page)
+        if self.log:
+            self.emit("page", page.to_dict())
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Adds the time spent in the block to `stage_seconds[name]`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + elapsed
+
+    def emit(self, event: str, values: Dict[str, Any]) -> None:
+        logger.info(
+            "%s %s", event, json.dumps(values, default=str), extra={"fpds": values}
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals across pages, with the distribution of each per-page stage.
+
+        `elapsed_seconds` counts from the creation of the stats object. Stage
+        times are summed across pages that are processed concurrently, so they
+        can add up to more than `elapsed_seconds`.
+        """
+        pages = list(self.pages.values())
+        records = sum(page.records for page in pages)
+        elapsed = time.perf_counter() - self.started
+        summary: Dict[str, Any] = {
+            "pages": len(pages),
+            "failed": sum(page.error is not None for page in pages),
+            "cached": sum(page.cached for page in pages),
+            "retries": sum(page.retries for page in pages),
+            "bytes": sum(page.size for page in pages),
+            "records": records,
+            "elapsed_seconds": elapsed,
+            "records_per_second": records / elapsed if elapsed else 0.0,
+        }
+        for stage in ("download", "parse", "flatten"):
+            seconds = [getattr(page, f"{stage}_seconds") for page in pages]
+            summary[stage] = {
+                "total": sum(seconds),
+                "mean": sum(seconds) / len(seconds) if seconds else 0.0,
+                "p50": percentile(seconds, 0.5),
+                "p95": percentile(seconds, 0.95),
+                "max": max(seconds, default=0.0),
+            }
+        for stage, total in self.stage_seconds.items():
+            summary[stage] = {"total": total}
+        return summary
+
+    def finish(self) -> Dict[str, Any]:
+        """Returns the :meth:`summary`, logging it if enabled."""
+        summary = self.summary()
+        if self.log:
+            self.emit("summary", summary)
+        return summary
+
+    def report(self) -> str:
+        """Human readable :meth:`summary`."""
+        summary = self.summary()
+        lines = [
+            f"{summary['pages']} page(s), {summary['failed']} failed, "
+            f"{summary['cached']} cached, {summary['retries']} retried request(s)",
+            f"{summary['records']} record(s), {summary['bytes'] / 2**20:.1f} MiB "
+            f"in {summary['elapsed_seconds']:.2f}s "
+            f"({summary['records_per_second']:.0f} records/s)",
+        ]
+        for stage in STAGES:
+            if stage not in summary:
+                continue
+            values = summary[stage]
+            line = f"{stage:<10}{values['total']:>9.3f}s total"
+            if "p50" in values:
+                line += (
+                    f"  p50 {values['p50'] * 1000:.1f}ms"
+                    f"  p95 {values['p95'] * 1000:.1f}ms"
+                    f"  max {values['max'] * 1000:.1f}ms"
+                )
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,215 @@
+"""
+Local SQLite store for downloaded FPDS records.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import json
+import re
+import sqlite3
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Type
+
+from fpds.config import FPDS_STORE_PATH
+from fpds.core import FPDS_ENTRY
+from fpds.utilities import award_id, award_key
+
+# e.g. `content__award__relevantContractDates__signedDate`
+SIGNED_DATE_PATTERN = re.compile(r"^content__[^_]+__relevantContractDates__signedDate$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    key TEXT PRIMARY KEY,
+    piid TEXT,
+    agency_id TEXT,
+    mod_number TEXT,
+    contract_type TEXT,
+    signed_date TEXT,
+    modified TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_piid ON records (piid, mod_number);
+CREATE INDEX IF NOT EXISTS records_agency_id ON records (agency_id, signed_date);
+CREATE INDEX IF NOT EXISTS records_mod_number ON records (mod_number);
+CREATE INDEX IF NOT EXISTS records_contract_type
+    ON records (contract_type, signed_date);
+CREATE INDEX IF NOT EXISTS records_signed_date ON records (signed_date);
+"""
+
+UPSERT = """
+INSERT OR REPLACE INTO records (
+    key, piid, agency_id, mod_number, contract_type, signed_date, modified, record
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@lru_cache(maxsize=4096)
+def _is_signed_date(key: str) -> bool:
+    return SIGNED_DATE_PATTERN.match(key) is not None
+
+
+def _row(record: FPDS_ENTRY) -> Tuple[Optional[str], ...]:
+    """Columns of `record` in the order of :data:`UPSERT`."""
+    ids = award_id(record)
+    signed_date = next(
+        (value for key, value in record.items() if _is_signed_date(key)), None
+    )
+    return (
+        award_key(record, ids),
+        ids.get("PIID"),
+        ids.get("agencyID"),
+        ids.get("modNumber"),
+        record.get("contract_type"),
+        signed_date,
+        record.get("modified"),
+        json.dumps(record),
+    )
+
+
+class fpdsStore:
+    """Local store of FPDS records, backed by SQLite.
+
+    Records are upserted by `award_key`, so downloading the same records
+    again doesn't duplicate them. Besides the record itself (as JSON), the
+    award PIID, agency ID, modification number, contract type and signed
+    date are stored in indexed columns, so lookups on them (see :meth:`query`)
+    don't scan the store.
+
+    Example:
+    -------
+    >>> with fpdsStore() as store:
+    ...     request = fpdsRequest(store=store, **params)
+    ...     await request.data()
+    ...     modifications = list(store.query(piid="1B3G02670"))
+
+    Attributes
+    ----------
+    path: `Optional[Path]`
+        Defaults to `~/.fpds/records.db`.
+        SQLite database file, created if it doesn't exist.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or FPDS_STORE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        # readers don't block the writer, and commits don't wait on fsync
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsStore {self.path}>"
+
+    def __enter__(self) -> "fpdsStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def write(self, records: Iterable[FPDS_ENTRY]) -> int:
+        """Upserts `records` in a single transaction and returns how many were
+        written.
+        """
+        with self.connection:
+            cursor = self.connection.executemany(UPSERT, map(_row, records))
+        return cursor.rowcount
+
+    def get(self, key: str) -> Optional[FPDS_ENTRY]:
+        """The record with `award_key` `key`, if stored."""
+        row = self.connection.execute(
+            "SELECT record FROM records WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _where(
+        piid: Optional[str] = None,
+        agency_id: Optional[str] = None,
+        mod_number: Optional[str] = None,
+        contract_type: Optional[str] = None,
+        signed_from: Optional[date] = None,
+        signed_to: Optional[date] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses, values = [], []  # type: List[str], List[Any]
+        for column, value in (
+            ("piid", piid),
+            ("agency_id", agency_id),
+            ("mod_number", mod_number),
+            ("contract_type", contract_type),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        # signed dates are stored as `YYYY-MM-DD HH:MM:SS`
+        if signed_from is not None:
+            clauses.append("signed_date >= ?")
+            values.append(signed_from.isoformat())
+        if signed_to is not None:
+            clauses.append("signed_date < ?")
+            values.append((signed_to + timedelta(days=1)).isoformat())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, values
+
+    def query(
+        self,
+        piid: Optional[str] = None,
+        agency_id: Optional[str] = None,
+        mod_number: Optional[str] = None,
+        contract_type: Optional[str] = None,
+        signed_from: Optional[date] = None,
+        signed_to: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[FPDS_ENTRY]:
+        """Lazily yields the stored records matching every given filter.
+
+        Parameters
+        ----------
+        piid: `Optional[str]`
+            PIID of the award (or IDV).
+        agency_id: `Optional[str]`
+            Agency ID of the award (or IDV).
+        mod_number: `Optional[str]`
+            Modification number.
+        contract_type: `Optional[str]`
+            e.g. "AWARD" or "IDV".
+        signed_from: `Optional[date]`
+            Earliest signed date, inclusive.
+        signed_to: `Optional[date]`
+            Latest signed date, inclusive.
+        limit: `Optional[int]`
+            Defaults to `None`.
+            Maximum number of records to yield.
+        """
+        where, values = self._where(
+            piid, agency_id, mod_number, contract_type, signed_from, signed_to
+        )
+        sql = f"SELECT record FROM records{where}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            values.append(limit)
+        for (record,) in self.connection.execute(sql, values):
+            yield json.loads(record)
+
+    def count(self, **filters: Any) -> int:
+        """Number of stored records matching `filters`; see :meth:`query`."""
+        where, values = self._where(**filters)
+        (count,) = self.connection.execute(
+            f"SELECT COUNT(*) FROM records{where}", values
+        ).fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        self.connection.close()
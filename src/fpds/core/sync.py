@@ -0,0 +1,241 @@
+"""
+Incremental sync of FPDS searches.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import hashlib
+import json
+import os
+import warnings
+from contextlib import aclosing
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aiohttp import ClientSession
+
+from fpds.config import FPDS_DATA_DIR
+from fpds.core import FPDS_ENTRY
+from fpds.core.parser import fpdsRequest
+from fpds.utilities import award_key
+from fpds.utilities.params import DATE_FORMAT
+
+FPDS_SYNC_DIR = FPDS_DATA_DIR / "sync"
+
+
+class fpdsSync:
+    """Keeps a local copy of a search up to date by only downloading what
+    changed since the last run.
+
+    The `modified` timestamp of the newest record seen so far is kept as a
+    high-water mark in a state file. Each run searches `LAST_MOD_DATE` from
+    the day of the mark to today, skips records older than the mark and
+    upserts the others, keyed by award ID and modification number (see
+    `award_key`). The cost of a run therefore grows with the number of
+    changes since the last one, not with the age of the local copy.
+
+    Pages are read in order. The ATOM feed isn't sorted by `modified`, so
+    every page of the window is read by default. If the feed is known to
+    list recent changes first, `stop_early` stops paging at the end of the
+    first page that runs into records older than the mark after newer ones.
+    The order is checked on every record read: once a record is newer than
+    the one before it, early stopping is abandoned for the run (with a
+    warning) and the rest of the window is read, so that changes listed
+    after older records aren't skipped for good.
+
+    Each search gets its own directory, named after a hash of its search
+    parameters, holding `state.json` and the records as `records.jsonl`.
+    Upserts are appended to the latter, so that a run only writes what
+    changed; :meth:`records` keeps the latest version of each record and
+    :meth:`compact` rewrites the file without the older ones. The mark only
+    moves forward after a run in which every page was retrieved, so records
+    of a failed page are picked up by the next run.
+
+    Example:
+    -------
+    >>> sync = fpdsSync(since=date(2022, 1, 1), AGENCY_CODE="7504")
+    >>> changed = await sync.run()
+    >>> records = sync.records()
+
+    Attributes
+    ----------
+    since: `Optional[date]`
+        Defaults to `None`.
+        Start of the first sync. Required until a high-water mark exists.
+    directory: `Optional[Path]`
+        Defaults to `~/.fpds/sync`.
+        Parent directory for synced searches.
+    stop_early: `bool`
+        Defaults to `False`.
+        Set only for feeds ordered newest first: stops paging once records
+        older than the mark follow newer ones.
+    **kwargs: `Any`
+        Search parameters, without `LAST_MOD_DATE`, and `fpdsRequest` options.
+    """
+
+    def __init__(
+        self,
+        since: Optional[date] = None,
+        directory: Optional[Path] = None,
+        stop_early: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        if "LAST_MOD_DATE" in kwargs:
+            raise ValueError("`LAST_MOD_DATE` is set by the sync; use `since`")
+        self.since = since
+        self.directory = directory or FPDS_SYNC_DIR
+        self.stop_early = stop_early
+        # validates the search parameters before anything is downloaded
+        self.params = fpdsRequest(**kwargs).search_params
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsSync {self.params}>"
+
+    @property
+    def path(self) -> Path:
+        """Directory holding this search's state and records."""
+        digest = hashlib.sha256(self.params.encode("utf-8")).hexdigest()[:16]
+        return self.directory / digest
+
+    @property
+    def state_file(self) -> Path:
+        return self.path / "state.json"
+
+    @property
+    def records_file(self) -> Path:
+        return self.path / "records.jsonl"
+
+    def state(self) -> Dict[str, Any]:
+        """State saved by the last successful run, if any."""
+        if not self.state_file.exists():
+            return {}
+        with open(self.state_file) as infile:
+            state: Dict[str, Any] = json.load(infile)
+        return state
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """`modified` timestamp of the newest record synced so far."""
+        return self.state().get("high_water_mark")
+
+    def window(self, today: Optional[date] = None) -> str:
+        """`LAST_MOD_DATE` range of the next run: from the day of the mark (or
+        `since`) to `today`.
+        """
+        mark = self.high_water_mark
+        if mark is not None:
+            start = datetime.strptime(mark[:10], "%Y-%m-%d").date()
+        elif self.since is not None:
+            start = self.since
+        else:
+            raise ValueError("the first sync of a search requires `since`")
+        end = today or date.today()
+        return f"[{start.strftime(DATE_FORMAT)}, {end.strftime(DATE_FORMAT)}]"
+
+    def request(self) -> fpdsRequest:
+        """The request of the next run."""
+        return fpdsRequest(LAST_MOD_DATE=self.window(), **self.kwargs)
+
+    @staticmethod
+    def is_older(record: FPDS_ENTRY, mark: Optional[str]) -> bool:
+        """Whether `record` was modified before `mark`. Records modified at
+        the mark itself are synced again, since others may share its second.
+        """
+        modified = record.get("modified")
+        return bool(mark and modified and modified < mark)
+
+    async def run(self, session: Optional[ClientSession] = None) -> int:
+        """Downloads and upserts the records modified since the last run.
+
+        Parameters
+        ----------
+        session: `Optional[ClientSession]`
+            Defaults to a session from `fpdsRequest.create_session`.
+            Session used for every page request.
+
+        Returns
+        -------
+        count: `int`
+            Number of records upserted.
+        """
+        mark = newest = self.high_water_mark
+        request = self.request()
+        count = 0
+        seen_newer = passed_mark = False
+        # `modified` of the last record read, while records are newest first
+        previous: Optional[str] = None
+        ordered = self.stop_early
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        pages = request.iter_pages(ordered=True, session=session)
+        with open(self.records_file, "a") as outfile:
+            async with aclosing(pages):
+                async for _, records in pages:
+                    changed = []
+                    for record in records:
+                        modified = record.get("modified")
+                        if ordered and modified:
+                            if previous is not None and modified > previous:
+                                ordered = False
+                                warnings.warn(
+                                    "The feed isn't ordered newest first; "
+                                    "reading every page instead of stopping early"
+                                )
+                            previous = modified
+                        if self.is_older(record, mark):
+                            passed_mark = passed_mark or seen_newer
+                            continue
+                        seen_newer = True
+                        changed.append(record)
+                        if modified and (newest is None or modified > newest):
+                            newest = modified
+                    outfile.write("".join(json.dumps(r) + "\n" for r in changed))
+                    outfile.flush()
+                    count += len(changed)
+                    # the feed is declared newest first and every record read
+                    # so far agrees, so the pages left are older than the mark
+                    if ordered and passed_mark:
+                        break
+
+        if not request.failed_links:
+            self.save_state(
+                high_water_mark=newest, window=request.kwargs["LAST_MOD_DATE"]
+            )
+        return count
+
+    def save_state(self, **state: Any) -> None:
+        """Atomically replaces the state file."""
+        state = {
+            "params": self.params,
+            "synced_at": datetime.now().isoformat(timespec="seconds"),
+            **state,
+        }
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp_file = self.state_file.with_suffix(".tmp")
+        with open(temp_file, "w") as outfile:
+            json.dump(state, outfile)
+        os.replace(temp_file, self.state_file)
+
+    def records(self) -> List[FPDS_ENTRY]:
+        """The latest version of every synced record."""
+        if not self.records_file.exists():
+            return []
+        latest: Dict[str, FPDS_ENTRY] = {}
+        with open(self.records_file) as infile:
+            for line in infile:
+                record = json.loads(line)
+                latest[award_key(record)] = record
+        return list(latest.values())
+
+    def compact(self) -> None:
+        """Rewrites the records file with only the latest version of each
+        record.
+        """
+        records = self.records()
+        temp_file = self.records_file.with_suffix(".tmp")
+        with open(temp_file, "w") as outfile:
+            outfile.writelines(json.dumps(record) + "\n" for record in records)
+        os.replace(temp_file, self.records_file)
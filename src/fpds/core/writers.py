@@ -0,0 +1,241 @@
+"""
+Streaming writers for FPDS records.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import gzip
+import json
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, Iterable, List, Optional, Type
+
+from fpds.core import FPDS_ENTRY
+
+# compression: file suffix
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_ROW_GROUP_SIZE = 10_000
+
+
+def open_compressed(path: Path, compression: str = "none") -> IO[bytes]:
+    """Opens `path` for binary writing, compressing with `compression`.
+
+    Parameters
+    ----------
+    path: `Path`
+        File to write.
+    compression: `str`
+        Defaults to "none".
+        One of "none", "gzip" or "zstd". "zstd" requires the optional
+        `zstandard` package (`pip install fpds[zstd]`).
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"`compression` must be one of {tuple(COMPRESSION_SUFFIXES)}, "
+            f"not {compression!r}"
+        )
+    if compression == "gzip":
+        return gzip.GzipFile(path, "wb")  # type: ignore[return-value]
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError(
+                "zstd compression requires `zstandard`: pip install fpds[zstd]"
+            ) from exc
+        return zstandard.open(path, "wb")
+    return open(path, "wb")
+
+
+class fpdsJsonLinesWriter:
+    """Writes records as JSON Lines (one JSON object per line) as they are
+    produced, so that memory doesn't grow with the number of records and
+    readers can start on the file before the run ends.
+
+    Example:
+    -------
+    >>> with fpdsJsonLinesWriter(path, compression="gzip") as writer:
+    ...     async for _, records in request.iter_pages():
+    ...         writer.write(records)
+
+    Attributes
+    ----------
+    path: `Path`
+        Output file. Its name is used as is; see :func:`jsonl_filename`.
+    compression: `str`
+        Defaults to "none".
+        One of "none", "gzip" or "zstd".
+    count: `int`
+        Number of records written so far.
+    """
+
+    def __init__(self, path: Path, compression: str = "none") -> None:
+        self.path = path
+        self.compression = compression
+        self.count = 0
+        self._file = open_compressed(path, compression=compression)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsJsonLinesWriter {self.path} ({self.count} records)>"
+
+    def __enter__(self) -> "fpdsJsonLinesWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def write(self, records: Iterable[FPDS_ENTRY]) -> None:
+        """Writes `records` and flushes them to the file."""
+        write = self._file.write
+        for record in records:
+            write(json.dumps(record).encode())
+            write(b"\n")
+            self.count += 1
+        self._file.flush()
+
+    def close(self) -> None:
+        """Finishes the file, writing any compression trailer."""
+        self._file.close()
+
+
+def jsonl_filename(stem: str, compression: str = "none") -> str:
+    """File name for JSON Lines output, e.g. `<stem>.jsonl.gz`."""
+    return f"{stem}.jsonl{COMPRESSION_SUFFIXES[compression]}"
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            "Parquet export requires `pyarrow`: pip install fpds[parquet]"
+        ) from exc
+    return pyarrow
+
+
+class fpdsParquetWriter:
+    """Writes records to Parquet as they are produced.
+
+    Records are buffered into Arrow record batches of `row_group_size` rows,
+    each written as a row group. Every column is a nullable string, named
+    after a flattened record key, in the order keys first appear. When a
+    batch brings keys the schema doesn't have yet, the schema grows and a new
+    part file is started; each part's schema is therefore a superset of the
+    previous ones. :func:`read_parquet` reads all parts back as one table.
+
+    Example:
+    -------
+    >>> with fpdsParquetWriter(path) as writer:
+    ...     async for _, records in request.iter_pages():
+    ...         writer.write(records)
+
+    Attributes
+    ----------
+    path: `Path`
+        Output directory, holding `part-00000.parquet`, `part-00001.parquet`...
+    row_group_size: `int`
+        Defaults to 10000.
+        Number of records per row group.
+    compression: `str`
+        Defaults to "snappy".
+        Parquet compression codec, e.g. "none", "snappy", "gzip" or "zstd".
+    count: `int`
+        Number of records written so far.
+    parts: `List[Path]`
+        Part files written so far.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "snappy",
+    ) -> None:
+        self._pa = _import_pyarrow()
+        self.path = path
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.count = 0
+        self.parts: List[Path] = []
+        self._keys: Dict[str, None] = {}
+        self._rows: List[FPDS_ENTRY] = []
+        self._schema: Any = None
+        self._writer: Any = None
+        path.mkdir(parents=True, exist_ok=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsParquetWriter {self.path} ({self.count} records)>"
+
+    def __enter__(self) -> "fpdsParquetWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns seen so far, in order of first appearance."""
+        return list(self._keys)
+
+    def write(self, records: Iterable[FPDS_ENTRY]) -> None:
+        """Buffers `records`, writing a row group every `row_group_size`."""
+        keys = self._keys
+        for record in records:
+            for key in record:
+                if key not in keys:
+                    keys[key] = None
+            self._rows.append(record)
+            self.count += 1
+            if len(self._rows) >= self.row_group_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Writes buffered records as a row group."""
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        pa = self._pa
+        if self._schema is None or len(self._schema) != len(self._keys):
+            self._schema = pa.schema([(key, pa.string()) for key in self._keys])
+            self._start_part()
+        columns = [[row.get(key) for row in rows] for key in self._keys]
+        batch = pa.RecordBatch.from_arrays(columns, schema=self._schema)
+        self._writer.write_batch(batch, row_group_size=self.row_group_size)
+
+    def _start_part(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        part = self.path / f"part-{len(self.parts):05d}.parquet"
+        self._writer = self._pa.parquet.ParquetWriter(
+            part, self._schema, compression=self.compression
+        )
+        self.parts.append(part)
+
+    def close(self) -> None:
+        """Writes any buffered records and finishes the current part."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def read_parquet(path: Path) -> Any:
+    """Reads the parts written by :class:`fpdsParquetWriter` into a single
+    `pyarrow.Table`, with columns missing from older parts filled with nulls.
+    """
+    pa = _import_pyarrow()
+    parts = sorted(path.glob("part-*.parquet"))
+    schema = pa.unify_schemas([pa.parquet.read_schema(part) for part in parts])
+    return pa.parquet.read_table(parts, schema=schema)
@@ -2,18 +2,47 @@
 XML classes for parsing FPDS content.
 
 author: derek663@gmail.com
-last_updated: 2025-07-25
+last_updated: 2026-10-18
 """
 
 import re
-from typing import Dict, Iterator, List, Optional, TypedDict, Unpack
-from xml.etree.ElementTree import Element, ElementTree, fromstring
+from functools import lru_cache
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Unpack,
+    cast,
+)
+from xml.etree.ElementTree import Element, ElementTree, XMLPullParser
 
 from fpds.core import FPDS_ENTRY
+from fpds.core.backends import get_xml_backend
 from fpds.core.mixins import fpdsMixin
 
 NAMESPACE_REGEX = r"\{(.*)\}"
 LAST_PAGE_REGEX = r"start=(.*?)$"
+LAST_PAGE_PATTERN = re.compile(LAST_PAGE_REGEX)
+
+
+@lru_cache(maxsize=32)
+def namespace_pattern(namespaces: Tuple[str, ...]) -> re.Pattern[str]:
+    """Compiled regex identifying any of `namespaces` within a tag element.
+
+    Cached by namespace tuple, so every tree (and every element built from a
+    tree) sharing the same namespaces shares a single compiled pattern.
+    """
+    # yeah, f-strings don't do well with backslashes
+    PATTERN = r"\{(" + "|".join(namespaces) + r")\}"  # noqa
+    return re.compile(PATTERN)
 
 
 class fpdsElementAttributes(TypedDict):
@@ -52,13 +81,15 @@ class fpdsElement:
         """Returns iteration of `Element` as a generator."""
         yield from self.element.iter()
 
+    @property
+    def namespace_regex(self) -> re.Pattern[str]:
+        """Compiled :attr:`NAMESPACE_REGEX_PATTERN`."""
+        return namespace_pattern(tuple(self.namespace_dict.values()))
+
     @property
     def NAMESPACE_REGEX_PATTERN(self) -> str:
         """Regex pattern identifying a namespace within a tag element."""
-        namespaces = "|".join(self.namespace_dict.values())
-        # yeah, f-strings don't do well with backslashes
-        PATTERN = r"\{(" + namespaces + r")\}"  # noqa
-        return PATTERN
+        return self.namespace_regex.pattern
 
     @property
     def tag(self) -> str:
@@ -72,27 +103,66 @@ class fpdsElement:
         A tag like the following: `ns1:productOrServiceInformation`
         would simply return `productOrServiceInformation`.
         """
-        clean_tag = re.sub(self.NAMESPACE_REGEX_PATTERN, "", self.tag)
+        clean_tag = self.namespace_regex.sub("", self.tag)
         return clean_tag
 
 
 class fpdsTree(fpdsMixin):
     """Representation of initial FPDS response as an ElementTree.
 
+    The `ElementTree` is built lazily, the first time :attr:`tree` is read.
+    Namespaces are discovered once per document, the first time they are
+    needed, and cached on the tree along with the compiled namespace regex
+    and the :class:`EntryFlattener` shared by all of its entries. Assigning
+    new `content` invalidates those caches.
+
     Attributes
     ----------
     content: `bytes`
         XML bytes content.
+    backend: `Optional[str]`
+        Defaults to the process-wide backend (see `get_xml_backend`).
+        XML parser backend, "auto", "lxml" or "stdlib". Every backend yields
+        the same records.
     """
 
-    def __init__(self, content: bytes) -> None:
+    def __init__(self, content: bytes, backend: Optional[str] = None) -> None:
+        self.backend = get_xml_backend(backend)
+        self._content = b""
+        self._tree: Optional[ElementTree] = None
+        self._namespace_dict: Optional[Dict[str, str]] = None
+        self._flattener: Optional[EntryFlattener] = None
         if isinstance(content, bytes):
             self.content = content
-            self.tree = self.convert_to_lxml_tree()
+
+    @property
+    def content(self) -> bytes:
+        """XML bytes content."""
+        return self._content
+
+    @content.setter
+    def content(self, content: bytes) -> None:
+        self._content = content
+        self.invalidate()
+
+    @property
+    def tree(self) -> ElementTree:
+        """`ElementTree` built from :attr:`content` on first access."""
+        if self._tree is None:
+            self._tree = self.convert_to_lxml_tree()
+        return self._tree
+
+    def invalidate(self) -> None:
+        """Drops the cached tree, namespaces and flattener so they are rebuilt
+        from the current content on next access.
+        """
+        self._tree = None
+        self._namespace_dict = None
+        self._flattener = None
 
     def convert_to_lxml_tree(self) -> ElementTree:
         """Returns an `ElementTree` object from a `bytes` response."""
-        tree = ElementTree(fromstring(self.content))
+        tree = ElementTree(self.backend.fromstring(self.content))
         return tree
 
     @staticmethod
@@ -121,15 +191,42 @@ class fpdsTree(fpdsMixin):
         tree, which will be important in identifying Atom entries in `fpds`.
 
         https://docs.python.org/3/library/xml.etree.elementtree.html#parsing-xml-with-namespaces
+
+        The tree is walked once and the result cached; see :meth:`invalidate`.
         """
-        namespaces = list()
-        for element in self.parse_items():
-            _namespace = self._get_full_namespace(element)
-            if _namespace not in namespaces:
-                namespaces.append(_namespace)
+        if self._namespace_dict is None:
+            namespaces = list()
+            seen_tags = set()
+            for element in self.parse_items():
+                # a page repeats the same few hundred tags, so only run the
+                # regex for tags we haven't come across yet
+                tag = element.tag
+                if tag in seen_tags:
+                    continue
+                seen_tags.add(tag)
+                _namespace = self._get_full_namespace(element)
+                if _namespace not in namespaces:
+                    namespaces.append(_namespace)
+
+            self._namespace_dict = {f"ns{idx}": ns for idx, ns in enumerate(namespaces)}
+        return self._namespace_dict
 
-        namespace_dict = {f"ns{idx}": ns for idx, ns in enumerate(namespaces)}
-        return namespace_dict
+    @property
+    def namespace_regex(self) -> re.Pattern[str]:
+        """Compiled regex identifying any namespace of this tree in a tag."""
+        return namespace_pattern(tuple(self.namespace_dict.values()))
+
+    @property
+    def NAMESPACE_REGEX_PATTERN(self) -> str:
+        """Regex pattern identifying a namespace within a tag element."""
+        return self.namespace_regex.pattern
+
+    @property
+    def flattener(self) -> "EntryFlattener":
+        """Entry flattener shared by every entry in this tree."""
+        if self._flattener is None:
+            self._flattener = EntryFlattener(namespace_dict=self.namespace_dict)
+        return self._flattener
 
     @property
     def lower_limit(self) -> int:
@@ -137,9 +234,9 @@ class fpdsTree(fpdsMixin):
         40-49 records).
         """
         last_link = self.tree.find(".//ns0:link[@rel='last']", self.namespace_dict)
-        if isinstance(last_link, Element):
+        if last_link is not None:
             # length of last_link should always be 1
-            match = re.search(LAST_PAGE_REGEX, last_link.attrib["href"])
+            match = LAST_PAGE_PATTERN.search(last_link.attrib["href"])
             assert match is not None
             record_count = int(match.group(1))
         else:
@@ -169,20 +266,99 @@ class fpdsTree(fpdsMixin):
         """Returns iteration of `Element` as a generator."""
         yield from self.tree.iter()
 
-    def jsonify(self) -> List[FPDS_ENTRY]:
-        """Returns all paginated entries from an FPDS request."""
+    def jsonify(self, fields: Optional[Iterable[str]] = None) -> List[FPDS_ENTRY]:
+        """Returns all paginated entries from an FPDS request.
+
+        Parameters
+        ----------
+        fields: `Optional[Iterable[str]]`
+            Defaults to `None`.
+            Flattened keys to keep in each record; see :class:`EntryFlattener`.
+            `None` keeps every key.
+        """
         entries = self.get_atom_feed_entries()
-        json_data = [
-            Entry(element=element, namespace_dict=self.namespace_dict)()
-            for element in entries
-        ]
+        if fields is None:
+            flattener = self.flattener
+        else:
+            flattener = EntryFlattener(
+                namespace_dict=self.namespace_dict, fields=fields
+            )
+        json_data = [flattener(element) for element in entries]
         return json_data
 
+    def iterjsonify(
+        self, chunk_size: int = 2**16, fields: Optional[Iterable[str]] = None
+    ) -> Iterator[FPDS_ENTRY]:
+        """Lazily yields the same records as :meth:`jsonify`, streaming
+        :attr:`content` through :class:`fpdsStreamParser` without ever building
+        the full tree.
+
+        Parameters
+        ----------
+        chunk_size: `int`
+            Defaults to 65536.
+            Number of bytes fed to the parser at a time.
+        fields: `Optional[Iterable[str]]`
+            Defaults to `None`.
+            Flattened keys to keep in each record. `None` keeps every key.
+        """
+        parser = fpdsStreamParser(fields=fields, backend=self.backend.name)
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield from parser.feed(content[start : start + chunk_size])
+        yield from parser.close()
+
 
 class fpdsSubTree(fpdsTree):
-    """A class denoting XML trees built off of the pagination links from :class:`fpdsTree`."""
+    """A class denoting XML trees built off of the pagination links from :class:`fpdsTree`.
+
+    A subtree can also consume a page incrementally, e.g. straight from an
+    aiohttp response body, with :meth:`feed`/:meth:`close` or :meth:`stream`.
+    Entries are flattened as each one closes and are released right after,
+    so the page is never held in memory as a whole.
+
+    Example:
+    --------
+    >>> subtree = fpdsSubTree()
+    >>> async with session.get(link) as response:
+    >>>     chunks = response.content.iter_chunked(2**16)
+    >>>     records = [record async for record in subtree.stream(chunks)]
+    """
+
+    def __init__(
+        self, content: Optional[bytes] = None, backend: Optional[str] = None
+    ) -> None:
+        super().__init__(
+            content=content if content is not None else b"", backend=backend
+        )
+        self._stream_parser: Optional[fpdsStreamParser] = None
+
+    @property
+    def stream_parser(self) -> "fpdsStreamParser":
+        """Incremental parser backing :meth:`feed` and :meth:`close`."""
+        if self._stream_parser is None:
+            self._stream_parser = fpdsStreamParser(backend=self.backend.name)
+        return self._stream_parser
+
+    def feed(self, chunk: bytes) -> List[FPDS_ENTRY]:
+        """Feeds a chunk of the response body, returning records for every
+        entry that closed within it.
+        """
+        return self.stream_parser.feed(chunk)
 
-    pass
+    def close(self) -> List[FPDS_ENTRY]:
+        """Signals the end of the response body and returns any remaining
+        records.
+        """
+        return self.stream_parser.close()
+
+    async def stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[FPDS_ENTRY]:
+        """Yields records as they become available from `chunks`."""
+        async for chunk in chunks:
+            for record in self.feed(chunk):
+                yield record
+        for record in self.close():
+            yield record
 
 
 class _ElementAttributes:
@@ -229,7 +405,7 @@ class _ElementAttributes:
         """
 
         attributes = self.element.attrib
-        _attributes_copy = attributes.copy()
+        _attributes_copy = dict(attributes)
 
         if self.element.text:
             _attributes_copy[self.prefix] = self.element.text
@@ -277,9 +453,13 @@ class Entry(fpdsElement):
         return f"<Entry {self.clean_tag}>"
 
     def __call__(self) -> FPDS_ENTRY:  # pragma: no cover
-        """Shortcut for the finalized data structure."""
-        data_with_attributes = self.get_entry_data()
-        return data_with_attributes
+        """Shortcut for the finalized data structure.
+
+        Delegates to :class:`EntryFlattener`, which produces the same output
+        as :meth:`get_entry_data` in a single walk of the entry.
+        """
+        flattener = EntryFlattener(namespace_dict=self.namespace_dict)
+        return flattener(self.element)
 
     @property
     def contract_type(self) -> str:
@@ -288,9 +468,9 @@ class Entry(fpdsElement):
         """
         assert self.element is not None
         content = self.element.find(".//ns0:content", self.namespace_dict)
-        if content:
+        if content is not None and len(content):
             award = list(content)[0]
-            award_type = re.sub(self.NAMESPACE_REGEX_PATTERN, "", award.tag)
+            award_type = self.namespace_regex.sub("", award.tag)
         return award_type.upper()
 
     def get_entry_data(self) -> Dict[str, str]:
@@ -403,3 +583,384 @@ class Parent(fpdsElement):
         else:
             name = self.clean_tag
         return name
+
+
+class EntryFlattener:
+    """Flattens ATOM feed entries into `FPDS_ENTRY` records.
+
+    This is the single-pass counterpart to :meth:`Entry.get_entry_data`.
+    Rather than allocating a `Parent` wrapper for every tag and running the
+    namespace regex against each one, it walks an entry once, looks cleaned
+    tag names up in a table that is filled the first time a tag is seen, and
+    resolves the entry's `contract_type` during that same walk. A single
+    instance is meant to be shared by all entries of a tree so the tag table
+    is reused across them.
+
+    The output is identical to :meth:`Entry.get_entry_data`, including key
+    order and the handling of duplicate sibling tags (the last sibling wins).
+
+    Given `fields`, records only hold those keys. Tags whose name isn't a
+    (`delim`-separated) prefix of any field can't contribute to them, so the
+    walk doesn't descend into them at all.
+
+    Example:
+    --------
+    >>> flattener = EntryFlattener(namespace_dict=tree.namespace_dict)
+    >>> records = [flattener(entry) for entry in tree.get_atom_feed_entries()]
+
+    Attributes
+    ----------
+    namespace_dict: `Dict[str, str]`
+        XML namespaces.
+    delim: `str`
+        Defaults to "__".
+        Delimiter used when concatenating parent/child tag names.
+    fields: `Optional[Iterable[str]]`
+        Defaults to `None`.
+        Flattened keys to keep, e.g. `content__award__awardID__awardContractID__PIID`
+        or `contract_type`. `None` keeps every key.
+    """
+
+    def __init__(
+        self,
+        namespace_dict: Dict[str, str],
+        delim: str = "__",
+        fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.namespace_dict = namespace_dict
+        self.delim = delim
+        self.fields = None if fields is None else frozenset(fields)
+
+        self._pattern = namespace_pattern(tuple(namespace_dict.values()))
+        self._clean_tags: Dict[str, str] = {}
+        self._content_tag = "{%s}content" % namespace_dict.get("ns0", "")
+        # names of the tags worth walking into, i.e. every prefix of a field
+        self._wanted: Optional[FrozenSet[str]] = None
+        if self.fields is not None:
+            self._wanted = frozenset(
+                delim.join(parts[:end])
+                for parts in (field.split(delim) for field in self.fields)
+                for end in range(1, len(parts) + 1)
+            )
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<EntryFlattener {len(self._clean_tags)} tag(s) cached>"
+
+    def __call__(self, element: Element) -> FPDS_ENTRY:
+        """Flattens a single ATOM feed `entry` element."""
+        return self.flatten(element)
+
+    def clean_tag(self, tag: str) -> str:
+        """Tag name without the namespace, cached per distinct tag."""
+        try:
+            return self._clean_tags[tag]
+        except KeyError:
+            clean_tag = self._clean_tags[tag] = self._pattern.sub("", tag)
+            return clean_tag
+
+    def hierarchy(self, element: Element) -> Tuple[Dict[str, Element], str]:
+        """Walks `element` once and returns its tag hierarchy and contract type.
+
+        The hierarchy matches :meth:`Entry.content_tag_hierarchy`: keys are
+        concatenated tag names in document order and, when siblings share a
+        name, the last sibling is kept in the position of the first.
+        """
+        wanted = self._wanted
+        if wanted is None and hasattr(element, "getparent"):
+            return self._hierarchy_by_parent(element)
+
+        clean_tag = self.clean_tag
+        content_tag = self._content_tag
+        delim = self.delim
+
+        hierarchy: Dict[str, Element] = {}
+        contract_type = ""
+        # an explicit stack keeps the document (pre-)order of the recursive
+        # implementation without its call overhead
+        stack = [(child, clean_tag(child.tag)) for child in reversed(element)]
+        if wanted is not None:
+            # the content tag may be skipped, but still names the contract type
+            for child in element:
+                if child.tag == content_tag and len(child):
+                    contract_type = clean_tag(child[0].tag).upper()
+            stack = [item for item in stack if item[1] in wanted]
+        while stack:
+            child, name = stack.pop()
+            hierarchy[name] = child
+            if len(child):
+                if not contract_type and child.tag == content_tag:
+                    contract_type = clean_tag(child[0].tag).upper()
+                prefix = name + delim
+                children = (
+                    (grandchild, prefix + clean_tag(grandchild.tag))
+                    for grandchild in reversed(child)
+                )
+                if wanted is None:
+                    stack.extend(children)
+                else:
+                    stack.extend(item for item in children if item[1] in wanted)
+        return hierarchy, contract_type
+
+    def _hierarchy_by_parent(self, element: Element) -> Tuple[Dict[str, Element], str]:
+        """:meth:`hierarchy` for elements that know their parent (lxml's).
+
+        Visiting lxml children one at a time is slow, so the entry is walked
+        in a single pass of `iter`, which also yields document order, and each
+        element is named after its parent.
+        """
+        clean_tag = self.clean_tag
+        content_tag = self._content_tag
+        delim = self.delim
+
+        names = {element: ""}
+        hierarchy: Dict[str, Element] = {}
+        contract_type = ""
+        descendants = element.iter()
+        next(descendants)  # the entry itself
+        for child in descendants:
+            tag = child.tag
+            parent = names[child.getparent()]  # type: ignore[attr-defined]
+            name = f"{parent}{delim}{clean_tag(tag)}" if parent else clean_tag(tag)
+            names[child] = name
+            hierarchy[name] = child
+            if not contract_type and tag == content_tag and len(child):
+                contract_type = clean_tag(child[0].tag).upper()
+        return hierarchy, contract_type
+
+    def flatten(self, element: Element) -> FPDS_ENTRY:
+        """Extracts award data from an entry. See :meth:`Entry.get_entry_data`."""
+        delim = self.delim
+        hierarchy, contract_type = self.hierarchy(element)
+
+        fields = self.fields
+        if fields is not None:
+            first = next(iter(element), None)
+            first_tag = None if first is None else self.clean_tag(first.tag)
+            return self._project(hierarchy, contract_type, fields, first_tag)
+
+        entry_tags: Dict[str, str] = {}
+        for prefix, tag in hierarchy.items():
+            text = tag.text
+            # `items` is cheaper than `attrib`, a proxy object under lxml
+            attributes = tag.items()
+            if attributes:
+                # an attribute sharing the prefix name shadows the tag text, see
+                # `_ElementAttributes._generate_nested_attribute_dict`
+                if text and tag.get(prefix) is None:
+                    entry_tags[prefix] = text
+                for key, value in attributes:
+                    entry_tags[f"{prefix}{delim}{key}"] = value
+            elif text:
+                entry_tags[prefix] = text
+            if "contract_type" not in entry_tags:
+                entry_tags["contract_type"] = contract_type
+        return entry_tags
+
+    def _project(
+        self,
+        hierarchy: Dict[str, Element],
+        contract_type: str,
+        fields: FrozenSet[str],
+        first_tag: Optional[str],
+    ) -> FPDS_ENTRY:
+        """Same as :meth:`flatten`, keeping only `fields`.
+
+        :meth:`flatten` places `contract_type` after the keys of the entry's
+        first tag, `first_tag`. When no field needs that tag it isn't walked,
+        so `contract_type` comes first.
+        """
+        delim = self.delim
+        entry_tags: Dict[str, str] = {}
+        with_type = "contract_type" in fields
+        if with_type and first_tag is not None and first_tag not in hierarchy:
+            entry_tags["contract_type"] = contract_type
+        for prefix, tag in hierarchy.items():
+            attributes = tag.attrib
+            if tag.text and prefix not in attributes and prefix in fields:
+                entry_tags[prefix] = tag.text
+            for key, value in attributes.items():
+                name = f"{prefix}{delim}{key}"
+                if name in fields:
+                    entry_tags[name] = value
+            if with_type and "contract_type" not in entry_tags:
+                entry_tags["contract_type"] = contract_type
+        return entry_tags
+
+
+class fpdsStreamParser:
+    """Incremental parser for a single ATOM feed page.
+
+    Built on `XMLPullParser`, it flattens each `entry` with an
+    :class:`EntryFlattener` as soon as the element closes, then clears the
+    element and detaches it from its parent. Memory is therefore bounded by
+    the size of a single entry rather than by the size of the page. Records
+    are identical to those from :meth:`fpdsTree.jsonify`.
+
+    Namespaces are collected in the order tags first appear, exactly like
+    :attr:`fpdsTree.namespace_dict`, so by the time an entry closes every
+    namespace it uses is known.
+
+    Attributes
+    ----------
+    fields: `Optional[Iterable[str]]`
+        Defaults to `None`.
+        Flattened keys to keep in each record. `None` keeps every key.
+    backend: `Optional[str]`
+        Defaults to the process-wide backend (see `get_xml_backend`).
+        XML parser backend, "auto", "lxml" or "stdlib".
+    last_link: `Optional[str]`
+        The `href` of the feed's `last` link, once it has been parsed.
+    entry_count: `int`
+        Number of entries parsed so far.
+    """
+
+    def __init__(
+        self, fields: Optional[Iterable[str]] = None, backend: Optional[str] = None
+    ) -> None:
+        self.fields = None if fields is None else frozenset(fields)
+        self.backend = get_xml_backend(backend)
+        self._parser: "XMLPullParser[Element]" = self.backend.pull_parser(
+            ("start", "end")
+        )
+        self._namespaces: List[str] = []
+        self._seen_tags: Set[str] = set()
+        self._stack: List[Element] = []
+        self._root: Optional[Element] = None
+        self._entry_tag = ""
+        self._link_tag = ""
+        self._flattener: Optional[EntryFlattener] = None
+        self.last_link: Optional[str] = None
+        self.entry_count = 0
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<fpdsStreamParser {self.entry_count} entries>"
+
+    @property
+    def namespace_dict(self) -> Dict[str, str]:
+        """XML namespaces seen so far. See :attr:`fpdsTree.namespace_dict`."""
+        return {f"ns{idx}": ns for idx, ns in enumerate(self._namespaces)}
+
+    @property
+    def flattener(self) -> EntryFlattener:
+        """Entry flattener for the namespaces seen so far."""
+        flattener = self._flattener
+        if flattener is None or len(flattener.namespace_dict) != len(self._namespaces):
+            flattener = self._flattener = EntryFlattener(
+                namespace_dict=self.namespace_dict, fields=self.fields
+            )
+        return flattener
+
+    @property
+    def lower_limit(self) -> int:
+        """Same as :attr:`fpdsTree.lower_limit`; complete only after
+        :meth:`close`.
+        """
+        if self.last_link is not None:
+            match = LAST_PAGE_PATTERN.search(self.last_link)
+            assert match is not None
+            return int(match.group(1))
+        return self.entry_count
+
+    def feed(self, data: bytes) -> List[FPDS_ENTRY]:
+        """Parses `data` and returns records for entries closed within it."""
+        self._parser.feed(data)
+        return self._read_records()
+
+    def close(self) -> List[FPDS_ENTRY]:
+        """Finishes parsing and returns any remaining records."""
+        self._parser.close()
+        return self._read_records()
+
+    def _read_records(self) -> List[FPDS_ENTRY]:
+        records = []
+        stack = self._stack
+        for event, item in self._parser.read_events():  # type: ignore[misc]
+            # only "start" and "end" events are read, so always elements
+            element = cast(Element, item)
+            if event == "start":
+                tag = element.tag
+                if tag not in self._seen_tags:
+                    self._seen_tags.add(tag)
+                    namespace = fpdsTree._get_full_namespace(element)
+                    if namespace not in self._namespaces:
+                        self._namespaces.append(namespace)
+                if not stack:
+                    # root element, which holds the Atom (ns0) namespace
+                    self._root = element
+                    self._entry_tag = "{%s}entry" % self._namespaces[0]
+                    self._link_tag = "{%s}link" % self._namespaces[0]
+                elif (
+                    self.last_link is None
+                    and tag == self._link_tag
+                    and element.get("rel") == "last"
+                ):
+                    self.last_link = element.get("href")
+                stack.append(element)
+            else:
+                stack.pop()
+                if element.tag == self._entry_tag:
+                    records.append(self.flattener(element))
+                    self.entry_count += 1
+                    element.clear()
+                    if stack:
+                        stack[-1].remove(element)
+        return records
+
+
+class fpdsRecordBatch:
+    """The records of a page in a compact form, for returning them from a
+    worker process.
+
+    Records sharing the same keys, in the same order, share a single key tuple
+    (a schema); each row only holds its schema index and its values. Pickling
+    a batch therefore doesn't repeat every key of every record.
+
+    Attributes
+    ----------
+    schemas: `List[Tuple[str, ...]]`
+        Distinct key tuples, in order of first appearance.
+    rows: `List[Tuple[int, Tuple[str, ...]]]`
+        Schema index and values of each record.
+    """
+
+    __slots__ = ("schemas", "rows")
+
+    def __init__(
+        self,
+        schemas: List[Tuple[str, ...]],
+        rows: List[Tuple[int, Tuple[str, ...]]],
+    ) -> None:
+        self.schemas = schemas
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_records(cls, records: Iterable[FPDS_ENTRY]) -> "fpdsRecordBatch":
+        """Packs `records` into a batch."""
+        schemas: Dict[Tuple[str, ...], int] = {}
+        rows = []
+        for record in records:
+            keys = tuple(record)
+            index = schemas.setdefault(keys, len(schemas))
+            rows.append((index, tuple(record.values())))
+        return cls(schemas=list(schemas), rows=rows)
+
+    def records(self) -> List[FPDS_ENTRY]:
+        """Unpacks the batch into records, with their original key order."""
+        schemas = self.schemas
+        return [dict(zip(schemas[index], values)) for index, values in self.rows]
+
+
+def parse_page(
+    content: bytes, fields: Optional[FrozenSet[str]] = None
+) -> fpdsRecordBatch:
+    """Parses and flattens the raw bytes of a page into a batch, keeping only
+    `fields` if given.
+
+    Meant to run in a worker process: only bytes go in and a compact batch
+    comes out, so no parsed tree ever crosses the process boundary.
+    """
+    records = fpdsTree(content=content).jsonify(fields=fields)
+    return fpdsRecordBatch.from_records(records)
@@ -1,5 +1,7 @@
 """Errors for fpds."""
 
+from typing import List
+
 
 class fpdsMaxPageLengthExceededError(Exception):
     def __init__(self, page_count: int) -> None:
@@ -29,3 +31,10 @@ class fpdsDuplicateParameterConfiguration(Exception):
     def __init__(self, name: str) -> None:
         self.message = f"Multiple records for parameter `{name}` found in config!"
         super().__init__(self.message)
+
+
+class fpdsInvalidParameterConfiguration(Exception):
+    def __init__(self, problems: List[str]) -> None:
+        self.problems = problems
+        self.message = "Invalid parameter config: " + "; ".join(problems)
+        super().__init__(self.message)
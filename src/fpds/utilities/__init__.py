@@ -1,7 +1,28 @@
 from .decorators import timeit
-from .params import validate_kwarg
+from .params import (
+    build_search_params,
+    fpdsParameterRegistry,
+    parameter_registry,
+    split_date_range,
+    validate_kwarg,
+    validate_params,
+)
+from .records import award_id, award_key, project, record_ids, record_key
+from .throttle import RateLimiter, backoff_delay
 
 __all__ = [
+    "RateLimiter",
+    "award_id",
+    "award_key",
+    "backoff_delay",
+    "build_search_params",
+    "fpdsParameterRegistry",
+    "parameter_registry",
+    "project",
+    "record_ids",
+    "record_key",
+    "split_date_range",
     "timeit",
     "validate_kwarg",
+    "validate_params",
 ]
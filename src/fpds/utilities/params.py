@@ -2,20 +2,39 @@
 Utility functions related to FPDS request parameters
 
 author: derek663@gmail.com
-last_updated: 01/20/2024
+last_updated: 2026-10-18
 """
 
 import re
-from typing import Any, Dict, List, Optional, TypedDict, Union, cast
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypedDict,
+    cast,
+)
 
-from fpds.config import FPDS_FIELDS_CONFIG as FIELDS
+from fpds.config import load_fields_config
 from fpds.errors import (
     fpdsDuplicateParameterConfiguration,
     fpdsInvalidParameter,
+    fpdsInvalidParameterConfiguration,
     fpdsMismatchedParameterRegexError,
 )
 
 CONFIG_TYPE = List[Dict[str, Any]]
+CONFIG_KEYS = ("description", "name", "quotes", "regex")
+DATE_FORMAT = "%Y/%m/%d"
+DATE_RANGE_PATTERN = re.compile(
+    r"^\[\s*(\d{4}/\d{2}/\d{2})\s*,\s*(\d{4}/\d{2}/\d{2})\s*\]$"
+)
 
 
 class ParameterConfig(TypedDict):
@@ -26,9 +45,11 @@ class ParameterConfig(TypedDict):
 
 
 def get_search_param_from_config(
-    name: str, config: CONFIG_TYPE = FIELDS
+    name: str, config: Optional[CONFIG_TYPE] = None
 ) -> ParameterConfig:
-    """Finds the name of a kwarg in `fields.json`."""
+    """Finds the name of a kwarg in `config` (`fields.json` by default)."""
+    if config is None:
+        return parameter_registry()[name]
     field_config = [field for field in config if field.get("name") == name]
     if not field_config:
         raise fpdsInvalidParameter(name=name)
@@ -37,6 +58,14 @@ def get_search_param_from_config(
     return cast(ParameterConfig, field_config[0])
 
 
+@lru_cache(maxsize=None)
+def compile_literal_pattern(pattern: str) -> re.Pattern[str]:
+    """Compiles a regex pattern of `fields.json`, whose backslashes may be
+    escaped twice. See `constants/fields.json` for examples.
+    """
+    return re.compile(pattern.replace("\\\\", "\\"))
+
+
 def match_regex_with_literal_string_pattern(
     pattern: str,
     string: str,
@@ -48,21 +77,155 @@ def match_regex_with_literal_string_pattern(
     with double backslahes in JSON. See `constants/fields.json` for examples.
     """
     _string = str(string) if not isinstance(string, str) else string
-    raw_pattern = rf"{pattern}".replace("\\\\", "\\")
-    LITERAL_PATTERN = re.compile(raw_pattern)
-    match = LITERAL_PATTERN.match(_string)
-    return match
+    return compile_literal_pattern(pattern).match(_string)
+
+
+class fpdsParameterRegistry:
+    """Index of the search parameters of `fields.json`, built once.
+
+    Every entry is checked when the registry is built: duplicate names,
+    missing keys and patterns that don't compile are all reported at once
+    by raising `fpdsInvalidParameterConfiguration`. Lookups are then plain
+    dictionary lookups, and patterns are compiled ahead of time.
+
+    Example:
+    -------
+    >>> registry = parameter_registry()
+    >>> registry.validate("AGENCY_CODE", "7504")
+    '"7504"'
+    >>> registry.validate_many(
+    ...     {"AGENCY_CODE": code, "LAST_MOD_DATE": window}
+    ...     for code in agency_codes for window in windows
+    ... )
+
+    Attributes
+    ----------
+    config: `List[Dict[str, Any]]`
+        Defaults to the contents of `fields.json`.
+        Parameter entries, each with a description, name, quotes and regex.
+    """
+
+    def __init__(self, config: Optional[CONFIG_TYPE] = None) -> None:
+        if config is None:
+            config = load_fields_config()
+        self.parameters: Dict[str, ParameterConfig] = {}
+        self.patterns: Dict[str, re.Pattern[str]] = {}
+
+        problems = []
+        for position, entry in enumerate(config):
+            missing = [key for key in CONFIG_KEYS if key not in entry]
+            if missing:
+                label = entry.get("name", f"entry {position}")
+                problems.append(f"`{label}` is missing {missing}")
+                continue
+            name: str = entry["name"]
+            if name in self.parameters:
+                problems.append(f"`{name}` is configured more than once")
+                continue
+            try:
+                self.patterns[name] = compile_literal_pattern(entry["regex"])
+            except re.error as exc:
+                problems.append(f"`{name}` has an invalid regex: {exc}")
+                continue
+            self.parameters[name] = cast(ParameterConfig, entry)
+        if problems:
+            raise fpdsInvalidParameterConfiguration(problems=problems)
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.parameters
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.parameters)
 
+    def __getitem__(self, name: str) -> ParameterConfig:
+        try:
+            return self.parameters[name]
+        except KeyError:
+            raise fpdsInvalidParameter(name=name) from None
 
+    def validate(self, name: str, string: str) -> str:
+        """Validates a parameter value against its regex, returning the value
+        as used in a search (quoted if needed).
+        """
+        parameter = self[name]
+        _string = str(string) if not isinstance(string, str) else string
+        if not self.patterns[name].match(_string):
+            raise fpdsMismatchedParameterRegexError(
+                string=_string, pattern=parameter["regex"]
+            )
+        return f'"{_string}"' if parameter["quotes"] else _string
+
+    def validate_many(
+        self, queries: Iterable[Mapping[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Validates many sets of search parameters at once.
+
+        Generated queries (e.g. every agency for every date window) repeat
+        the same values many times over, so each distinct parameter value is
+        only validated once.
+        """
+        validated: Dict[Tuple[str, str], str] = {}
+        results = []
+        for query in queries:
+            result = {}
+            for name, value in query.items():
+                key = (name, value)
+                if key not in validated:
+                    validated[key] = self.validate(name, value)
+                result[name] = validated[key]
+            results.append(result)
+        return results
+
+
+@lru_cache(maxsize=None)
+def parameter_registry() -> fpdsParameterRegistry:
+    """The registry of `fields.json`, built on first use."""
+    return fpdsParameterRegistry()
+
+
+@lru_cache(maxsize=4096)
 def validate_kwarg(kwarg: str, string: str) -> str:
     """Validates a kwarg name and ensures value matches specified regex."""
-    obj = get_search_param_from_config(name=kwarg)
-    pattern = obj["regex"]
-    match = match_regex_with_literal_string_pattern(pattern=pattern, string=string)
+    return parameter_registry().validate(kwarg, string)
+
+
+def validate_params(queries: Iterable[Mapping[str, str]]) -> List[Dict[str, str]]:
+    """Validates many sets of search parameters at once. See
+    :meth:`fpdsParameterRegistry.validate_many`.
+    """
+    return parameter_registry().validate_many(queries)
+
+
+@lru_cache(maxsize=4096)
+def build_search_params(params: Tuple[Tuple[str, str], ...]) -> str:
+    """Search string of validated `(name, value)` pairs, e.g.
+    `AGENCY_CODE:"7504" LAST_MOD_DATE:[2022/01/01, 2022/05/01]`.
+    """
+    return " ".join(f"{name}:{value}" for name, value in params)
+
+
+def split_date_range(string: str, parts: int) -> List[str]:
+    """Splits a date range value, e.g. `[2022/01/01, 2022/05/01]`, into at
+    most `parts` contiguous, non-overlapping ranges of (nearly) equal length.
+    Both ends of a range are inclusive, like in FPDS.
+    """
+    match = DATE_RANGE_PATTERN.match(string)
     if not match:
-        raise fpdsMismatchedParameterRegexError(string=string, pattern=pattern)
+        raise ValueError(
+            f"`{string}` is not a date range like [2022/01/01, 2022/05/01]"
+        )
+    start, end = (datetime.strptime(value, DATE_FORMAT) for value in match.groups())
+    days = (end - start).days + 1
+    if days < 1:
+        raise ValueError(f"`{string}` ends before it starts")
 
-    if obj.get("quotes"):
-        return f'"{string}"'
-    else:
-        return string
+    parts = max(1, min(parts, days))
+    ranges = []
+    for idx in range(parts):
+        first = start + timedelta(days=days * idx // parts)
+        last = start + timedelta(days=days * (idx + 1) // parts - 1)
+        ranges.append(f"[{first:{DATE_FORMAT}}, {last:{DATE_FORMAT}}]")
+    return ranges
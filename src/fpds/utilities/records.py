@@ -0,0 +1,97 @@
+"""
+Utility functions for flattened FPDS records
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import re
+from functools import lru_cache
+from typing import Container, Dict, Hashable, Optional, Tuple
+
+from fpds.core import FPDS_ENTRY
+
+# identifier blocks of a record, e.g. `content__award__awardID__...` or
+# `content__IDV__contractID__...`
+RECORD_ID_PATTERN = re.compile(r"^content__[^_]+__[^_]*ID__")
+# fields of the award (or IDV) ID and of the IDV an award is ordered under, e.g.
+# `content__award__awardID__awardContractID__PIID`
+AWARD_ID_PATTERN = re.compile(
+    r"^content__[^_]+__[^_]*ID__(awardContractID|IDVID|referencedIDVID)__"
+    r"(agencyID|PIID|modNumber|transactionNumber)$"
+)
+
+
+def record_ids(record: FPDS_ENTRY) -> Tuple[Tuple[str, str], ...]:
+    """Non-blank items of the record's identifier block (agency ID, PIID,
+    modification and transaction numbers, referenced IDV...).
+    """
+    return tuple(
+        (key, value)
+        for key, value in record.items()
+        if RECORD_ID_PATTERN.match(key) and value.strip()
+    )
+
+
+def record_key(record: FPDS_ENTRY) -> Hashable:
+    """Key identifying a single contract action, e.g. for de-duplication.
+
+    Built from the contract type and the values of the record's identifier
+    block (see :func:`record_ids`). Records without one are keyed by all of
+    their items.
+    """
+    ids = record_ids(record)
+    if ids:
+        return (record.get("contract_type"), ids)
+    return tuple(record.items())
+
+
+@lru_cache(maxsize=4096)
+def _award_id_field(key: str) -> Optional[Tuple[str, str]]:
+    # records share their keys, so each is only matched once
+    match = AWARD_ID_PATTERN.match(key)
+    return (match.group(1), match.group(2)) if match else None
+
+
+def award_id(record: FPDS_ENTRY) -> Dict[str, str]:
+    """Fields of the record's award (or IDV) ID: `agencyID`, `PIID`,
+    `modNumber` and `transactionNumber`, plus `referencedPIID` for orders.
+    """
+    ids: Dict[str, str] = {}
+    for key, value in record.items():
+        # cheap test first; most keys aren't part of an ID block
+        match = _award_id_field(key) if "ID__" in key else None
+        if match is None:
+            continue
+        block, field = match
+        if block != "referencedIDVID":
+            ids[field] = value.strip()
+        elif field == "PIID":
+            ids["referencedPIID"] = value.strip()
+    return ids
+
+
+def project(record: FPDS_ENTRY, fields: Container[str]) -> FPDS_ENTRY:
+    """`record` with only the keys in `fields`, in the order of `record`. The
+    same as flattening the entry with `fields`.
+    """
+    return {key: value for key, value in record.items() if key in fields}
+
+
+def award_key(record: FPDS_ENTRY, ids: Optional[Dict[str, str]] = None) -> str:
+    """Key identifying a version of an award, for upserts.
+
+    Made of the award ID (agency ID and PIID, plus the PIID of the referenced
+    IDV for orders) and the modification and transaction numbers, e.g.
+    `4740:1B3G02670:PA09:0`. Records without an award ID fall back to
+    :func:`record_key`. `ids` can be passed if :func:`award_id` was already
+    called on the record.
+    """
+    if ids is None:
+        ids = award_id(record)
+    if not ids.get("PIID"):
+        return repr(record_key(record))
+    fields = ("agencyID", "PIID", "modNumber", "transactionNumber")
+    key = ":".join(ids.get(field, "") for field in fields)
+    referenced = ids.get("referencedPIID")
+    return f"{key}:{referenced}" if referenced else key
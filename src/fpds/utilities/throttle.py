@@ -0,0 +1,66 @@
+"""
+Utilities for throttling requests to the FPDS ATOM feed.
+
+author: derek663@gmail.com
+last_updated: 2026-10-18
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Caps how many requests per second may start.
+
+    Each call to :meth:`wait` reserves the next free slot, spaced
+    `1 / requests_per_second` seconds after the previous one, and sleeps until
+    it comes up. Reservations happen without yielding to the event loop, so
+    concurrent callers never share a slot.
+
+    Example:
+    -------
+    >>> limiter = RateLimiter(requests_per_second=5)
+    >>> await limiter.wait()
+
+    Attributes
+    ----------
+    requests_per_second: `Optional[float]`
+        Defaults to `None`.
+        Maximum request rate. `None` or `0` disables the limit.
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = None) -> None:
+        self.requests_per_second = requests_per_second
+        self._next_slot = 0.0
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<RateLimiter {self.requests_per_second} req/s>"
+
+    @property
+    def interval(self) -> float:
+        """Minimum number of seconds between two requests."""
+        if not self.requests_per_second:
+            return 0.0
+        return 1 / self.requests_per_second
+
+    async def wait(self) -> None:
+        """Waits until the next request is allowed to start."""
+        if not self.requests_per_second:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    """Seconds to wait before retry number `attempt` (starting at 0).
+
+    Uses exponential backoff with "full jitter": a random delay between 0
+    and `base * 2 ** attempt`, capped at `cap`, so that pages failing at the
+    same time don't retry in lockstep.
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
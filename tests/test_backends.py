@@ -0,0 +1,172 @@
+import os
+import pickle
+import warnings
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from fpds.benchmarks import fpdsFeedGenerator
+from fpds.core.backends import (
+    XML_BACKEND_VARIABLE,
+    _backend,
+    fpdsXMLBackend,
+    get_xml_backend,
+    set_xml_backend,
+)
+from fpds.core.executor import jsonify_page, timed_jsonify_page
+from fpds.core.xml import Entry, fpdsSubTree, fpdsTree, parse_page
+from tests import FULL_RESPONSE_DATA_BYTES, TRUNCATED_RESPONSE_DATA_BYTES
+
+FIELDS = frozenset(
+    [
+        "contract_type",
+        "modified",
+        "content__award__awardID__awardContractID__PIID",
+        "content__award__dollarValues__obligatedAmount",
+        "content__IDV__contractID__IDVID__PIID",
+    ]
+)
+# comments, processing instructions, CDATA, entities and duplicate siblings
+EDGE_CASES = (
+    b'<?xml version="1.0" encoding="UTF-8"?>'
+    b'<ns0:feed xmlns:ns0="http://www.w3.org/2005/Atom" '
+    b'xmlns:ns1="https://www.fpds.gov/FPDS"><!-- header -->'
+    b"<ns0:title>edge cases</ns0:title><?fpds ignored?>"
+    b"<ns0:entry><ns0:title><![CDATA[A & B <co>]]></ns0:title>"
+    b'<ns0:content type="application/xml"><ns1:award version="1.5">'
+    b"<ns1:awardID><ns1:PIID>1</ns1:PIID></ns1:awardID><!-- between -->"
+    b'<ns1:awardID extra="yes"><ns1:other>caf\xc3\xa9 &amp; &#169;</ns1:other>'
+    b"</ns1:awardID><ns1:empty/><ns1:blank>  </ns1:blank>"
+    b"</ns1:award></ns0:content></ns0:entry></ns0:feed>"
+)
+
+
+def parity_documents():
+    """Named pages every backend must flatten identically."""
+    documents = {
+        "full_response": FULL_RESPONSE_DATA_BYTES,
+        "truncated_response": TRUNCATED_RESPONSE_DATA_BYTES,
+        "edge_cases": EDGE_CASES,
+    }
+    for depth, idv_ratio, seed in ((0, 0.2, 0), (4, 0.5, 1), (1, 1.0, 2)):
+        generator = fpdsFeedGenerator(
+            entries=25, depth=depth, idv_ratio=idv_ratio, seed=seed
+        )
+        documents[f"synthetic_depth{depth}_idv{idv_ratio}"] = generator.page(10)
+    return documents
+
+
+def backend_records(content, backend):
+    """Everything `fpds.core.xml` derives from `content` with `backend`."""
+    tree = fpdsTree(content, backend=backend)
+    subtree = fpdsSubTree(backend=backend)
+    streamed = [
+        record
+        for start in range(0, len(content), 100)
+        for record in subtree.feed(content[start : start + 100])
+    ]
+    streamed += subtree.close()
+    return {
+        "namespace_dict": tree.namespace_dict,
+        "lower_limit": tree.lower_limit,
+        "jsonify": [list(record.items()) for record in tree.jsonify()],
+        "iterjsonify": [list(record.items()) for record in tree.iterjsonify()],
+        "stream": [list(record.items()) for record in streamed],
+        "fields": [list(record.items()) for record in tree.jsonify(fields=FIELDS)],
+        "entry": [
+            list(
+                Entry(element=element, namespace_dict=tree.namespace_dict)
+                .get_entry_data()
+                .items()
+            )
+            for element in tree.get_atom_feed_entries()
+        ],
+    }
+
+
+class TestXMLBackends(TestCase):
+    def setUp(self):
+        environ = patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop(XML_BACKEND_VARIABLE, None)
+        self.addCleanup(_backend.cache_clear)
+        _backend.cache_clear()
+
+    def test_stdlib(self):
+        backend = get_xml_backend("stdlib")
+        self.assertEqual(backend.name, "stdlib")
+        self.assertIs(get_xml_backend("stdlib"), backend)
+        self.assertEqual(
+            fpdsTree(FULL_RESPONSE_DATA_BYTES, backend="stdlib").backend, backend
+        )
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            get_xml_backend("expat")
+
+    def test_default(self):
+        self.assertEqual(get_xml_backend().name, "stdlib")
+        os.environ[XML_BACKEND_VARIABLE] = "auto"
+        self.assertEqual(get_xml_backend(), get_xml_backend("auto"))
+
+    def test_auto_prefers_lxml(self):
+        pytest.importorskip("lxml")
+        self.assertEqual(get_xml_backend("auto").name, "lxml")
+        self.assertIsInstance(get_xml_backend("lxml"), fpdsXMLBackend)
+
+    def test_fallback(self):
+        with patch("fpds.core.backends._import_lxml", side_effect=ImportError("no")):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                self.assertEqual(get_xml_backend("auto").name, "stdlib")
+            with pytest.warns(UserWarning, match="falling back"):
+                self.assertEqual(get_xml_backend("lxml").name, "stdlib")
+
+    def test_set_xml_backend(self):
+        backend = set_xml_backend("stdlib")
+        self.assertEqual(os.environ[XML_BACKEND_VARIABLE], "stdlib")
+        self.assertIs(get_xml_backend(), backend)
+        self.assertIs(fpdsTree(FULL_RESPONSE_DATA_BYTES).backend, backend)
+        with pytest.raises(ValueError):
+            set_xml_backend("expat")
+        self.assertEqual(os.environ[XML_BACKEND_VARIABLE], "stdlib")
+
+
+class TestXMLBackendParity(TestCase):
+    """Every backend yields the same records, in the same key order, as the
+    standard library, for every way of flattening a page.
+    """
+
+    def setUp(self):
+        pytest.importorskip("lxml")
+        environ = patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.documents = parity_documents()
+
+    def test_parity(self):
+        for name, content in self.documents.items():
+            expected = backend_records(content, "stdlib")
+            self.assertTrue(expected["jsonify"], name)
+            actual = backend_records(content, "lxml")
+            for key in expected:
+                with self.subTest(document=name, output=key):
+                    self.assertEqual(actual[key], expected[key])
+
+    def test_records_are_plain_strings(self):
+        records = fpdsTree(EDGE_CASES, backend="lxml").jsonify()
+        for value in records[0].values():
+            self.assertIs(type(value), str)
+        self.assertEqual(pickle.loads(pickle.dumps(records)), records)
+
+    def test_worker_functions(self):
+        for name, content in self.documents.items():
+            with self.subTest(document=name):
+                set_xml_backend("stdlib")
+                expected = jsonify_page(content)
+                set_xml_backend("lxml")
+                self.assertEqual(jsonify_page(content), expected)
+                self.assertEqual(timed_jsonify_page(content)[0], expected)
+                self.assertEqual(parse_page(content).records(), expected)
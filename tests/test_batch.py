@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from contextlib import aclosing
+
+from fpds import fpdsBatchRequest, fpdsRequest
+from fpds.core.executor import fpdsExecutor
+from tests.test_parser import MockServerTestCase
+from tests.utilities import ACTIVE, CONNECTIONS, REQUESTS
+
+AGENCY_CODES = ["7504", "7505", "7506", "7507", "7508"]
+LAST_MOD_DATE = "[2022/01/01, 2022/05/01]"
+
+
+class TestFpdsBatchRequest(MockServerTestCase):
+    latency = 0.01
+
+    def batch(self, **kwargs):
+        queries = {code: {"AGENCY_CODE": code} for code in AGENCY_CODES}
+        return fpdsBatchRequest(
+            queries, thread_count=4, LAST_MOD_DATE=LAST_MOD_DATE, **kwargs
+        )
+
+    async def test_records_are_tagged(self):
+        records = await self.batch().data()
+        self.assertEqual(list(records), AGENCY_CODES)
+        self.assertEqual([len(records[code]) for code in AGENCY_CODES], [30] * 5)
+
+    async def test_queries_without_tags(self):
+        batch = fpdsBatchRequest([{"AGENCY_CODE": "7504"}, {"AGENCY_CODE": "7505"}])
+        tags = {tag async for tag, _ in batch.iter_data()}
+        self.assertEqual(tags, {0, 1})
+
+    async def test_searches_share_session_and_limits(self):
+        executor = fpdsExecutor(kind="thread", max_workers=2)
+        self.addCleanup(executor.shutdown)
+        batch = self.batch(executor=executor)
+        records = [record async for record in batch.iter_data()]
+        self.assertEqual(len(records), 150)
+        # every first page is reused: 3 requests per search
+        self.assertEqual(len(self.app[REQUESTS]), 15)
+        self.assertLessEqual(self.app[ACTIVE][1], 4)
+        self.assertLessEqual(len(self.app[CONNECTIONS]), 4)
+        self.assertTrue(executor.started)
+
+    async def test_stops_reading_early(self):
+        batch = fpdsBatchRequest(
+            {code: {"AGENCY_CODE": code} for code in AGENCY_CODES},
+            LAST_MOD_DATE=LAST_MOD_DATE,
+        )
+
+        async def first():
+            records = batch.iter_data(max_pending=1)
+            async with aclosing(records):
+                async for tag, _ in records:
+                    # pages of the other searches fill the queue meanwhile
+                    await asyncio.sleep(0.5)
+                    return tag
+
+        self.assertIn(await asyncio.wait_for(first(), timeout=5), AGENCY_CODES)
+
+    async def test_session_matches_request_session(self):
+        batch = self.batch()
+        request = fpdsRequest(thread_count=4, AGENCY_CODE="7504")
+        async with batch.create_session() as ours, request.create_session() as theirs:
+            for connector in (ours.connector, theirs.connector):
+                self.assertEqual((connector.limit, connector.limit_per_host), (4, 4))
+
+
+class TestFpdsBatchRequestFailures(MockServerTestCase):
+    def setUp(self):
+        # the first search to request its first page gets a 503
+        self.failures = {0: 1}
+
+    async def test_failed_search_does_not_stop_others(self):
+        queries = {code: {"AGENCY_CODE": code} for code in AGENCY_CODES}
+        batch = fpdsBatchRequest(queries, retries=0, LAST_MOD_DATE=LAST_MOD_DATE)
+        records = await batch.data()
+        (failed,) = batch.errors
+        self.assertEqual(records[failed], [])
+        self.assertEqual(sum(len(value) for value in records.values()), 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
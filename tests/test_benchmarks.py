@@ -0,0 +1,103 @@
+import os
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+import pytest
+
+from fpds import fpdsRequest
+from fpds.benchmarks import fpdsFeedGenerator, serve_feed
+from fpds.benchmarks.server import ERRORS, REQUESTS
+from fpds.benchmarks.suite import BENCHMARKS, parse_args, run_benchmark
+from fpds.config import FPDS_URL_BASE, FPDS_URL_BASE_VARIABLE
+from fpds.core.xml import fpdsTree
+
+
+class TestFeedGenerator(TestCase):
+    def test_pages(self):
+        generator = fpdsFeedGenerator(entries=25)
+        self.assertEqual(generator.offsets, [0, 10, 20])
+        self.assertEqual(generator.last, 20)
+        pages = [fpdsTree(page) for page in generator.pages()]
+        self.assertEqual([len(page.jsonify()) for page in pages], [10, 10, 5])
+        self.assertEqual(pages[0].lower_limit, 20)
+
+    def test_single_page_has_no_last_link(self):
+        tree = fpdsTree(fpdsFeedGenerator(entries=5).page())
+        self.assertEqual(tree.lower_limit, 5)
+        self.assertEqual(len(tree.jsonify()), 5)
+
+    def test_deterministic(self):
+        generator = fpdsFeedGenerator(entries=30, seed=3)
+        self.assertEqual(generator.page(10), fpdsFeedGenerator(30, seed=3).page(10))
+        self.assertNotEqual(generator.page(10), fpdsFeedGenerator(30).page(10))
+
+    def test_idv_ratio(self):
+        def contract_types(idv_ratio):
+            generator = fpdsFeedGenerator(entries=200, idv_ratio=idv_ratio)
+            return [
+                record["contract_type"]
+                for page in generator.pages()
+                for record in fpdsTree(page).jsonify()
+            ]
+
+        self.assertEqual(set(contract_types(0)), {"AWARD"})
+        self.assertEqual(set(contract_types(1)), {"IDV"})
+        idvs = contract_types(0.3).count("IDV")
+        self.assertTrue(30 < idvs < 90, idvs)
+
+        with pytest.raises(ValueError):
+            fpdsFeedGenerator(idv_ratio=1.5)
+
+    def test_depth(self):
+        record = fpdsTree(fpdsFeedGenerator(entries=1, depth=3).page()).jsonify()[0]
+        nested = [key for key in record if "nested" in key]
+        self.assertEqual(len(nested), 3)
+        self.assertIn("content__award__nested1__nested2__nested3__value", record.keys())
+
+
+class TestServeFeed(IsolatedAsyncioTestCase):
+    async def test_data(self):
+        generator = fpdsFeedGenerator(entries=45)
+        async with serve_feed(generator) as app:
+            request = fpdsRequest(AGENCY_CODE="7504")
+            records = await request.data()
+        self.assertEqual(len(records), 45)
+        self.assertEqual(sorted(set(app[REQUESTS])), generator.offsets)
+
+    async def test_url_base(self):
+        with patch.dict(os.environ):
+            os.environ.pop(FPDS_URL_BASE_VARIABLE, None)
+            self.assertEqual(fpdsRequest(AGENCY_CODE="7504").url_base, FPDS_URL_BASE)
+            async with serve_feed(fpdsFeedGenerator(entries=5)):
+                url_base = fpdsRequest(AGENCY_CODE="7504").url_base
+                self.assertTrue(url_base.startswith("http://127.0.0.1:"))
+            self.assertNotIn(FPDS_URL_BASE_VARIABLE, os.environ)
+
+    async def test_error_injection(self):
+        generator = fpdsFeedGenerator(entries=50)
+        async with serve_feed(generator, error_rate=0.3, seed=1) as app:
+            request = fpdsRequest(retries=10, backoff=0.001, AGENCY_CODE="7504")
+            records = await request.data()
+        self.assertTrue(app[ERRORS])
+        self.assertEqual(len(records), 50)
+        self.assertFalse(request.failed_links)
+
+
+class TestSuite(TestCase):
+    def test_parse_args(self):
+        options = parse_args(["jsonify", "--entries", "20"])
+        self.assertEqual(options.benchmarks, ["jsonify"])
+        self.assertEqual(options.entries, 20)
+        with pytest.raises(SystemExit):
+            parse_args(["unknown"])
+
+    def test_run_benchmark(self):
+        options = parse_args(
+            ["--entries", "30", "--thread-count", "2", "--lookups", "10"]
+        )
+        for name in BENCHMARKS:
+            result = run_benchmark(name, options)
+            self.assertEqual((result.name, result.records), (name, 30))
+            self.assertGreater(result.records_per_second, 0)
+            if name in ("fetch", "data"):
+                self.assertEqual(result.details, "3 HTTP calls, 0 failed")
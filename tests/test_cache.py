@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import TestCase
+
+from fpds.core.cache import fpdsCache
+
+URL = "https://www.fpds.gov/ezsearch/FEEDS/ATOM?FEEDNAME=PUBLIC&q=AGENCY_CODE:7504"
+
+
+class TestFpdsCache(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self._class = fpdsCache(directory=self.directory)
+
+    def age(self, url, seconds):
+        """Pretends the response for `url` was written `seconds` ago."""
+        path = self._class.path(url)
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_miss(self):
+        self.assertIsNone(self._class.get(URL))
+        self.assertEqual(self._class.stats, {"hits": 0, "misses": 1, "size": 0})
+
+    def test_hit(self):
+        self._class.set(URL, b"<feed/>")
+        self.assertEqual(self._class.get(URL), b"<feed/>")
+        self.assertEqual(self._class.stats, {"hits": 1, "misses": 0, "size": 7})
+
+    def test_keyed_by_full_url(self):
+        self._class.set(f"{URL}&start=0", b"<feed/>")
+        self.assertIsNone(self._class.get(f"{URL}&start=10"))
+
+    def test_ttl(self):
+        cache = fpdsCache(directory=self.directory, ttl=60)
+        cache.set(URL, b"<feed/>")
+        self.age(URL, 30)
+        self.assertIsNotNone(cache.get(URL))
+        self.age(URL, 90)
+        self.assertIsNone(cache.get(URL))
+        self.assertFalse(cache.path(URL).exists())
+        self.assertEqual(cache.size, 0)
+
+    def test_lru_eviction(self):
+        cache = fpdsCache(directory=self.directory, max_size=25)
+        for start in (0, 10):
+            cache.set(f"{URL}&start={start}", b"0123456789")
+            self.age(f"{URL}&start={start}", 100 - start)
+        # reading page 0 makes page 10 the least recently used
+        cache.get(f"{URL}&start=0")
+        cache.set(f"{URL}&start=20", b"0123456789")
+        self.assertIsNotNone(cache.get(f"{URL}&start=0"))
+        self.assertIsNone(cache.get(f"{URL}&start=10"))
+        self.assertIsNotNone(cache.get(f"{URL}&start=20"))
+        self.assertEqual(cache.size, 20)
+
+    def test_size_is_persisted(self):
+        self._class.set(URL, b"<feed/>")
+        self.assertEqual(fpdsCache(directory=self.directory).size, 7)
+
+    def test_clear(self):
+        self._class.set(URL, b"<feed/>")
+        self._class.clear()
+        self.assertIsNone(self._class.get(URL))
+        self.assertEqual(self._class.size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
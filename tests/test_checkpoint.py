@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from fpds.core.checkpoint import fpdsCheckpoint, page_key, page_offset
+
+PARAMS = 'LAST_MOD_DATE:[2022/01/01, 2022/05/01] AGENCY_CODE:"7504"'
+LINKS = [
+    f"https://www.fpds.gov/ezsearch/FEEDS/ATOM?q={PARAMS}&start={n}"
+    for n in (0, 10, 20)
+]
+# the same offsets over a second date range, as for a sharded request
+SHARD_PARAMS = 'LAST_MOD_DATE:[2022/05/02, 2022/09/01] AGENCY_CODE:"7504"'
+SHARD_LINKS = [
+    f"https://www.fpds.gov/ezsearch/FEEDS/ATOM?q={SHARD_PARAMS}&start={n}"
+    for n in (0, 10, 20)
+]
+
+
+class TestPageOffset(TestCase):
+    def test_page_offset(self):
+        self.assertEqual([page_offset(link) for link in LINKS], [0, 10, 20])
+
+    def test_invalid_link(self):
+        with pytest.raises(ValueError):
+            page_offset("https://www.fpds.gov/ezsearch/FEEDS/ATOM")
+
+    def test_page_key(self):
+        keys = [page_key(link) for link in LINKS + SHARD_LINKS]
+        self.assertEqual(len(set(keys)), 6)
+        self.assertTrue(page_key(LINKS[1]).startswith("10-"))
+
+
+class TestFpdsCheckpoint(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self._class = fpdsCheckpoint(params=PARAMS, directory=Path(self.directory.name))
+
+    def test_empty_checkpoint(self):
+        self.assertEqual(self._class.completed(), set())
+        self.assertEqual(self._class.pending(LINKS), LINKS)
+        self.assertEqual(list(self._class.records()), [])
+
+    def test_save(self):
+        self._class.save(LINKS[2], [{"title": "c"}])
+        self._class.save(LINKS[0], [{"title": "a"}, {"title": "b"}])
+        self.assertEqual(
+            self._class.completed(), {page_key(LINKS[0]), page_key(LINKS[2])}
+        )
+        self.assertEqual(self._class.pending(LINKS), [LINKS[1]])
+        # records come back in page order
+        titles = [record["title"] for record in self._class.records()]
+        self.assertEqual(titles, ["a", "b", "c"])
+
+    def test_shards_do_not_overwrite_each_other(self):
+        self._class.save(LINKS[0], [{"title": "a"}])
+        self._class.save(SHARD_LINKS[0], [{"title": "b"}])
+        self.assertEqual(
+            self._class.pending(LINKS + SHARD_LINKS), LINKS[1:] + SHARD_LINKS[1:]
+        )
+        titles = sorted(record["title"] for record in self._class.records())
+        self.assertEqual(titles, ["a", "b"])
+
+    def test_checkpoints_are_per_request(self):
+        self._class.save(LINKS[0], [{"title": "a"}])
+        other = fpdsCheckpoint(
+            params='AGENCY_CODE:"7504"', directory=self._class.directory
+        )
+        self.assertEqual(other.pending(LINKS), LINKS)
+
+    def test_clear(self):
+        self._class.save(LINKS[0], [{"title": "a"}])
+        self._class.clear()
+        self.assertFalse(self._class.path.exists())
+        self.assertEqual(self._class.pending(LINKS), LINKS)
+
+
+if __name__ == "__main__":
+    unittest.main()
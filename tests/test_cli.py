@@ -1,9 +1,65 @@
+import gzip
+import json
+import tempfile
 import unittest
+from pathlib import Path
 from unittest import TestCase
+from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 from fpds.cli import cli
+from fpds.core.store import fpdsStore
+from fpds.core.writers import read_parquet
+
+LINKS = [f"https://www.fpds.gov/ezsearch/FEEDS/ATOM?start={n}" for n in (0, 10, 20)]
+
+
+class MockFpdsRequest(object):
+    """Stands in for `fpdsRequest`, serving 10 records per page of `LINKS`.
+
+    Like FPDS records, every value is a string.
+    """
+
+    interrupt_at = None
+    requested = []
+
+    def __init__(self, **kwargs):
+        self.links = LINKS
+        self.search_params = 'AGENCY_CODE:"7504"'
+        self.failed_links = []
+        self.store = kwargs.get("store")
+        self.stats = kwargs.get("stats")
+
+    @property
+    def page_count(self):
+        return len(self.links)
+
+    async def prepare(self):
+        pass
+
+    async def iter_pages(self, links=None, fields=None):
+        for link in self.links if links is None else links:
+            if link == self.interrupt_at:
+                raise ConnectionResetError
+            self.requested.append(link)
+            records = [{"link": link, "index": str(idx)} for idx in range(10)]
+            # like `fpdsRequest`, whole records are stored
+            if self.store is not None:
+                self.store.write(records)
+            if fields is not None:
+                records = [
+                    {key: value for key, value in record.items() if key in fields}
+                    for record in records
+                ]
+            if self.stats is not None:
+                self.stats.parsed(link, 0.0, 0.0, len(records))
+            yield link, records
+
+    async def data(self, fields=None):
+        pages = self.iter_pages(fields=fields)
+        return [record async for _, records in pages for record in records]
 
 
 class TestFpdsCLI(TestCase):
@@ -23,5 +79,182 @@ class TestFpdsCLI(TestCase):
         self.assertIn("does not match regex", result.__str__())
 
 
+class MockRequestTestCase(TestCase):
+    """Invokes `fpds parse` with `MockFpdsRequest` and a temporary directory."""
+
+    def setUp(self):
+        self.runner = CliRunner()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+        patchers = [
+            patch("fpds.core.parser.fpdsRequest", MockFpdsRequest),
+            patch(
+                "fpds.core.checkpoint.FPDS_CHECKPOINT_DIR",
+                self.directory / "checkpoints",
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        MockFpdsRequest.requested = []
+
+    def invoke(self, *options):
+        args = ["parse", "AGENCY_CODE=7504", "-o", str(self.directory / "out")]
+        return self.runner.invoke(cli, [*args, *options])
+
+
+class TestFpdsCLICheckpoint(MockRequestTestCase):
+    def test_resume_skips_completed_pages(self):
+        MockFpdsRequest.interrupt_at = LINKS[2]
+        result = self.invoke("-c")
+        self.assertIsInstance(result.exception, ConnectionResetError)
+        self.assertEqual(MockFpdsRequest.requested, LINKS[:2])
+
+        MockFpdsRequest.interrupt_at = None
+        MockFpdsRequest.requested = []
+        result = self.invoke("-r")
+        self.assertIn("skipping 2 already completed page(s)", result.output)
+        self.assertEqual(MockFpdsRequest.requested, LINKS[2:])
+
+        (output_file,) = (self.directory / "out").glob("*.json")
+        with open(output_file) as infile:
+            records = json.load(infile)
+        self.assertEqual([record["link"] for record in records[::10]], LINKS)
+        # a successful run cleans up after itself
+        self.assertEqual(list((self.directory / "checkpoints").iterdir()), [])
+
+    def test_checkpoint_without_resume_starts_over(self):
+        MockFpdsRequest.interrupt_at = LINKS[2]
+        self.invoke("-c")
+
+        MockFpdsRequest.interrupt_at = None
+        MockFpdsRequest.requested = []
+        self.invoke("-c")
+        self.assertEqual(MockFpdsRequest.requested, LINKS)
+
+
+class TestFpdsCLIJsonLines(MockRequestTestCase):
+    def read_lines(self, pattern, opener=open):
+        (output_file,) = (self.directory / "out").glob(pattern)
+        with opener(output_file, "rt") as infile:
+            return [json.loads(line) for line in infile]
+
+    def test_jsonl(self):
+        result = self.invoke("-f", "jsonl")
+        self.assertIn("30 record(s) have been saved as JSONL", result.output)
+        records = self.read_lines("*.jsonl")
+        self.assertEqual(len(records), 30)
+        self.assertEqual(records[0], {"link": LINKS[0], "index": "0"})
+
+    def test_jsonl_gzip(self):
+        self.invoke("-f", "jsonl", "--compression", "gzip")
+        self.assertEqual(len(self.read_lines("*.jsonl.gz", gzip.open)), 30)
+
+    def test_jsonl_zstd(self):
+        zstandard = pytest.importorskip("zstandard")
+        self.invoke("-f", "jsonl", "--compression", "zstd")
+        self.assertEqual(len(self.read_lines("*.jsonl.zst", zstandard.open)), 30)
+
+    def test_jsonl_resume(self):
+        MockFpdsRequest.interrupt_at = LINKS[1]
+        self.invoke("-f", "jsonl", "-c")
+        MockFpdsRequest.interrupt_at = None
+        self.invoke("-f", "jsonl", "-r")
+        records = self.read_lines("*.jsonl")
+        self.assertEqual([record["link"] for record in records[::10]], LINKS)
+
+    def test_compression_requires_jsonl_or_parquet(self):
+        result = self.invoke("--compression", "gzip")
+        self.assertIn("--compression requires --format jsonl", result.output)
+        result = self.invoke("-f", "jsonl", "--compression", "snappy")
+        self.assertIn("isn't supported for jsonl", result.output)
+
+    def test_parquet(self):
+        pytest.importorskip("pyarrow")
+        result = self.invoke("-f", "parquet", "--row-group-size", "5")
+        self.assertIn("30 record(s) have been saved as PARQUET", result.output)
+        (output_dir,) = (self.directory / "out").glob("*.parquet")
+        rows = read_parquet(output_dir).to_pylist()
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(rows[0], {"link": LINKS[0], "index": "0"})
+
+
+class TestFpdsCLIStore(MockRequestTestCase):
+    def test_store(self):
+        path = self.directory / "records.db"
+        result = self.invoke("--store", str(path))
+        self.assertIn(f"30 record(s) in the store at: {path}", result.output)
+        # running the search again updates the same records
+        self.invoke("--store", str(path), "-f", "jsonl")
+        with fpdsStore(path) as store:
+            self.assertEqual(len(store), 30)
+
+    def test_checkpointed_run_is_stored(self):
+        MockFpdsRequest.interrupt_at = LINKS[2]
+        self.invoke("-c")
+        MockFpdsRequest.interrupt_at = None
+
+        path = self.directory / "records.db"
+        self.invoke("-r", "--store", str(path))
+        with fpdsStore(path) as store:
+            self.assertEqual(len(store), 30)
+
+
+class TestFpdsCLIFields(MockRequestTestCase):
+    def read_json(self):
+        (output_file,) = (self.directory / "out").glob("*.json")
+        with open(output_file) as infile:
+            return json.load(infile)
+
+    def test_fields(self):
+        self.invoke("--fields", "index")
+        records = self.read_json()
+        self.assertEqual(len(records), 30)
+        self.assertEqual(records[0], {"index": "0"})
+
+    def test_repeated_fields(self):
+        self.invoke("--fields", "index", "--fields", "link,missing")
+        self.assertEqual(set(self.read_json()[0]), {"index", "link"})
+
+    def test_checkpoint_depends_on_fields(self):
+        MockFpdsRequest.interrupt_at = LINKS[2]
+        self.invoke("-c", "--fields", "index")
+        MockFpdsRequest.interrupt_at = None
+
+        MockFpdsRequest.requested = []
+        result = self.invoke("-r", "--fields", "link")
+        self.assertNotIn("skipping", result.output)
+        self.assertEqual(MockFpdsRequest.requested, LINKS)
+
+    def test_store_keeps_whole_records(self):
+        path = self.directory / "records.db"
+        for args in ((), ("-c",)):
+            with self.subTest(args=args):
+                path.unlink(missing_ok=True)
+                self.invoke("--fields", "index", "--store", str(path), *args)
+                self.assertEqual(self.read_json()[0], {"index": "0"})
+                for json_file in (self.directory / "out").glob("*.json"):
+                    json_file.unlink()
+                with fpdsStore(path) as store:
+                    self.assertEqual(len(store), 30)
+                    (record,) = store.query(limit=1)
+                    self.assertEqual(set(record), {"link", "index"})
+
+
+class TestFpdsCLIStats(MockRequestTestCase):
+    def test_stats(self):
+        for output_format in ("json", "jsonl"):
+            result = self.invoke("--stats", "-f", output_format)
+            self.assertIn("Stats:\n3 page(s), 0 failed", result.output)
+            self.assertIn("30 record(s)", result.output)
+            self.assertIn("serialize", result.output)
+
+    def test_no_stats(self):
+        result = self.invoke()
+        self.assertNotIn("Stats:", result.output)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import TestCase
+
+from fpds import fpdsRequest
+from fpds.core.compact import fpdsKeyTable, fpdsRecord
+from fpds.core.xml import fpdsTree
+from fpds.utilities import award_key, record_key
+from tests import FULL_RESPONSE_DATA_BYTES
+from tests.test_parser import FPDS_REQUEST_PARAMS_DICT, MockServerTestCase
+
+OBLIGATED = "content__award__dollarValues__obligatedAmount"
+SIGNED = "content__award__relevantContractDates__signedDate"
+SMALL_BUSINESS = (
+    "content__award__vendor__vendorSiteDetails__vendorSocioEconomicIndicators"
+    "__isSmallBusiness"
+)
+
+
+class TestFpdsKeyTable(TestCase):
+    def setUp(self):
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+        self.table = fpdsKeyTable()
+
+    def test_round_trip(self):
+        for coerce in (False, True):
+            for record in self.records:
+                compact = self.table.compact(record, coerce=coerce)
+                self.assertEqual(compact.to_dict(), record)
+                self.assertEqual(list(compact.to_dict()), list(record))
+                self.assertEqual(compact, record)
+
+    def test_mapping(self):
+        record = self.records[0]
+        compact = self.table.compact(record)
+        self.assertEqual(len(compact), len(record))
+        self.assertEqual(list(compact), list(record))
+        self.assertEqual(compact["title"], record["title"])
+        self.assertIn("title", compact)
+        self.assertIsNone(compact.get("missing"))
+        with self.assertRaises(KeyError):
+            compact["missing"]
+        self.assertEqual(record_key(compact), record_key(record))
+        self.assertEqual(award_key(compact), award_key(record))
+
+    def test_schemas_are_shared(self):
+        # records parsed separately have distinct, but equal, key strings
+        first, second = (
+            self.table.compact(record)
+            for record in (
+                self.records[0],
+                fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()[0],
+            )
+        )
+        self.assertIs(first.schema, second.schema)
+        self.assertFalse(hasattr(first, "__dict__"))
+        # keys are interned, so they are shared across schemas too
+        others = [self.table.compact(record) for record in self.records]
+        self.assertIs(others[-1].schema.keys[0], first.schema.keys[0])
+        self.assertLess(len(self.table), len(self.records))
+
+    def test_coerce(self):
+        record = self.table.compact(self.records[0], coerce=True)
+        self.assertEqual(record[OBLIGATED], Decimal("8392.90"))
+        self.assertEqual(record[SIGNED], datetime(2012, 10, 1))
+        self.assertIs(record[SMALL_BUSINESS], False)
+        # `N`/`Y` codes and identifiers are left alone
+        self.assertIsInstance(
+            record["content__award__awardID__awardContractID__PIID"], str
+        )
+
+    def test_coerce_keeps_unparsable_values(self):
+        record = dict(self.records[0])
+        record[OBLIGATED] = "n/a"
+        record[SIGNED] = "2012-10-01"
+        compact = self.table.compact(record, coerce=True)
+        self.assertEqual(compact[OBLIGATED], "n/a")
+        self.assertEqual(compact[SIGNED], "2012-10-01")
+        self.assertEqual(compact.to_dict(), record)
+
+
+class TestFpdsRequestCompact(MockServerTestCase):
+    async def test_compact_data(self):
+        records = await fpdsRequest(**FPDS_REQUEST_PARAMS_DICT).data()
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        compact = await request.data(compact=True)
+        self.assertTrue(all(isinstance(record, fpdsRecord) for record in compact))
+        self.assertEqual([record.to_dict() for record in compact], records)
+
+    async def test_coerced_data(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        records = await request.data(coerce=True, fields=[OBLIGATED])
+        self.assertEqual(len(records), 30)
+        self.assertTrue(all(isinstance(r[OBLIGATED], Decimal) for r in records))
+
+    async def test_schemas_are_scoped_to_a_call(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        first = await request.data(compact=True)
+        second = await request.data(compact=True)
+        # every page serves the same records
+        self.assertIs(first[0].schema, first[10].schema)
+        self.assertIsNot(first[0].schema, second[0].schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
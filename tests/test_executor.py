@@ -0,0 +1,73 @@
+import os
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import pytest
+
+from fpds.core.executor import (
+    available_cpus,
+    default_executor,
+    fpdsExecutor,
+    jsonify_page,
+)
+from tests import FULL_RESPONSE_DATA_BYTES
+
+
+class TestAvailableCpus(TestCase):
+    def test_available_cpus(self):
+        cpus = available_cpus()
+        self.assertGreaterEqual(cpus, 1)
+        self.assertLessEqual(cpus, len(os.sched_getaffinity(0)))
+
+
+class TestFpdsExecutor(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.records = jsonify_page(FULL_RESPONSE_DATA_BYTES)
+
+    def test_invalid_kind(self):
+        with pytest.raises(ValueError):
+            fpdsExecutor(kind="fiber")
+
+    def test_default_size(self):
+        self.assertEqual(fpdsExecutor().max_workers, available_cpus())
+
+    def test_is_inline(self):
+        executor = fpdsExecutor(inline_threshold=2)
+        self.assertTrue(executor.is_inline(2))
+        self.assertFalse(executor.is_inline(3))
+        self.assertTrue(fpdsExecutor(kind="inline").is_inline(100))
+
+    async def test_parse(self):
+        for kind in ("process", "thread", "inline"):
+            with fpdsExecutor(kind=kind, max_workers=2) as executor:
+                records = await executor.parse(FULL_RESPONSE_DATA_BYTES)
+                self.assertEqual(records, self.records)
+                self.assertEqual(executor.started, kind != "inline")
+
+    async def test_parse_fields(self):
+        fields = frozenset(["contract_type", "modified"])
+        expected = [
+            {key: record[key] for key in ("modified", "contract_type")}
+            for record in self.records
+        ]
+        for kind in ("process", "thread", "inline"):
+            with fpdsExecutor(kind=kind, max_workers=2) as executor:
+                records = await executor.parse(FULL_RESPONSE_DATA_BYTES, fields=fields)
+                self.assertEqual(records, expected)
+
+    async def test_inline_parse_does_not_start_pool(self):
+        executor = fpdsExecutor(kind="thread")
+        records = await executor.parse(FULL_RESPONSE_DATA_BYTES, inline=True)
+        self.assertEqual(records, self.records)
+        self.assertFalse(executor.started)
+
+    async def test_pool_is_reused_until_shutdown(self):
+        executor = fpdsExecutor(kind="thread", max_workers=2)
+        await executor.parse(FULL_RESPONSE_DATA_BYTES)
+        pool = executor.pool
+        await executor.parse(FULL_RESPONSE_DATA_BYTES)
+        self.assertIs(executor.pool, pool)
+        executor.shutdown()
+        self.assertFalse(executor.started)
+
+    def test_default_executor(self):
+        self.assertIs(default_executor(), default_executor())
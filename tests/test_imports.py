@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict
+from unittest import TestCase
+
+# modules only needed once records are requested
+HEAVY_MODULES = (
+    "aiohttp",
+    "asyncio",
+    "concurrent.futures.process",
+    "fpds.core.parser",
+    "multiprocessing",
+    "tqdm",
+)
+
+
+class TestImportTime(TestCase):
+    """Keeps `import fpds` and `fpds --help` cheap and free of side effects."""
+
+    # generous budgets, in microseconds, to absorb slow CI runners
+    IMPORT_BUDGET = 150_000
+    HELP_BUDGET = 500_000
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.home = Path(directory.name)
+
+    def run_python(self, code: str, *options: str) -> subprocess.CompletedProcess:
+        env = dict(os.environ, HOME=str(self.home))
+        return subprocess.run(
+            [sys.executable, *options, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+
+    def import_times(self, code: str) -> Dict[str, int]:
+        """Cumulative import time of each top-level import made by `code`
+        (after interpreter startup), from `python -X importtime`.
+        """
+        stderr = self.run_python(code, "-X", "importtime").stderr
+        times: Dict[str, int] = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if name.startswith(" fpds") or times:
+                if not name.startswith("  "):
+                    times[name.strip()] = int(cumulative)
+        return times
+
+    def test_import_fpds(self):
+        times = self.import_times("import fpds")
+        self.assertLess(sum(times.values()), self.IMPORT_BUDGET, times)
+
+    def test_help(self):
+        times = self.import_times("from fpds.cli import cli; cli(['--help'])")
+        self.assertLess(sum(times.values()), self.HELP_BUDGET, times)
+
+    def test_heavy_modules_are_lazy(self):
+        code = (
+            "import sys, fpds, fpds.cli; "
+            f"print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        self.assertEqual(self.run_python(code).stdout.strip(), "")
+        loaded = self.run_python(
+            "import sys, fpds; fpds.fpdsRequest; print(*sys.modules)"
+        )
+        self.assertIn("fpds.core.parser", loaded.stdout.split())
+
+    def test_import_has_no_side_effects(self):
+        self.run_python("import fpds, fpds.cli")
+        self.assertFalse((self.home / ".fpds").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
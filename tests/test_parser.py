@@ -1,16 +1,35 @@
+import asyncio
+import tempfile
 import unittest
-from unittest import TestCase
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import PropertyMock, patch
 from xml.etree.ElementTree import ElementTree, fromstring
 
 import pytest
+from aiohttp.test_utils import TestServer
 
 from fpds import fpdsRequest
+from fpds.core.cache import fpdsCache
+from fpds.core.executor import fpdsExecutor
+from fpds.core.mixins import fpdsMixin
+from fpds.core.stats import fpdsStats
 from fpds.errors import (
     fpdsInvalidParameter,
     fpdsMismatchedParameterRegexError,
     fpdsMissingKeywordParameterError,
 )
 from tests import FULL_RESPONSE_DATA_BYTES
+from tests.utilities import (
+    ACTIVE,
+    CONNECTIONS,
+    REQUESTS,
+    TIMESTAMPS,
+    build_page,
+    mock_dated_fpds_application,
+    mock_fpds_application,
+)
 
 # valid params and values
 FPDS_REQUEST_PARAMS_DICT = {
@@ -78,5 +97,350 @@ class TestFpdsRequest(TestCase):
         self.assertEqual(FPDS_SEARCH_PARAMS_PROPERTY, self._class.search_params)
 
 
+class MockServerTestCase(IsolatedAsyncioTestCase):
+    """Runs `fpdsRequest` against a local mock of the ATOM feed."""
+
+    last = 20
+    latency = 0.0
+    delays = None
+    failures = None
+
+    def application(self):
+        return mock_fpds_application(
+            FULL_RESPONSE_DATA_BYTES,
+            last=self.last,
+            latency=self.latency,
+            delays=self.delays,
+            failures=self.failures,
+        )
+
+    async def asyncSetUp(self):
+        self.app = self.application()
+        self.server = TestServer(self.app)
+        await self.server.start_server()
+
+        url_base = f"{self.server.make_url('/')}?FEEDNAME=PUBLIC"
+        patchers = [
+            patch.object(
+                fpdsMixin, "url_base", new_callable=PropertyMock, return_value=url_base
+            ),
+            patch.object(
+                fpdsRequest,
+                "initial_request",
+                return_value=build_page(FULL_RESPONSE_DATA_BYTES, 0, self.last),
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    @staticmethod
+    def page_of(record):
+        """Page offset a record was served from; see `build_page`."""
+        return int(record["title"][1:].split("]")[0])
+
+
+class TestFpdsRequestIterData(MockServerTestCase):
+    last = 90
+    # the second page is the slowest to arrive
+    delays = {10: 0.2}
+
+    async def test_iter_data(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        records = [record async for record in request.iter_data()]
+        self.assertEqual(len(records), 100)
+        self.assertEqual(sorted(self.app[REQUESTS]), list(range(0, 100, 10)))
+
+    async def test_iter_data_yields_before_all_pages_arrive(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        records = [record async for record in request.iter_data()]
+        # pages are yielded as they finish, so the slow second page comes last
+        self.assertEqual(self.page_of(records[-1]), 10)
+
+    async def test_iter_data_ordered(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        records = [record async for record in request.iter_data(ordered=True)]
+        pages = [self.page_of(record) for record in records]
+        self.assertEqual(pages, sorted(pages))
+        self.assertEqual(len(records), 100)
+
+    async def test_iter_data_max_pending(self):
+        """Downloads stall once `max_pending` pages are waiting on the consumer."""
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        generator = request.iter_data(ordered=True, max_pending=3)
+        await generator.__anext__()
+        await asyncio.sleep(0.1)
+        self.assertLessEqual(len(self.app[REQUESTS]), 3)
+        await generator.aclose()
+
+
+class TestFpdsRequestPrepare(MockServerTestCase):
+    async def test_construction_does_not_request(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        self.assertFalse(request.prepared)
+        self.assertEqual(self.app[REQUESTS], [])
+
+    async def test_create(self):
+        request = await fpdsRequest.create(**FPDS_REQUEST_PARAMS_DICT)
+        self.assertTrue(request.prepared)
+        self.assertEqual(request.page_count, 3)
+        self.assertEqual(self.app[REQUESTS], [0])
+
+    async def test_first_page_is_not_downloaded_twice(self):
+        request = await fpdsRequest.create(**FPDS_REQUEST_PARAMS_DICT)
+        records = await request.data()
+        self.assertEqual(len(records), 30)
+        self.assertEqual(sorted(self.app[REQUESTS]), [0, 10, 20])
+
+    async def test_fetch_reuses_first_page(self):
+        request = await fpdsRequest.create(**FPDS_REQUEST_PARAMS_DICT)
+        pages = await request.fetch()
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(sorted(self.app[REQUESTS]), [0, 10, 20])
+
+    async def test_links_require_prepare_in_event_loop(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        for attribute in ("links", "page_count"):
+            with self.subTest(attribute=attribute):
+                with self.assertRaisesRegex(RuntimeError, "prepare"):
+                    getattr(request, attribute)
+        self.assertFalse(request.prepared)
+        fpdsRequest.initial_request.assert_not_called()
+
+    async def test_first_page_from_initial_request_is_reused(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        # outside of the event loop the first page is retrieved on access
+        page_count = await asyncio.to_thread(lambda: request.page_count)
+        self.assertEqual(page_count, 3)
+        await request.fetch()
+        self.assertEqual(sorted(self.app[REQUESTS]), [10, 20])
+
+    async def test_single_page_makes_one_request(self):
+        request = fpdsRequest(page=1, **FPDS_REQUEST_PARAMS_DICT)
+        records = await request.data()
+        self.assertEqual(len(records), 10)
+        self.assertEqual(self.app[REQUESTS], [0])
+
+    async def test_shared_session(self):
+        request = fpdsRequest(**FPDS_REQUEST_PARAMS_DICT)
+        async with request.create_session() as session:
+            await request.prepare(session=session)
+            records = [record async for record in request.iter_data(session=session)]
+            self.assertFalse(session.closed)
+        self.assertEqual(len(records), 30)
+
+
+class TestFpdsRequestConcurrency(MockServerTestCase):
+    last = 290
+    latency = 0.02
+
+    async def test_thread_count_limits_concurrent_requests(self):
+        request = fpdsRequest(thread_count=4, **FPDS_REQUEST_PARAMS_DICT)
+        pages = await request.fetch()
+        self.assertEqual(len(pages), 30)
+        self.assertEqual(self.app[ACTIVE][1], 4)
+
+    async def test_connections_are_reused(self):
+        request = fpdsRequest(thread_count=4, **FPDS_REQUEST_PARAMS_DICT)
+        records = [record async for record in request.iter_data()]
+        self.assertEqual(len(records), 300)
+        self.assertLessEqual(self.app[ACTIVE][1], 4)
+        self.assertLessEqual(len(self.app[CONNECTIONS]), 4)
+
+    async def test_requests_per_second(self):
+        request = fpdsRequest(
+            thread_count=10, requests_per_second=50, **FPDS_REQUEST_PARAMS_DICT
+        )
+        await request.fetch()
+        timestamps = self.app[TIMESTAMPS]
+        # 30 requests spaced 20ms apart take at least 29 intervals
+        self.assertGreaterEqual(timestamps[-1] - timestamps[0], 29 * 0.02 * 0.9)
+
+
+class TestFpdsRequestRetries(MockServerTestCase):
+    def setUp(self):
+        # page 10 fails twice before succeeding, page 20 keeps failing
+        self.failures = {10: 2, 20: 100}
+
+    def request(self, **kwargs):
+        return fpdsRequest(backoff=0.001, **kwargs, **FPDS_REQUEST_PARAMS_DICT)
+
+    async def test_transient_failures_are_retried(self):
+        request = self.request(retries=3)
+        with pytest.warns(UserWarning, match="1 page"):
+            result = await request.fetch()
+        self.assertEqual(self.app[REQUESTS].count(10), 3)
+        self.assertEqual(len(result), 2)
+        self.assertFalse(result.ok)
+
+    async def test_failed_links_are_reported(self):
+        request = self.request(retries=1)
+        with pytest.warns(UserWarning):
+            result = await request.fetch()
+        self.assertEqual(self.app[REQUESTS].count(20), 2)
+        self.assertEqual(result.failed_links, [request.links[1], request.links[2]])
+        self.assertEqual(request.failed_links, result.failed_links)
+        self.assertEqual(result.failures[request.links[2]].status, 503)
+
+    async def test_retries_are_counted(self):
+        stats = fpdsStats()
+        request = self.request(retries=3, stats=stats)
+        with pytest.warns(UserWarning):
+            await request.data()
+        transient, failed = (stats.pages[link] for link in request.links[1:])
+        self.assertEqual((transient.retries, transient.error), (2, None))
+        self.assertEqual(failed.retries, 3)
+        self.assertIn("503", failed.error)
+        self.assertEqual(stats.summary()["retries"], 5)
+
+    async def test_rerun_failed_links(self):
+        request = self.request(retries=0)
+        with pytest.warns(UserWarning):
+            records = [record async for record in request.iter_data()]
+        self.assertEqual(len(records), 10)
+        self.assertEqual(len(request.failed_links), 2)
+
+        self.failures.update({10: 0, 20: 0})
+        self.app[REQUESTS].clear()
+        records = [
+            record async for record in request.iter_data(links=request.failed_links)
+        ]
+        self.assertEqual(len(records), 20)
+        self.assertEqual(sorted(self.app[REQUESTS]), [10, 20])
+        self.assertEqual(request.failed_links, [])
+
+    async def test_client_errors_are_not_retried(self):
+        request = self.request(retries=3)
+        request.links = [f"{request.initial_url.split('?')[0]}missing"]
+        with pytest.warns(UserWarning):
+            result = await request.fetch()
+        self.assertEqual(result.failures[request.links[0]].status, 404)
+
+
+class TestFpdsRequestTimeouts(MockServerTestCase):
+    delays = {10: 1.0}
+
+    async def test_page_timeout(self):
+        request = fpdsRequest(retries=0, page_timeout=0.2, **FPDS_REQUEST_PARAMS_DICT)
+        with pytest.warns(UserWarning):
+            result = await request.fetch()
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.failed_links, [request.links[1]])
+
+    async def test_total_timeout(self):
+        request = fpdsRequest(total_timeout=0.2, **FPDS_REQUEST_PARAMS_DICT)
+        with pytest.warns(UserWarning):
+            records = [record async for record in request.iter_data()]
+        self.assertEqual(len(records), 20)
+        self.assertEqual(request.failed_links, [request.links[1]])
+
+
+class TestFpdsRequestExecutor(MockServerTestCase):
+    async def test_executor_is_shared_across_requests(self):
+        executor = fpdsExecutor(kind="thread", max_workers=2, inline_threshold=0)
+        self.addCleanup(executor.shutdown)
+        for _ in range(2):
+            request = fpdsRequest(executor=executor, **FPDS_REQUEST_PARAMS_DICT)
+            self.assertEqual(len(await request.data()), 30)
+            pool = executor.pool
+        self.assertIs(executor.pool, pool)
+
+    async def test_small_queries_are_parsed_inline(self):
+        executor = fpdsExecutor(kind="process", inline_threshold=3)
+        request = fpdsRequest(executor=executor, **FPDS_REQUEST_PARAMS_DICT)
+        self.assertEqual(len(await request.data()), 30)
+        self.assertFalse(executor.started)
+
+
+class TestFpdsRequestShards(MockServerTestCase):
+    """A feed of 95 records, one a day from 2022/01/01."""
+
+    def setUp(self):
+        self.everywhere = set()
+
+    def application(self):
+        dates = [date(2022, 1, 1) + timedelta(days=day) for day in range(95)]
+        return mock_dated_fpds_application(
+            FULL_RESPONSE_DATA_BYTES, dates, everywhere=self.everywhere
+        )
+
+    @staticmethod
+    def piids(records):
+        key = "content__award__awardID__awardContractID__PIID"
+        return sorted(record[key] for record in records)
+
+    def test_shard_requests(self):
+        request = fpdsRequest(shards=3, **FPDS_REQUEST_PARAMS_DICT)
+        self.assertEqual(request.shard_by, "LAST_MOD_DATE")
+        self.assertEqual(
+            [shard.kwargs["LAST_MOD_DATE"] for shard in request.shard_requests()],
+            [
+                "[2022/01/01, 2022/02/09]",
+                "[2022/02/10, 2022/03/21]",
+                "[2022/03/22, 2022/05/01]",
+            ],
+        )
+
+    def test_shards_require_date_range(self):
+        with pytest.raises(ValueError):
+            fpdsRequest(shards=3, AGENCY_CODE="7504")
+        with pytest.raises(ValueError):
+            fpdsRequest(shards=3, page=1, **FPDS_REQUEST_PARAMS_DICT)
+        # accepted by the LAST_MOD_DATE regex, but can't be split
+        with pytest.raises(ValueError, match="is not a date range"):
+            fpdsRequest(shards=3, LAST_MOD_DATE="[2022/01/01,)", AGENCY_CODE="7504")
+
+    async def test_shards_match_unsplit_query(self):
+        records = await fpdsRequest(**FPDS_REQUEST_PARAMS_DICT).data()
+        unsplit_offsets = list(self.app[REQUESTS])
+        self.app[REQUESTS].clear()
+
+        request = fpdsRequest(shards=4, **FPDS_REQUEST_PARAMS_DICT)
+        sharded = await request.data()
+        self.assertEqual(len(records), 95)
+        self.assertEqual(self.piids(sharded), self.piids(records))
+        # each shard paginates on its own, so offsets stay shallow
+        self.assertEqual(max(unsplit_offsets), 90)
+        self.assertLessEqual(max(self.app[REQUESTS]), 20)
+        self.assertEqual(request.page_count, 10)
+
+    async def test_shards_are_deduplicated(self):
+        # a record every shard returns, e.g. modified during the download
+        self.everywhere.add(0)
+        request = fpdsRequest(shards=4, **FPDS_REQUEST_PARAMS_DICT)
+        pages = await request.fetch()
+        self.assertEqual(sum(len(page.jsonify()) for page in pages), 98)
+        self.assertEqual(len(self.piids(await request.data())), 95)
+
+    async def test_projected_shards(self):
+        self.everywhere.add(0)
+        request = fpdsRequest(shards=4, **FPDS_REQUEST_PARAMS_DICT)
+        key = "content__award__awardID__awardContractID__PIID"
+        records = await request.data(fields=[key])
+        self.assertEqual(self.piids(records), self.piids(await request.data()))
+        # records left without identifiers look alike, so none are dropped
+        records = await request.data(fields=["contract_type"])
+        self.assertEqual(records, [{"contract_type": "AWARD"}] * 98)
+
+
+class TestFpdsRequestCache(MockServerTestCase):
+    async def test_pages_are_served_from_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = fpdsCache(directory=Path(directory.name))
+
+        request = fpdsRequest(cache=cache, **FPDS_REQUEST_PARAMS_DICT)
+        records = await request.data()
+        self.assertEqual(len(self.app[REQUESTS]), 3)
+
+        request = fpdsRequest(cache=cache, **FPDS_REQUEST_PARAMS_DICT)
+        self.assertEqual(await request.data(), records)
+        self.assertEqual(len(self.app[REQUESTS]), 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+
 if __name__ == "__main__":
     unittest.main()
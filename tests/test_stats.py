@@ -0,0 +1,115 @@
+import json
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from fpds import fpdsRequest
+from fpds.benchmarks import fpdsFeedGenerator, serve_feed
+from fpds.core.executor import fpdsExecutor
+from fpds.core.stats import fpdsStats, percentile
+
+
+class TestFpdsStats(TestCase):
+    def setUp(self):
+        self.stats = fpdsStats()
+        for index, seconds in enumerate((0.1, 0.2, 0.3, 0.4)):
+            link = f"start={index * 10}"
+            self.stats.downloaded(link, seconds, 1000, retries=index % 2)
+            self.stats.parsed(link, seconds / 10, seconds / 20, 10)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 0.5), 0.0)
+        self.assertEqual(percentile([3.0, 1.0, 2.0], 0.5), 2.0)
+        self.assertEqual(percentile([float(n) for n in range(1, 101)], 0.95), 95.0)
+
+    def test_summary(self):
+        summary = self.stats.summary()
+        self.assertEqual(
+            {key: summary[key] for key in ("pages", "failed", "retries", "bytes")},
+            {"pages": 4, "failed": 0, "retries": 2, "bytes": 4000},
+        )
+        self.assertEqual(summary["records"], 40)
+        self.assertAlmostEqual(summary["download"]["total"], 1.0)
+        self.assertAlmostEqual(summary["download"]["max"], 0.4)
+        self.assertAlmostEqual(summary["parse"]["mean"], 0.025)
+        self.assertNotIn("serialize", summary)
+
+    def test_hooks_and_failures(self):
+        pages = []
+        stats = fpdsStats(hooks=[pages.append])
+        stats.downloaded("start=0", 0.1, 100)
+        self.assertEqual(pages, [])
+        stats.parsed("start=0", 0.01, 0.02, 10)
+        stats.failed("start=10", ConnectionResetError())
+        self.assertEqual([page.link for page in pages], ["start=0", "start=10"])
+        self.assertEqual(pages[1].error, "ConnectionResetError()")
+        self.assertEqual(stats.summary()["failed"], 1)
+
+    def test_rename(self):
+        self.stats.rename("start=0", "first")
+        self.assertEqual(self.stats.pages["first"].link, "first")
+        self.assertNotIn("start=0", self.stats.pages)
+
+    def test_stage(self):
+        with self.stats.stage("serialize"):
+            pass
+        with self.stats.stage("serialize"):
+            pass
+        self.assertIn("serialize", self.stats.summary())
+        self.assertIn("serialize", self.stats.report())
+
+    def test_log(self):
+        stats = fpdsStats(log=True)
+        with self.assertLogs("fpds.stats", level="INFO") as logs:
+            stats.parsed("start=0", 0.01, 0.02, 10)
+            stats.finish()
+        page, summary = logs.records
+        self.assertEqual(page.fpds["records"], 10)
+        self.assertEqual(json.loads(page.getMessage().split(" ", 1)[1])["records"], 10)
+        self.assertEqual(summary.fpds["pages"], 1)
+
+    def test_report(self):
+        report = self.stats.report()
+        self.assertIn("4 page(s), 0 failed, 0 cached, 2 retried request(s)", report)
+        self.assertIn("40 record(s)", report)
+        for stage in ("download", "parse", "flatten"):
+            self.assertIn(stage, report)
+
+
+class TestRequestStats(IsolatedAsyncioTestCase):
+    async def test_data(self):
+        generator = fpdsFeedGenerator(entries=45)
+        for kind in ("inline", "thread", "process"):
+            with self.subTest(kind=kind), fpdsExecutor(kind=kind) as executor:
+                stats = fpdsStats()
+                async with serve_feed(generator):
+                    request = fpdsRequest(
+                        stats=stats, executor=executor, AGENCY_CODE="7504"
+                    )
+                    records = await request.data()
+                self.assertEqual(sorted(stats.pages), sorted(request.links))
+                summary = stats.summary()
+                self.assertEqual(summary["records"], len(records))
+                self.assertEqual(summary["pages"], 5)
+                self.assertGreater(summary["bytes"], 0)
+                for page in stats.pages.values():
+                    self.assertGreater(page.size, 0)
+                    self.assertGreater(page.download_seconds, 0)
+                    self.assertGreater(page.parse_seconds, 0)
+                    self.assertGreater(page.flatten_seconds, 0)
+
+    async def test_retries(self):
+        stats = fpdsStats()
+        async with serve_feed(fpdsFeedGenerator(entries=50), error_rate=0.3, seed=1):
+            request = fpdsRequest(
+                stats=stats, retries=10, backoff=0.001, AGENCY_CODE="7504"
+            )
+            await request.data()
+        self.assertGreater(stats.summary()["retries"], 0)
+
+    async def test_fetch(self):
+        pages = []
+        stats = fpdsStats(hooks=[pages.append])
+        async with serve_feed(fpdsFeedGenerator(entries=25)):
+            request = fpdsRequest(stats=stats, AGENCY_CODE="7504")
+            await request.fetch()
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(stats.summary()["records"], 0)
@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import TestCase
+
+from fpds import fpdsRequest
+from fpds.core.store import fpdsStore
+from fpds.core.xml import fpdsTree
+from fpds.utilities import award_key
+from tests import FULL_RESPONSE_DATA_BYTES
+from tests.test_parser import FPDS_REQUEST_PARAMS_DICT, MockServerTestCase
+
+PIID = "content__award__awardID__awardContractID__PIID"
+
+
+class StoreTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "records.db"
+        self.store = fpdsStore(self.path)
+        self.addCleanup(self.store.close)
+
+
+class TestFpdsStore(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+        self.store.write(self.records)
+
+    def test_get(self):
+        record = self.records[0]
+        self.assertEqual(self.store.get(award_key(record)), record)
+        self.assertIsNone(self.store.get("missing"))
+
+    def test_upsert(self):
+        record = dict(self.records[0], modified="2022-01-01 00:00:00")
+        self.assertEqual(self.store.write([record]), 1)
+        self.assertEqual(len(self.store), 10)
+        self.assertEqual(self.store.get(award_key(record)), record)
+
+    def test_query(self):
+        records = list(self.store.query(piid="AZ000200206CP0302AZ0036GS07F0087K"))
+        self.assertEqual(len(records), 3)
+        records = list(
+            self.store.query(
+                piid="AZ000200206CP0302AZ0036GS07F0087K", mod_number="PA01"
+            )
+        )
+        self.assertEqual(records, [self.records[8]])
+        self.assertEqual(self.store.count(agency_id="4740"), 10)
+        self.assertEqual(self.store.count(contract_type="IDV"), 0)
+        self.assertEqual(len(list(self.store.query(limit=4))), 4)
+
+    def test_query_signed_dates(self):
+        signed = "content__award__relevantContractDates__signedDate"
+        day = date.fromisoformat(self.records[0][signed][:10])
+        expected = [
+            record for record in self.records if record[signed][:10] == str(day)
+        ]
+        records = list(self.store.query(signed_from=day, signed_to=day))
+        self.assertEqual(
+            sorted(record[PIID] for record in records),
+            sorted(record[PIID] for record in expected),
+        )
+
+    def test_lookups_use_indexes(self):
+        plan = self.store.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT record FROM records WHERE piid = ?", ("x",)
+        ).fetchall()
+        self.assertIn("USING INDEX records_piid", plan[0][-1])
+
+    def test_records_persist(self):
+        self.store.close()
+        with fpdsStore(self.path) as store:
+            self.assertEqual(len(store), 10)
+
+
+class TestFpdsRequestStore(MockServerTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = fpdsStore(Path(directory.name) / "records.db")
+        self.addCleanup(self.store.close)
+
+    async def test_pages_are_stored(self):
+        request = fpdsRequest(store=self.store, **FPDS_REQUEST_PARAMS_DICT)
+        records = await request.data()
+        self.assertEqual(len(records), 30)
+        # every page serves the same 10 records
+        self.assertEqual(len(self.store), 10)
+
+    async def test_projected_pages_are_stored_whole(self):
+        fields = {PIID, "contract_type"}
+        request = fpdsRequest(store=self.store, **FPDS_REQUEST_PARAMS_DICT)
+        records = await request.data(fields=fields)
+        expected = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify(fields=fields)
+        self.assertEqual(
+            [list(record.items()) for record in records[:10]],
+            [list(record.items()) for record in expected],
+        )
+        # modifications of an award don't overwrite each other
+        self.assertEqual(len(self.store), 10)
+        rows = self.store.connection.execute(
+            "SELECT mod_number, agency_id FROM records"
+        ).fetchall()
+        self.assertTrue(all(None not in row for row in rows), rows)
+        full = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+        stored = self.store.get(award_key(full[0]))
+        self.assertEqual(list(stored), list(full[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
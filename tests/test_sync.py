@@ -0,0 +1,118 @@
+import json
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from fpds import fpdsSync
+from tests import FULL_RESPONSE_DATA_BYTES
+from tests.test_parser import MockServerTestCase
+from tests.utilities import REQUESTS, mock_dated_fpds_application
+
+
+class TestFpdsSync(MockServerTestCase):
+    """A feed of 120 records, newest first: one an hour back from
+    2022/03/10 23:00.
+    """
+
+    dates = [datetime(2022, 3, 10, 23) - timedelta(hours=hour) for hour in range(120)]
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def application(self):
+        return mock_dated_fpds_application(FULL_RESPONSE_DATA_BYTES, self.dates)
+
+    def sync(self, **kwargs):
+        return fpdsSync(directory=self.directory, AGENCY_CODE="7504", **kwargs)
+
+    def test_arguments(self):
+        with pytest.raises(ValueError):
+            self.sync().window()
+        with pytest.raises(ValueError):
+            self.sync(LAST_MOD_DATE="[2022/01/01, 2022/05/01]")
+        sync = self.sync(since=date(2022, 1, 1))
+        self.assertEqual(
+            sync.window(today=date(2022, 5, 1)), "[2022/01/01, 2022/05/01]"
+        )
+
+    async def test_first_sync(self):
+        sync = self.sync(since=date(2022, 1, 1))
+        self.assertEqual(await sync.run(), 120)
+        self.assertEqual(sync.high_water_mark, "2022-03-10 23:00:00")
+        self.assertEqual(len(sync.records()), 120)
+        self.assertEqual(len(self.app[REQUESTS]), 12)
+
+    async def test_only_changes_are_downloaded(self):
+        sync = self.sync()
+        sync.save_state(high_water_mark="2022-03-10 12:00:00")
+        self.assertEqual(
+            sync.window(today=date(2022, 5, 1)), "[2022/03/10, 2022/05/01]"
+        )
+        # 12 changes since the mark, out of the 24 records of its day
+        self.assertEqual(await sync.run(), 12)
+        self.assertEqual(sorted(self.app[REQUESTS]), [0, 10, 20])
+        self.assertEqual(sync.high_water_mark, "2022-03-10 23:00:00")
+
+    async def test_paging_stops_at_mark(self):
+        sync = self.sync(thread_count=1, stop_early=True)
+        sync.save_state(high_water_mark="2022-03-10 20:00:00")
+        self.assertEqual(await sync.run(), 4)
+        # the first page runs into records older than the mark
+        self.assertNotIn(20, self.app[REQUESTS])
+
+    async def test_upserts(self):
+        sync = self.sync(since=date(2022, 1, 1))
+        await sync.run()
+        # the record at the mark is synced again
+        self.assertEqual(await sync.run(), 1)
+        self.assertEqual(len(sync.records()), 120)
+        with open(sync.records_file) as infile:
+            self.assertEqual(len(infile.readlines()), 121)
+
+        sync.compact()
+        with open(sync.records_file) as infile:
+            lines = [json.loads(line) for line in infile]
+        self.assertEqual(len(lines), 120)
+        self.assertEqual(sync.state()["params"], 'AGENCY_CODE:"7504"')
+
+
+class TestFpdsSyncUnordered(MockServerTestCase):
+    """The same feed shuffled, like the ATOM feed, which isn't sorted by
+    `modified`.
+    """
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def application(self):
+        dates = list(TestFpdsSync.dates)
+        random.Random(0).shuffle(dates)
+        return mock_dated_fpds_application(FULL_RESPONSE_DATA_BYTES, dates)
+
+    def sync(self, **kwargs):
+        sync = fpdsSync(directory=self.directory, AGENCY_CODE="7504", **kwargs)
+        sync.save_state(high_water_mark="2022-03-10 12:00:00")
+        return sync
+
+    async def test_every_change_is_synced(self):
+        sync = self.sync()
+        self.assertEqual(await sync.run(), 12)
+        self.assertEqual(sync.high_water_mark, "2022-03-10 23:00:00")
+
+    async def test_stop_early_checks_order(self):
+        sync = self.sync(thread_count=1, stop_early=True)
+        with pytest.warns(UserWarning, match="isn't ordered"):
+            self.assertEqual(await sync.run(), 12)
+        self.assertEqual(sorted(self.app[REQUESTS]), [0, 10, 20])
+        self.assertEqual(sync.high_water_mark, "2022-03-10 23:00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from unittest import TestCase
+
+import pytest
+
+from fpds.core.xml import fpdsTree
+from fpds.errors import (
+    fpdsInvalidParameter,
+    fpdsInvalidParameterConfiguration,
+    fpdsMismatchedParameterRegexError,
+)
+from fpds.utilities import (
+    award_key,
+    build_search_params,
+    fpdsParameterRegistry,
+    parameter_registry,
+    record_key,
+    split_date_range,
+    validate_kwarg,
+    validate_params,
+)
+from tests import FULL_RESPONSE_DATA_BYTES
+
+
+class TestSplitDateRange(TestCase):
+    def test_split(self):
+        self.assertEqual(
+            split_date_range("[2022/01/01, 2022/01/10]", 3),
+            [
+                "[2022/01/01, 2022/01/03]",
+                "[2022/01/04, 2022/01/06]",
+                "[2022/01/07, 2022/01/10]",
+            ],
+        )
+
+    def test_more_parts_than_days(self):
+        self.assertEqual(
+            split_date_range("[2022/01/01,2022/01/02]", 5),
+            ["[2022/01/01, 2022/01/01]", "[2022/01/02, 2022/01/02]"],
+        )
+
+    def test_invalid_range(self):
+        with pytest.raises(ValueError):
+            split_date_range("2022/01/01", 2)
+        with pytest.raises(ValueError):
+            split_date_range("[2022/01/02, 2022/01/01]", 2)
+
+
+class TestParameterRegistry(TestCase):
+    def test_bundled_config(self):
+        registry = parameter_registry()
+        self.assertEqual(len(registry), 100)
+        self.assertIs(parameter_registry(), registry)
+        self.assertEqual(registry["AGENCY_CODE"]["description"], "Agency Code")
+        self.assertEqual(
+            registry.validate("REASON_NOT_COMP_DESCRIPTION", "Urgency (FAR 6.302-2)"),
+            '"Urgency (FAR 6.302-2)"',
+        )
+
+    def test_validate(self):
+        registry = parameter_registry()
+        self.assertEqual(registry.validate("AGENCY_CODE", "7504"), '"7504"')
+        self.assertEqual(validate_kwarg("AGENCY_CODE", "7504"), '"7504"')
+        with pytest.raises(fpdsInvalidParameter):
+            registry.validate("NOT_A_PARAMETER", "7504")
+        with pytest.raises(fpdsMismatchedParameterRegexError):
+            registry.validate("AGENCY_CODE", "75044")
+
+    def test_validate_many(self):
+        queries = [
+            {
+                "AGENCY_CODE": code,
+                "LAST_MOD_DATE": f"[2022/0{month}/01, 2022/0{month}/28]",
+            }
+            for code in ("7504", "4740")
+            for month in range(1, 4)
+        ]
+        validated = validate_params(queries)
+        self.assertEqual(len(validated), 6)
+        self.assertEqual(
+            validated[0],
+            {"AGENCY_CODE": '"7504"', "LAST_MOD_DATE": "[2022/01/01, 2022/01/28]"},
+        )
+        with pytest.raises(fpdsMismatchedParameterRegexError):
+            validate_params([*queries, {"AGENCY_CODE": "75044"}])
+
+    def test_problems_are_reported_at_load_time(self):
+        config = [
+            {"description": "A", "name": "A", "quotes": True, "regex": ".*"},
+            {"description": "A", "name": "A", "quotes": True, "regex": ".*"},
+            {"description": "B", "name": "B", "quotes": True},
+            {"description": "C", "name": "C", "quotes": True, "regex": "(C"},
+        ]
+        with pytest.raises(fpdsInvalidParameterConfiguration) as info:
+            fpdsParameterRegistry(config)
+        self.assertEqual(len(info.value.problems), 3)
+        self.assertIn("`A` is configured more than once", info.value.problems)
+
+    def test_build_search_params(self):
+        self.assertEqual(
+            build_search_params((("AGENCY_CODE", '"7504"'), ("PIID", "0002"))),
+            'AGENCY_CODE:"7504" PIID:0002',
+        )
+
+
+class TestRecordKey(TestCase):
+    def setUp(self):
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+
+    def test_records_have_distinct_keys(self):
+        keys = {record_key(record) for record in self.records}
+        self.assertEqual(len(keys), len(self.records))
+
+    def test_key_ignores_non_identifying_fields(self):
+        record = dict(self.records[0], title="modified title")
+        self.assertEqual(record_key(record), record_key(self.records[0]))
+        record["content__award__awardID__awardContractID__modNumber"] = "PA10"
+        self.assertNotEqual(record_key(record), record_key(self.records[0]))
+
+    def test_records_without_identifiers(self):
+        self.assertEqual(record_key({"title": "a"}), record_key({"title": "a"}))
+        self.assertNotEqual(record_key({"title": "a"}), record_key({"title": "b"}))
+
+
+class TestAwardKey(TestCase):
+    def setUp(self):
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+
+    def test_key(self):
+        self.assertEqual(award_key(self.records[0]), "4740:1B3G02670:PA09:0")
+        # orders include the PIID of their IDV
+        self.assertEqual(
+            award_key(self.records[2]), "4740:1B3L02518:PA03:0:GS00P95BSD0006"
+        )
+
+    def test_records_have_distinct_keys(self):
+        keys = {award_key(record) for record in self.records}
+        self.assertEqual(len(keys), len(self.records))
+
+    def test_new_versions_share_key(self):
+        record = dict(self.records[0], modified="2022-01-01 00:00:00")
+        self.assertEqual(award_key(record), award_key(self.records[0]))
+
+    def test_records_without_identifiers(self):
+        self.assertEqual(award_key({"title": "a"}), repr(record_key({"title": "a"})))
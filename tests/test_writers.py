@@ -0,0 +1,93 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from fpds.core.writers import (
+    fpdsJsonLinesWriter,
+    fpdsParquetWriter,
+    jsonl_filename,
+    open_compressed,
+    read_parquet,
+)
+from fpds.core.xml import fpdsTree
+from tests import FULL_RESPONSE_DATA_BYTES
+
+
+class TestFpdsJsonLinesWriter(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+
+    def test_write(self):
+        path = self.directory / jsonl_filename("records")
+        with fpdsJsonLinesWriter(path) as writer:
+            writer.write(self.records)
+            # each write is flushed, so the file is readable mid-run
+            with open(path) as infile:
+                self.assertEqual(len(infile.readlines()), len(self.records))
+            writer.write(self.records)
+        self.assertEqual(writer.count, 2 * len(self.records))
+        with open(path) as infile:
+            records = [json.loads(line) for line in infile]
+        self.assertEqual(records, 2 * self.records)
+
+    def test_write_gzip(self):
+        path = self.directory / jsonl_filename("records", "gzip")
+        self.assertEqual(path.name, "records.jsonl.gz")
+        with fpdsJsonLinesWriter(path, compression="gzip") as writer:
+            writer.write(self.records)
+        with gzip.open(path, "rt") as infile:
+            records = [json.loads(line) for line in infile]
+        self.assertEqual(records, self.records)
+
+    def test_invalid_compression(self):
+        with pytest.raises(ValueError):
+            open_compressed(self.directory / "records", "bz2")
+
+
+class TestFpdsParquetWriter(TestCase):
+    def setUp(self):
+        pytest.importorskip("pyarrow")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "records.parquet"
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+
+    def read_records(self):
+        rows = read_parquet(self.path).to_pylist()
+        return [{k: v for k, v in row.items() if v is not None} for row in rows]
+
+    def test_write(self):
+        with fpdsParquetWriter(self.path, row_group_size=4) as writer:
+            writer.write(self.records)
+        self.assertEqual(writer.count, len(self.records))
+        self.assertEqual(self.read_records(), self.records)
+
+    def test_row_group_size(self):
+        import pyarrow.parquet as pq
+
+        with fpdsParquetWriter(self.path, row_group_size=3) as writer:
+            writer.write(self.records[:1])
+            writer.write(self.records[:1])
+            writer.write(self.records[:1])
+            writer.write(self.records[:1])
+        (part,) = writer.parts
+        self.assertEqual(pq.ParquetFile(part).metadata.num_row_groups, 2)
+
+    def test_schema_grows_with_new_keys(self):
+        with fpdsParquetWriter(self.path, row_group_size=1) as writer:
+            writer.write([{"a": "1"}])
+            writer.write([{"b": "2", "a": "3"}])
+            writer.write([{"b": "4"}])
+        self.assertEqual(len(writer.parts), 2)
+        self.assertEqual(writer.columns, ["a", "b"])
+        self.assertEqual(
+            read_parquet(self.path).to_pylist(),
+            [{"a": "1", "b": None}, {"a": "3", "b": "2"}, {"a": None, "b": "4"}],
+        )
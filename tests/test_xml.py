@@ -1,7 +1,21 @@
-from unittest import TestCase
+import pickle
+from unittest import IsolatedAsyncioTestCase, TestCase
 from xml.etree.ElementTree import ElementTree
 
-from fpds.core.xml import fpdsElement, fpdsTree
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from fpds.core.xml import (
+    Entry,
+    EntryFlattener,
+    fpdsElement,
+    fpdsRecordBatch,
+    fpdsStreamParser,
+    fpdsSubTree,
+    fpdsTree,
+    parse_page,
+)
+from fpds.utilities import project
 from tests import FULL_RESPONSE_DATA_BYTES, TRUNCATED_RESPONSE_DATA_BYTES
 
 FPDS_REQUEST_PARAMS_DICT = {
@@ -29,6 +43,27 @@ class TestFpdsTree(TestCase):
         namespace_dict = self._class.namespace_dict
         self.assertEqual(namespace_dict, TEST_NAMESPACE_DICT)
 
+    def test_namespace_dict_cached(self):
+        self.assertIs(self._class.namespace_dict, self._class.namespace_dict)
+        self.assertIs(self._class.flattener, self._class.flattener)
+
+    def test_namespace_regex_pattern(self):
+        pattern = self._class.NAMESPACE_REGEX_PATTERN
+        self.assertEqual(
+            pattern, r"\{(http://www.w3.org/2005/Atom|https://www.fpds.gov/FPDS)\}"
+        )
+        element = self._class.get_atom_feed_entries()[0]
+        entry = fpdsElement(element=element, namespace_dict=self._class.namespace_dict)
+        self.assertIs(entry.namespace_regex, self._class.namespace_regex)
+
+    def test_content_invalidates_cache(self):
+        namespace_dict = self._class.namespace_dict
+        flattener = self._class.flattener
+        self._class.content = TRUNCATED_RESPONSE_DATA_BYTES
+        self.assertIsNot(self._class.namespace_dict, namespace_dict)
+        self.assertIsNot(self._class.flattener, flattener)
+        self.assertEqual(self._class.lower_limit, 1)
+
     def test_lower_limit(self):
         total = self._class.lower_limit
         self.assertEqual(total, 20)
@@ -62,3 +97,228 @@ class TestFpdsElement(TestCase):
         xml = fpdsTree(content=FULL_RESPONSE_DATA_BYTES)
         element = xml.get_atom_feed_entries()[0]
         self._class = fpdsElement(content=element)
+
+
+class TestEntryFlattener(TestCase):
+    """Parity checks between `EntryFlattener` and `Entry.get_entry_data`."""
+
+    def setUp(self):
+        self.tree = fpdsTree(content=FULL_RESPONSE_DATA_BYTES)
+        self.namespace_dict = self.tree.namespace_dict
+        self.entries = self.tree.get_atom_feed_entries()
+        self._class = EntryFlattener(namespace_dict=self.namespace_dict)
+
+    def legacy(self, element):
+        return Entry(element=element, namespace_dict=self.namespace_dict)
+
+    def test_parity_with_entry(self):
+        for element in self.entries:
+            expected = self.legacy(element).get_entry_data()
+            self.assertEqual(self._class(element), expected)
+
+    def test_parity_key_order(self):
+        for element in self.entries:
+            expected = self.legacy(element).get_entry_data()
+            self.assertEqual(list(self._class(element)), list(expected))
+
+    def test_parity_truncated_response(self):
+        tree = fpdsTree(content=TRUNCATED_RESPONSE_DATA_BYTES)
+        flattener = EntryFlattener(namespace_dict=tree.namespace_dict)
+        for element in tree.get_atom_feed_entries():
+            expected = Entry(
+                element=element, namespace_dict=tree.namespace_dict
+            ).get_entry_data()
+            self.assertEqual(list(flattener(element).items()), list(expected.items()))
+
+    def test_contract_type(self):
+        for element in self.entries:
+            record = self._class(element)
+            self.assertEqual(
+                record["contract_type"], self.legacy(element).contract_type
+            )
+
+    def test_jsonify_parity(self):
+        expected = [self.legacy(element).get_entry_data() for element in self.entries]
+        self.assertEqual(self.tree.jsonify(), expected)
+
+    def test_clean_tag_cached(self):
+        tag = self.entries[0].tag
+        self.assertEqual(self._class.clean_tag(tag), "entry")
+        self.assertIn(tag, self._class._clean_tags)
+
+    def test_duplicate_sibling_tags(self):
+        """The last sibling with a repeated name wins, as it does in `Entry`."""
+        xml = fpdsTree(content=FULL_RESPONSE_DATA_BYTES)
+        element = xml.get_atom_feed_entries()[0]
+        content = element.find(".//ns0:content", xml.namespace_dict)
+        award = list(content)[0]
+        duplicate = xml.backend.fromstring(
+            b'<ns1:awardID xmlns:ns1="https://www.fpds.gov/FPDS" extra="yes">'
+            b"<ns1:other>value</ns1:other></ns1:awardID>"
+        )
+        award.append(duplicate)
+        expected = Entry(
+            element=element, namespace_dict=xml.namespace_dict
+        ).get_entry_data()
+        flattener = EntryFlattener(namespace_dict=xml.namespace_dict)
+        self.assertEqual(list(flattener(element).items()), list(expected.items()))
+
+
+class TestFieldProjection(TestCase):
+    FIELDS = [
+        "title",
+        "contract_type",
+        "content__award__awardID__awardContractID__PIID",
+        "content__award__awardID__awardContractID__agencyID__name",
+        "content__award__dollarValues__obligatedAmount",
+    ]
+
+    def setUp(self):
+        self.tree = fpdsTree(content=FULL_RESPONSE_DATA_BYTES)
+        self.expected = [
+            {key: value for key, value in record.items() if key in self.FIELDS}
+            for record in self.tree.jsonify()
+        ]
+
+    def test_jsonify(self):
+        records = self.tree.jsonify(fields=self.FIELDS)
+        # same keys, in the same order, as the full records
+        self.assertEqual(
+            [list(r.items()) for r in records], [list(r.items()) for r in self.expected]
+        )
+        self.assertEqual(len(records[0]), 5)
+
+    def test_iterjsonify(self):
+        records = list(self.tree.iterjsonify(fields=self.FIELDS))
+        self.assertEqual(records, self.expected)
+
+    def test_parse_page(self):
+        batch = parse_page(FULL_RESPONSE_DATA_BYTES, frozenset(self.FIELDS))
+        self.assertEqual(batch.records(), self.expected)
+
+    def test_only_contributing_subtrees_are_walked(self):
+        element = self.tree.get_atom_feed_entries()[0]
+        full = EntryFlattener(namespace_dict=self.tree.namespace_dict)
+        projected = EntryFlattener(
+            namespace_dict=self.tree.namespace_dict, fields=self.FIELDS
+        )
+        hierarchy, _ = projected.hierarchy(element)
+        self.assertLess(len(hierarchy), 12)
+        self.assertGreater(len(full.hierarchy(element)[0]), 200)
+
+    def test_key_order_matches_projected_records(self):
+        # `title`, the first tag of every entry, isn't walked, so `modified`
+        # is the first one that is
+        fields = ["modified", *self.FIELDS[1:]]
+        for content in (FULL_RESPONSE_DATA_BYTES, TRUNCATED_RESPONSE_DATA_BYTES):
+            tree = fpdsTree(content=content)
+            expected = [
+                list(project(record, fields).items()) for record in tree.jsonify()
+            ]
+            for records in (
+                tree.jsonify(fields=fields),
+                tree.iterjsonify(fields=fields),
+            ):
+                with self.subTest(records=type(records).__name__):
+                    self.assertEqual([list(r.items()) for r in records], expected)
+
+    def test_contract_type_alone(self):
+        records = self.tree.jsonify(fields=["contract_type"])
+        self.assertEqual(records, [{"contract_type": "AWARD"}] * 10)
+
+    def test_unknown_fields(self):
+        self.assertEqual(self.tree.jsonify(fields=["missing"]), [{}] * 10)
+
+
+class TestFpdsStreamParser(TestCase):
+    def setUp(self):
+        self.expected = fpdsTree(content=FULL_RESPONSE_DATA_BYTES).jsonify()
+
+    def test_iterjsonify_parity(self):
+        tree = fpdsTree(content=FULL_RESPONSE_DATA_BYTES)
+        records = list(tree.iterjsonify())
+        self.assertEqual(records, self.expected)
+        # streaming never builds the full tree
+        self.assertIsNone(tree._tree)
+
+    def test_feed_in_small_chunks(self):
+        parser = fpdsStreamParser()
+        records = []
+        for start in range(0, len(FULL_RESPONSE_DATA_BYTES), 97):
+            records.extend(parser.feed(FULL_RESPONSE_DATA_BYTES[start : start + 97]))
+        records.extend(parser.close())
+        self.assertEqual(records, self.expected)
+        self.assertEqual(parser.entry_count, 10)
+
+    def test_processed_entries_are_released(self):
+        parser = fpdsStreamParser()
+        parser.feed(FULL_RESPONSE_DATA_BYTES)
+        parser.close()
+        # only the feed header (title, links, modified, author) is retained
+        root = parser._root
+        self.assertEqual(len(root), 6)
+        self.assertEqual(root.findall(".//ns0:entry", parser.namespace_dict), [])
+
+    def test_lower_limit(self):
+        parser = fpdsStreamParser()
+        parser.feed(FULL_RESPONSE_DATA_BYTES)
+        parser.close()
+        self.assertEqual(
+            parser.lower_limit, fpdsTree(FULL_RESPONSE_DATA_BYTES).lower_limit
+        )
+
+        parser = fpdsStreamParser()
+        parser.feed(TRUNCATED_RESPONSE_DATA_BYTES)
+        parser.close()
+        self.assertEqual(parser.lower_limit, 1)
+
+
+class TestFpdsRecordBatch(TestCase):
+    def setUp(self):
+        self.records = fpdsTree(FULL_RESPONSE_DATA_BYTES).jsonify()
+
+    def test_round_trip(self):
+        batch = fpdsRecordBatch.from_records(self.records)
+        self.assertEqual(len(batch), len(self.records))
+        self.assertLess(len(batch.schemas), len(self.records))
+        records = batch.records()
+        self.assertEqual(records, self.records)
+        self.assertEqual(
+            [list(record) for record in records],
+            [list(record) for record in self.records],
+        )
+
+    def test_pickle(self):
+        batch = pickle.loads(pickle.dumps(parse_page(FULL_RESPONSE_DATA_BYTES)))
+        self.assertEqual(batch.records(), self.records)
+
+
+class TestFpdsSubTreeStream(IsolatedAsyncioTestCase):
+    """Streams a page straight from an aiohttp response body."""
+
+    async def asyncSetUp(self):
+        async def handler(request):
+            response = web.StreamResponse()
+            await response.prepare(request)
+            for start in range(0, len(FULL_RESPONSE_DATA_BYTES), 4096):
+                await response.write(FULL_RESPONSE_DATA_BYTES[start : start + 4096])
+            return response
+
+        app = web.Application()
+        app.router.add_get("/", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_stream(self):
+        subtree = fpdsSubTree()
+        async with ClientSession() as session:
+            async with session.get(self.server.make_url("/")) as response:
+                chunks = response.content.iter_chunked(1024)
+                records = [record async for record in subtree.stream(chunks)]
+
+        expected = fpdsTree(content=FULL_RESPONSE_DATA_BYTES).jsonify()
+        self.assertEqual(records, expected)
+        self.assertEqual(subtree.stream_parser.lower_limit, 20)
@@ -2,12 +2,174 @@
 Utility functions related to FPDS unit tests
 
 author: derek663@gmail.com
-last_updated: 12/27/2022
+last_updated: 10/18/2026
 """
 
+import asyncio
+import re
+import time
+from datetime import date, datetime
+
+from aiohttp import web
+
+# offsets requested from `mock_fpds_application`, in arrival order
+REQUESTS = web.AppKey("requests", list)
+# arrival time of each request, as `time.monotonic()`
+TIMESTAMPS = web.AppKey("timestamps", list)
+# client (host, port) pairs, i.e. one per TCP connection
+CONNECTIONS = web.AppKey("connections", set)
+# requests being handled right now, and the most ever handled at once
+ACTIVE = web.AppKey("active", list)
+
+ENTRY_PATTERN = re.compile(rb"<ns0:entry>.*?</ns0:entry>\s*", re.S)
+LAST_LINK_PATTERN = re.compile(rb'<ns0:link rel="last"[^>]*/>\s*')
+DATE_RANGE_PATTERN = re.compile(r"LAST_MOD_DATE:\[(\S+),\s*(\S+)\]")
+
 
 def read_xml_as_bytes(file_path: str, encoding="utf-8"):
     """Reads an XML file as converts it to a bytes response"""
     with open(file_path) as data:
         bytes_data = data.read().encode(encoding)
     return bytes_data
+
+
+def build_page(content: bytes, start: int, last: int) -> bytes:
+    """Turns a sample response into page `start` of a feed whose `last` link
+    points at `last`. Entry titles are prefixed with `[start]` so records can
+    be traced back to their page.
+    """
+    page = content.replace(b"start=20", f"start={last}".encode())
+    return page.replace(
+        b"<ns0:entry>\n    <ns0:title>",
+        f"<ns0:entry>\n    <ns0:title>[{start}] ".encode(),
+    )
+
+
+def mock_fpds_application(  # type: ignore
+    content, last=20, latency=0.0, delays=None, failures=None
+):
+    """An aiohttp application serving paginated ATOM feed responses.
+
+    Parameters
+    ----------
+    content: `bytes`
+        Sample response used for every page.
+    last: `int`
+        Offset of the last page.
+    latency: `float`
+        Seconds to wait before responding.
+    delays: `Optional[Dict[int, float]]`
+        Per-page latency overrides, keyed by `start` offset.
+    failures: `Optional[Dict[int, int]]`
+        Number of times a page responds with a 503 before succeeding, keyed
+        by `start` offset. The dictionary is updated in place.
+    """
+    app = web.Application()
+    app[REQUESTS] = []
+    app[TIMESTAMPS] = []
+    app[CONNECTIONS] = set()
+    app[ACTIVE] = [0, 0]
+
+    async def handler(request):  # type: ignore
+        start = int(request.query.get("start", 0))
+        app[REQUESTS].append(start)
+        app[TIMESTAMPS].append(time.monotonic())
+        app[CONNECTIONS].add(request.transport.get_extra_info("peername"))
+        active = app[ACTIVE]
+        active[0] += 1
+        active[1] = max(active)
+        try:
+            await asyncio.sleep((delays or {}).get(start, latency))
+        finally:
+            active[0] -= 1
+        if failures and failures.get(start):
+            failures[start] -= 1
+            return web.Response(status=503)
+        return web.Response(
+            body=build_page(content, start=start, last=last),
+            content_type="application/xml",
+        )
+
+    app.router.add_get("/", handler)
+    return app
+
+
+def build_dated_entries(content: bytes, dates):  # type: ignore
+    """One entry per date in `dates`, all copies of the first entry of a
+    sample response, with PIIDs `R00000`, `R00001`... and their date (or
+    datetime) as the last modified date.
+    """
+    template = ENTRY_PATTERN.search(content).group(0)
+    entries = []
+    for idx, day in enumerate(dates):
+        entry = re.sub(
+            rb"<ns1:PIID>[^<]*<", f"<ns1:PIID>R{idx:05d}<".encode(), template
+        )
+        entry = re.sub(
+            rb"<ns1:lastModifiedDate>[^<]*<",
+            f"<ns1:lastModifiedDate>{day:%Y-%m-%d %H:%M:%S}<".encode(),
+            entry,
+        )
+        entry = re.sub(
+            rb"<ns0:modified>[^<]*<",
+            f"<ns0:modified>{day:%Y-%m-%d %H:%M:%S}<".encode(),
+            entry,
+        )
+        if isinstance(day, datetime):
+            day = day.date()
+        entries.append((day, entry))
+    return entries
+
+
+def mock_dated_fpds_application(  # type: ignore
+    content, dates, latency=0.0, everywhere=()
+):
+    """An aiohttp application serving a feed of one record per date in
+    `dates` (see `build_dated_entries`). Queries are filtered by their
+    `LAST_MOD_DATE` range and paginated like the ATOM feed.
+
+    Parameters
+    ----------
+    content: `bytes`
+        Sample response that pages are built from.
+    dates: `List[Union[date, datetime]]`
+        Last modified date of each record.
+    latency: `float`
+        Seconds to wait before responding.
+    everywhere: `Container[int]`
+        Indices of records returned by every query, whatever its date range.
+        Checked on every request, so it can be updated in place.
+    """
+    app = web.Application()
+    app[REQUESTS] = []
+    entries = build_dated_entries(content, dates)
+    header = content[: ENTRY_PATTERN.search(content).start()]
+
+    def parse_date(value):  # type: ignore
+        return datetime.strptime(value, "%Y/%m/%d").date()
+
+    async def handler(request):  # type: ignore
+        start = int(request.query.get("start", 0))
+        app[REQUESTS].append(start)
+        await asyncio.sleep(latency)
+
+        lower, upper = date.min, date.max
+        match = DATE_RANGE_PATTERN.search(request.query.get("q", ""))
+        if match:
+            lower, upper = (parse_date(value) for value in match.groups())
+        matches = [
+            entry
+            for idx, (day, entry) in enumerate(entries)
+            if lower <= day <= upper or idx in everywhere
+        ]
+        if len(matches) > 10:
+            last = (len(matches) - 1) // 10 * 10
+            page_header = header.replace(b"start=20", f"start={last}".encode())
+        else:
+            # single page feeds don't have a `last` link
+            page_header = LAST_LINK_PATTERN.sub(b"", header)
+        body = page_header + b"".join(matches[start : start + 10]) + b"</ns0:feed>"
+        return web.Response(body=body, content_type="application/xml")
+
+    app.router.add_get("/", handler)
+    return app